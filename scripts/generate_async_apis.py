@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Generates the asyncio API modules of a Python SDK from its generated sync API modules.
+
+For every `appifyhub/api/<name>_api.py` written by OpenAPI Generator, writes
+`appifyhub/api/async_<name>_api.py` with an `Async<Name>Api` class. Its
+operations are coroutines with the same signatures, awaiting the
+`AsyncApiClient`; requests are serialized by the sync API class, which is
+wrapped rather than subclassed.
+
+Usage: generate_async_apis.py <sdk directory>...
+"""
+
+import os
+import re
+import sys
+
+HEADER_END = '"""  # noqa: E501'
+CLIENT_IMPORT = "from appifyhub.api_client import ApiClient, RequestSerialized\n"
+CLASS_TEMPLATE = '''
+
+class Async%(cls)s:
+    """NOTE: This class is auto generated by OpenAPI Generator
+    Ref: https://openapi-generator.tech
+
+    Asyncio variant of `%(cls)s`. Requests are serialized by a `%(cls)s`
+    sharing the same client.
+
+    Do not edit the class manually.
+    """
+
+    def __init__(self, api_client=None) -> None:
+        if api_client is None:
+            api_client = AsyncApiClient.get_default()
+        self.api_client = api_client
+        self._serializer = %(cls)s(api_client)
+
+
+'''
+
+
+def convert(source: str, module: str) -> str:
+    header_end = source.index(HEADER_END) + len(HEADER_END)
+    header, body = source[:header_end], source[header_end:]
+    imports, rest = body.split(CLIENT_IMPORT, 1)
+    cls = re.search(r"\nclass (\w+):\n", rest).group(1)
+
+    # public operations, without the private serializers following them
+    parts = re.split(r"\n(?=    @validate_call\n|    def _\w+_serialize\()", rest)
+    operations = []
+    for operation in parts:
+        if not operation.startswith("    @validate_call\n"):
+            continue
+        operation = operation.rstrip() + "\n"
+        operation = operation.replace("    @validate_call\n    def ", "    @validate_call\n    async def ", 1)
+        operation = re.sub(r"_param = self\.(_\w+_serialize)\(", r"_param = self._serializer.\1(", operation)
+        operation = operation.replace(
+            "response_data = self.api_client.call_api(", "response_data = await self.api_client.call_api(",
+        )
+        operation = operation.replace("        response_data.read()\n", "        await response_data.read()\n")
+        operations.append(operation)
+
+    text = header + "\n" + imports.replace("import warnings\n", "")
+    text += "from appifyhub.api.%s import %s\n" % (module, cls)
+    text += "from appifyhub.api_response import ApiResponse\n"
+    text += "from appifyhub.async_api_client import AsyncApiClient\n"
+    text += "from appifyhub.async_rest import RESTResponseType\n"
+    text += CLASS_TEMPLATE % {"cls": cls}
+    text += "\n\n".join(operations)
+    return text
+
+
+def main(sdk_dirs) -> None:
+    for sdk_dir in sdk_dirs:
+        api_dir = os.path.join(sdk_dir, "appifyhub", "api")
+        for name in sorted(os.listdir(api_dir)):
+            if not name.endswith("_api.py") or name.startswith("async_"):
+                continue
+            with open(os.path.join(api_dir, name)) as source:
+                text = convert(source.read(), name[:-3])
+            with open(os.path.join(api_dir, "async_" + name), "w") as target:
+                target.write(text)
+            print("Generated", os.path.join(api_dir, "async_" + name))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
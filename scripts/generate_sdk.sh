@@ -0,0 +1,41 @@
+#!/bin/bash
+
+# Regenerates the Python SDKs in sdk/ from the OpenAPI specs and the templates in sdk/templates.
+# Needs Docker and Python 3. Usage: scripts/generate_sdk.sh [spec...] (creator and consumer by default)
+
+set -e
+
+ROOT_DIR=$(cd "$(dirname "$0")/.." && pwd)
+VERSION=$(cd "$ROOT_DIR" && scripts/prop.sh version)
+SPECS_DIR=$ROOT_DIR/src/main/resources/static/docs/open-api
+SPECS=${*:-creator consumer}
+
+for SPEC in $SPECS; do
+  echo "Running SDK generation for $SPEC..."
+  # Generate over the current SDK, so that its hand-written modules and tests are kept
+  OUTPUT_DIR=$ROOT_DIR/sdk/$SPEC
+  # Prepare the templates: the shared ones, then the SDK's own
+  TEMPLATES_DIR=$(mktemp -d)
+  cp "$ROOT_DIR"/sdk/templates/*.mustache "$ROOT_DIR"/sdk/templates/"$SPEC"/*.mustache "$TEMPLATES_DIR"
+  PROPERTIES=identifierNamingConvention=snake_case,packageName=appifyhub,packageVersion=${VERSION}
+  if [ "$SPEC" = "consumer" ]; then
+    PROPERTIES=${PROPERTIES},tokenVerifier=true
+  fi
+  # Run the generator (the templates are based on this version's)
+  docker run --rm \
+    --user "$(id -u):$(id -g)" \
+    -v "$SPECS_DIR":/specs:ro \
+    -v "$TEMPLATES_DIR":/templates:ro \
+    -v "$OUTPUT_DIR":/output:rw \
+    openapitools/openapi-generator-cli:v7.5.0 generate \
+      -i /specs/"$SPEC".yaml \
+      -g python \
+      -o /output \
+      -t /templates \
+      --enable-post-process-file \
+      --additional-properties="${PROPERTIES}"
+  # Generate the asyncio APIs from the generated ones
+  python3 "$ROOT_DIR"/scripts/generate_async_apis.py "$OUTPUT_DIR"
+  # Drop the generator's own records, which are not part of the SDK
+  rm -rf "$OUTPUT_DIR"/.openapi-generator "$TEMPLATES_DIR"
+done
@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Consumer API
+    Consumer API · Appify Hub
 
     The full specification of the service's API used by the end-users.
 
@@ -14,22 +14,28 @@
 
 
 import datetime
-from dateutil.parser import parse
 from enum import Enum
 import json
 import mimetypes
 import os
 import re
 import tempfile
+import time
 
 from urllib.parse import quote
-from typing import Tuple, Optional, List, Dict, Union
-from pydantic import SecretStr
+from typing import Any, Callable, Tuple, Optional, List, Dict, Union
+from typing_extensions import Annotated, get_args, get_origin
+from pydantic import BaseModel, SecretStr, TypeAdapter
 
 from appifyhub.configuration import Configuration
 from appifyhub.api_response import ApiResponse, T as ApiResponseT
 import appifyhub.models
+from appifyhub import metrics as metrics_module
 from appifyhub import rest
+from appifyhub import response_cache
+from appifyhub import single_flight
+from appifyhub import tracing
+from appifyhub.operations import operation_name
 from appifyhub.exceptions import (
     ApiValueError,
     ApiException,
@@ -42,6 +48,71 @@ from appifyhub.exceptions import (
 
 RequestSerialized = Tuple[str, str, Dict[str, str], Optional[str], List[str]]
 
+
+class RequestUrl(str):
+    """URL of a serialized request that remembers which operation it targets.
+
+    `param_serialize` returns the URL in this form, so that `call_api` can
+    apply per-operation policies keyed by the resource path template instead
+    of the concrete URL. It is a plain string everywhere else.
+    """
+
+    resource_path: Optional[str] = None
+    """Resource path template, e.g. `/v1/universal/users/{universalId}`"""
+
+    operation: Optional[str] = None
+    """Name of the API operation, e.g. `get_user`"""
+
+    trace = None
+    """`tracing.Trace` of the call, when a tracer is configured"""
+
+
+class _DefaultHeaders(Dict[str, Any]):
+    """Header dict that counts its modifications, so derived data can be cached."""
+
+    version = 0
+
+    def _modified(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified()
+
+    # dict's own `|=` bypasses `update`; mypy cannot check a dict subclass's
+    # in-place operator against the generic `dict.__or__`
+    def __ior__(self, other: Any) -> '_DefaultHeaders':  # type: ignore[override, misc]
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._modified()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._modified()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._modified()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._modified()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._modified()
+
+
 class ApiClient:
     """Generic API client for OpenAPI client library builds.
 
@@ -69,6 +140,9 @@ class ApiClient:
         'datetime': datetime.datetime,
         'object': object,
     }
+    _deserializers: Dict[Any, Callable[[Any], Any]] = {}
+    _trusted_deserializers: Dict[Any, Callable[[Any], Any]] = {}
+    _json_adapters: Dict[str, Optional[TypeAdapter[Any]]] = {}
     _pool = None
 
     def __init__(
@@ -83,14 +157,44 @@ class ApiClient:
             configuration = Configuration.get_default()
         self.configuration = configuration
 
-        self.rest_client = rest.RESTClientObject(configuration)
+        self.rest_client = self._create_rest_client(configuration)
+        self._static_headers_key = None
+        self._static_headers_cache: Dict[
+            Tuple[str, ...], Tuple[Dict[str, Any], List[Tuple[str, str]]]
+        ] = {}
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
         self.cookie = cookie
         # Set default User-Agent.
-        self.user_agent = 'OpenAPI-Generator/1.2.1/python'
+        self.user_agent = 'OpenAPI-Generator/1.2.4/python'
+        if configuration.accept_encoding:
+            self.default_headers['Accept-Encoding'] = configuration.accept_encoding
         self.client_side_validation = configuration.client_side_validation
+        self.trusted_responses = configuration.trusted_responses
+        self.coalesce_requests = configuration.coalesce_requests
+        self._single_flight = self._create_single_flight()
+
+    def _create_rest_client(self, configuration):
+        """Creates the transport used to perform the HTTP requests.
+
+        :param configuration: .Configuration object for this client
+        :return: The REST client object.
+        """
+        if configuration.http2:
+            from appifyhub.http2_rest import HTTP2RESTClientObject
+            return HTTP2RESTClientObject(configuration)
+        return rest.RESTClientObject(configuration)
+
+    def _create_single_flight(self):
+        """Creates the group that coalesces identical concurrent GET requests."""
+        return single_flight.SingleFlight()
+
+    def _cached_response(self, entry):
+        """Wraps a cached response in the transport's response type."""
+        response_data = rest.RESTResponse(response_cache.CachedHttpResponse(entry))
+        response_data.data = entry['data']
+        return response_data
 
     def __enter__(self):
         return self
@@ -98,6 +202,26 @@ class ApiClient:
     def __exit__(self, exc_type, exc_value, traceback):
         pass
 
+    @property
+    def default_headers(self):
+        """Headers sent with every request made by this client"""
+        return self._default_headers
+
+    @default_headers.setter
+    def default_headers(self, value):
+        self._default_headers = _DefaultHeaders(value)
+        self._static_headers_key = None
+
+    @property
+    def cookie(self):
+        """Cookie header sent with every request made by this client"""
+        return self._cookie
+
+    @cookie.setter
+    def cookie(self, value):
+        self._cookie = value
+        self._static_headers_key = None
+
     @property
     def user_agent(self):
         """User agent for this API client"""
@@ -175,17 +299,27 @@ class ApiClient:
         """
 
         config = self.configuration
-
-        # header parameters
-        header_params = header_params or {}
-        header_params.update(self.default_headers)
-        if self.cookie:
-            header_params['Cookie'] = self.cookie
-        if header_params:
+        tracer = config.tracer
+        started = time.perf_counter() if tracer is not None else 0.0
+        resource_path_template = resource_path
+
+        # header parameters; defaults, cookie and configured auth are
+        # serialized once and reused until one of them changes
+        if not header_params:
+            header_params = {}
+        elif all(type(v) is str for v in header_params.values()):
+            header_params = dict(header_params)
+        else:
             header_params = self.sanitize_for_serialization(header_params)
             header_params = dict(
                 self.parameters_to_tuples(header_params,collection_formats)
             )
+        static_headers, static_queries = self._get_static_headers(
+            None if _request_auth else auth_settings
+        )
+        header_params.update(static_headers)
+        if static_queries:
+            query_params = (query_params or []) + static_queries
 
         # path parameters
         if path_params:
@@ -212,16 +346,17 @@ class ApiClient:
             if files:
                 post_params.extend(self.files_parameters(files))
 
-        # auth setting
-        self.update_params_for_auth(
-            header_params,
-            query_params,
-            auth_settings,
-            resource_path,
-            method,
-            body,
-            request_auth=_request_auth
-        )
+        # auth setting overridden for this request only
+        if _request_auth:
+            self.update_params_for_auth(
+                header_params,
+                query_params,
+                auth_settings,
+                resource_path,
+                method,
+                body,
+                request_auth=_request_auth
+            )
 
         # body
         if body:
@@ -243,6 +378,12 @@ class ApiClient:
             )
             url += "?" + url_query
 
+        url = RequestUrl(url)
+        url.resource_path = resource_path_template
+        url.operation = operation_name(method, resource_path_template)
+        if tracer is not None:
+            url.trace = tracer.start(method, url, time.perf_counter() - started)
+
         return method, url, header_params, body, post_params
 
 
@@ -267,20 +408,170 @@ class ApiClient:
         :return: RESTResponse
         """
 
+        trace = getattr(url, 'trace', None)
+        if trace is None:
+            return self._call_api_cached(
+                method, url, header_params, body, post_params, _request_timeout
+            )
+
+        started = time.perf_counter()
         try:
-            # perform request and return response
-            response_data = self.rest_client.request(
-                method, url,
-                headers=header_params,
-                body=body, post_params=post_params,
-                _request_timeout=_request_timeout
+            response_data = self._call_api_cached(
+                method, url, header_params, body, post_params, _request_timeout
             )
+        except BaseException as e:
+            trace.tracer.call_ended(trace, started, None)
+            trace.tracer.finish(trace, error=e)
+            raise
+        trace.tracer.call_ended(trace, started, response_data)
+        return response_data
 
-        except ApiException as e:
-            raise e
+    def _call_api_cached(self, method, url, header_params, body, post_params, _request_timeout):
+        """Performs the request, consulting the response cache and coalescing identical reads."""
 
+        cache = self.configuration.response_cache
+        lookup = None
+        if cache is not None:
+            lookup = cache.lookup(method, url, header_params)
+            if lookup is not None:
+                if lookup.fresh:
+                    return self._cached_response(lookup.entry)
+                header_params = lookup.headers
+
+        try:
+            if method == 'GET' and self.coalesce_requests:
+                def call():
+                    response_data = self._call_api(
+                        method, url, header_params, body, post_params, _request_timeout
+                    )
+                    response_data.read()
+                    return response_data
+                key = single_flight.request_key(method, url, header_params)
+                response_data = self._single_flight.do(key, call)
+            else:
+                response_data = self._call_api(
+                    method, url, header_params, body, post_params, _request_timeout
+                )
+        finally:
+            # a failed mutation may still have been applied
+            if cache is not None and lookup is None:
+                cache.invalidate(method, url)
+
+        if lookup is not None:
+            response_data.read()
+            entry = cache.complete(lookup, response_data)
+            if entry is not None:
+                return self._cached_response(entry)
         return response_data
 
+    def _call_api(self, method, url, header_params, body, post_params, _request_timeout):
+        """Performs the request, consulting the circuit breaker and the retry policy."""
+
+        policy = self.configuration.retry_policy
+        if policy is not None:
+            policy.record_request()
+        breaker = self.configuration.circuit_breaker
+        circuit = None
+        metrics = self.configuration.metrics
+        trace = getattr(url, 'trace', None)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                circuit = breaker.acquire(method, getattr(url, 'resource_path', None) or url)
+            started = 0.0
+            try:
+                headers = header_params
+                if policy is not None or trace is not None:
+                    headers = dict(header_params or {})
+                if trace is not None:
+                    # added per attempt, after the cache and coalescing keys were computed
+                    trace.tracer.inject(trace, headers)
+                if metrics is not None:
+                    started = time.perf_counter()
+                # perform request and return response
+                response_data = self.rest_client.request(
+                    method, url,
+                    headers=headers,
+                    body=body, post_params=post_params,
+                    _request_timeout=_request_timeout
+                )
+
+            except ApiException as e:
+                if circuit is not None:
+                    circuit.record(None)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, None, started)
+                raise e
+
+            except Exception as e:
+                if circuit is not None:
+                    # only transport failures count against the endpoint; errors
+                    # such as invalid arguments never reached it
+                    circuit.record(True if self.rest_client.classify_error(e) else None)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, None, started)
+                delay = self._retry_delay(policy, attempt, method, url, header_params, error=e)
+                if delay is None:
+                    raise
+
+            except BaseException:
+                if circuit is not None:
+                    # cancelled or interrupted; releases a half-open probe
+                    # without judging the endpoint
+                    circuit.record(None)
+                raise
+
+            else:
+                if circuit is not None:
+                    circuit.record_response(response_data)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, response_data, started)
+                delay = self._retry_delay(
+                    policy, attempt, method, url, header_params, response=response_data
+                )
+                if delay is None:
+                    return response_data
+                response_data.read()
+
+            time.sleep(delay)
+
+    def _record_attempt(self, metrics, url, response_data, started):
+        """Records a request attempt, and has its response record its read time.
+
+        :param response_data: the response, or None if the attempt failed.
+        :param started: `time.perf_counter()` before sending the request.
+        """
+        operation = getattr(url, 'operation', None) or metrics_module.UNKNOWN_OPERATION
+        if response_data is None:
+            metrics.record_response(operation, None, time.perf_counter() - started)
+        else:
+            metrics.record_response(operation, response_data.status, time.perf_counter() - started)
+            response_data.metrics = metrics
+            response_data.operation = operation
+
+    def _retry_delay(self, policy, attempt, method, url, header_params, response=None, error=None):
+        """Asks the retry policy how long to wait before the next attempt.
+
+        :return: delay in seconds, or None when the request is not retried.
+        """
+        if policy is None:
+            return None
+        error_kind = None
+        if error is not None:
+            error_kind = self.rest_client.classify_error(error)
+            if error_kind is None:
+                return None
+        return policy.retry_delay(
+            attempt,
+            method,
+            getattr(url, 'operation', None),
+            header_params,
+            response=response,
+            error_kind=error_kind,
+        )
+
     def response_deserialize(
         self,
         response_data: rest.RESTResponse,
@@ -292,15 +583,34 @@ class ApiClient:
         :return: ApiResponse
         """
 
+        trace = tracing.current_trace(response_data)
+        if trace is None:
+            return self._response_deserialize(response_data, response_types_map)
+
+        started = time.perf_counter()
+        try:
+            api_response = self._response_deserialize(response_data, response_types_map)
+        except BaseException as e:
+            trace.tracer.finish(trace, started, error=e)
+            raise
+        trace.tracer.finish(trace, started)
+        return api_response
+
+    def _response_deserialize(self, response_data, response_types_map):
+        """Deserializes response into an ApiResponse, raising ApiException for error statuses."""
+
         msg = "RESTResponse.read() must be called before passing it to response_deserialize()"
         assert response_data.data is not None, msg
 
         response_type = response_types_map.get(str(response_data.status), None)
-        if not response_type and isinstance(response_data.status, int) and 100 <= response_data.status <= 599:
+        if (not response_type and isinstance(response_data.status, int)
+                and 100 <= response_data.status <= 599):
             # if not found, look for '1XX', '2XX', etc.
             response_type = response_types_map.get(str(response_data.status)[0] + "XX", None)
 
         # deserialize response data
+        metrics = getattr(response_data, 'metrics', None)
+        started = time.perf_counter() if metrics is not None else 0.0
         response_text = None
         return_data = None
         try:
@@ -314,12 +624,27 @@ class ApiClient:
                 if content_type is not None:
                     match = re.search(r"charset=([a-zA-Z\-\d]+)[\s;]?", content_type)
                 encoding = match.group(1) if match else "utf-8"
-                response_text = response_data.data.decode(encoding)
-                if response_type in ["bytearray", "str"]:
-                    return_data = self.__deserialize_primitive(response_text, response_type)
+                json_adapter = None
+                if (
+                    200 <= response_data.status <= 299
+                    and not self.trusted_responses
+                    and content_type is not None
+                    and re.search('json', content_type, re.IGNORECASE)
+                    and encoding.lower() in ('utf-8', 'utf8')
+                ):
+                    json_adapter = self._get_json_adapter(response_type)
+                if json_adapter is not None:
+                    # validate the raw bytes straight into the models
+                    return_data = json_adapter.validate_json(response_data.data)
                 else:
-                    return_data = self.deserialize(response_text, response_type)
+                    response_text = response_data.data.decode(encoding)
+                    if response_type in ["bytearray", "str"]:
+                        return_data = self.__deserialize_primitive(response_text, response_type)
+                    else:
+                        return_data = self.deserialize(response_text, response_type)
         finally:
+            if metrics is not None:
+                metrics.record_deserialize(response_data.operation, time.perf_counter() - started)
             if not 200 <= response_data.status <= 299:
                 raise ApiException.from_response(
                     http_resp=response_data,
@@ -398,7 +723,7 @@ class ApiClient:
 
         # fetch data from response object
         try:
-            data = json.loads(response_text)
+            data = self.configuration.json_codec.decode(response_text)
         except ValueError:
             data = response_text
 
@@ -415,39 +740,199 @@ class ApiClient:
         if data is None:
             return None
 
+        return self._get_deserializer(klass, self.trusted_responses)(data)
+
+    @classmethod
+    def _get_deserializer(cls, klass, trusted=False):
+        """Returns the deserializer callable for the given response type.
+
+        Type strings are parsed and their classes resolved only once; the
+        compiled callable is memoized and shared by all clients.
+
+        :param klass: class literal, or string of class name.
+        :param trusted: whether models are built without validation.
+        :return: callable turning decoded JSON data into the target type.
+        """
+        cache = cls._trusted_deserializers if trusted else cls._deserializers
+        deserializer = cache.get(klass)
+        if deserializer is None:
+            deserializer = cls._compile_deserializer(klass, trusted)
+            cache[klass] = deserializer
+        return deserializer
+
+    @classmethod
+    def _compile_deserializer(cls, klass, trusted=False):
+        """Builds the deserializer callable for the given response type.
+
+        :param klass: class literal, or string of class name.
+        :param trusted: whether models are built without validation.
+        :return: callable turning decoded JSON data into the target type.
+        """
         if isinstance(klass, str):
             if klass.startswith('List['):
                 m = re.match(r'List\[(.*)]', klass)
                 assert m is not None, "Malformed List type definition"
-                sub_kls = m.group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
+                sub_deserializer = cls._get_deserializer(m.group(1), trusted)
+                return lambda data: [
+                    None if sub_data is None else sub_deserializer(sub_data)
+                    for sub_data in data
+                ]
 
             if klass.startswith('Dict['):
                 m = re.match(r'Dict\[([^,]*), (.*)]', klass)
                 assert m is not None, "Malformed Dict type definition"
-                sub_kls = m.group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in data.items()}
+                sub_deserializer = cls._get_deserializer(m.group(2), trusted)
+                return lambda data: {
+                    k: None if v is None else sub_deserializer(v)
+                    for k, v in data.items()
+                }
 
             # convert str to class
-            if klass in self.NATIVE_TYPES_MAPPING:
-                klass = self.NATIVE_TYPES_MAPPING[klass]
+            if klass in cls.NATIVE_TYPES_MAPPING:
+                klass = cls.NATIVE_TYPES_MAPPING[klass]
             else:
                 klass = getattr(appifyhub.models, klass)
 
-        if klass in self.PRIMITIVE_TYPES:
-            return self.__deserialize_primitive(data, klass)
+        if klass in cls.PRIMITIVE_TYPES:
+            return lambda data: cls.__deserialize_primitive(data, klass)
         elif klass == object:
-            return self.__deserialize_object(data)
+            return cls.__deserialize_object
         elif klass == datetime.date:
-            return self.__deserialize_date(data)
+            return cls.__deserialize_date
         elif klass == datetime.datetime:
-            return self.__deserialize_datetime(data)
+            return cls.__deserialize_datetime
         elif issubclass(klass, Enum):
-            return self.__deserialize_enum(data, klass)
+            return lambda data: cls.__deserialize_enum(data, klass)
+        elif trusted:
+            return cls._compile_model_constructor(klass)
         else:
-            return self.__deserialize_model(data, klass)
+            return klass.from_dict
+
+    @classmethod
+    def _compile_model_constructor(cls, klass):
+        """Builds a callable creating the model without validating it.
+
+        Field values are taken as they are, except for enums, dates and
+        nested models, which are converted to keep the model types intact.
+
+        :param klass: model class.
+        :return: callable turning a decoded JSON object into the model.
+        """
+        fields = [
+            (name, field.alias or name, field, cls._compile_field_converter(field.annotation))
+            for name, field in klass.model_fields.items()
+        ]
+
+        def construct(data):
+            if not isinstance(data, dict):
+                return klass.model_validate(data)
+
+            values = {}
+            fields_set = set()
+            for name, key, field, converter in fields:
+                if key not in data:
+                    values[name] = field.get_default(call_default_factory=True)
+                    continue
+                value = data[key]
+                if value is not None and converter is not None:
+                    value = converter(value)
+                values[name] = value
+                fields_set.add(name)
+            return klass.model_construct(fields_set, **values)
+
+        return construct
+
+    @classmethod
+    def _compile_field_converter(cls, annotation):
+        """Builds the converter for a model field in trusted mode.
+
+        :param annotation: the field's type hint.
+        :return: converter callable, or None if the value is kept as is.
+        """
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            return cls._compile_field_converter(get_args(annotation)[0])
+
+        if origin is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                return None
+            return cls._compile_field_converter(args[0])
+
+        if origin is list:
+            item_converter = cls._compile_field_converter(get_args(annotation)[0])
+            if item_converter is None:
+                return None
+            return lambda value: [
+                None if item is None else item_converter(item) for item in value
+            ]
+
+        if origin is dict:
+            item_converter = cls._compile_field_converter(get_args(annotation)[1])
+            if item_converter is None:
+                return None
+            return lambda value: {
+                k: None if v is None else item_converter(v) for k, v in value.items()
+            }
+
+        if not isinstance(annotation, type):
+            return None
+        if (
+            issubclass(annotation, (BaseModel, Enum))
+            or annotation in (datetime.date, datetime.datetime)
+        ):
+            return cls._get_deserializer(annotation, trusted=True)
+        return None
+
+    @classmethod
+    def _get_json_adapter(cls, klass):
+        """Returns the cached JSON validator for the given response type.
+
+        Only types built from models (optionally wrapped in `List[...]` or
+        `Dict[str, ...]`) get a validator; the JSON bytes are then parsed and
+        validated by pydantic in a single pass. Other types return `None` and
+        go through `deserialize`.
+
+        :param klass: string of class name.
+        :return: TypeAdapter or None.
+        """
+        if klass in cls._json_adapters:
+            return cls._json_adapters[klass]
+
+        json_type = cls._resolve_json_type(klass)
+        json_adapter = None
+        if json_type is not None:
+            json_adapter = TypeAdapter(Optional[json_type])
+        cls._json_adapters[klass] = json_adapter
+        return json_adapter
+
+    @classmethod
+    def _resolve_json_type(cls, klass):
+        """Converts a response type string into a type hint made of models.
+
+        :param klass: string of class name.
+        :return: type hint, or None if the type is not built from models.
+        """
+        if klass.startswith('List['):
+            m = re.match(r'List\[(.*)]', klass)
+            assert m is not None, "Malformed List type definition"
+            # built at runtime, so typed as Any for mypy
+            item_type: Any = cls._resolve_json_type(m.group(1))
+            return None if item_type is None else List[Optional[item_type]]
+
+        if klass.startswith('Dict['):
+            m = re.match(r'Dict\[([^,]*), (.*)]', klass)
+            assert m is not None, "Malformed Dict type definition"
+            value_type: Any = cls._resolve_json_type(m.group(2))
+            return None if value_type is None else Dict[str, Optional[value_type]]
+
+        if klass in cls.NATIVE_TYPES_MAPPING:
+            return None
+
+        model = getattr(appifyhub.models, klass, None)
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            return model
+        return None
 
     def parameters_to_tuples(self, params, collection_formats):
         """Get parameters as list of tuples, formatting collections.
@@ -574,6 +1059,50 @@ class ApiClient:
 
         return content_types[0]
 
+    def _get_static_headers(self, auth_settings):
+        """Returns the serialized headers and queries shared by all requests.
+
+        The block holds the default headers, the cookie and the values of the
+        given auth settings. It is rebuilt only after the access token, the
+        cookie or the default headers change.
+
+        :param auth_settings: Authentication setting identifiers list.
+        :return: tuple of (headers dict, query tuples list); do not modify.
+        """
+        if auth_settings and self.configuration.refresh_api_key_hook is not None:
+            # lets the hook swap the access token before it is looked up
+            self.configuration.refresh_api_key_hook(self.configuration)
+        key = (
+            self.configuration.access_token,
+            self._default_headers.version,
+        )
+        if key != self._static_headers_key:
+            self._static_headers_cache = {}
+            self._static_headers_key = key
+
+        auth_key = tuple(auth_settings) if auth_settings else ()
+        static = self._static_headers_cache.get(auth_key)
+        if static is None:
+            headers = dict(self._default_headers)
+            if self.cookie:
+                headers['Cookie'] = self.cookie
+            headers = dict(
+                self.parameters_to_tuples(self.sanitize_for_serialization(headers), None)
+            )
+            queries: List[Tuple[str, str]] = []
+            if auth_key:
+                # the hook already ran above
+                configured = self.configuration._auth_settings()
+                for auth in auth_key:
+                    auth_setting = configured.get(auth)
+                    if auth_setting:
+                        self._apply_auth_params(
+                            headers, queries, None, None, None, auth_setting
+                        )
+            static = (headers, queries)
+            self._static_headers_cache[auth_key] = static
+        return static
+
     def update_params_for_auth(
         self,
         headers,
@@ -683,7 +1212,8 @@ class ApiClient:
 
         return path
 
-    def __deserialize_primitive(self, data, klass):
+    @staticmethod
+    def __deserialize_primitive(data, klass):
         """Deserializes string to primitive type.
 
         :param data: str.
@@ -698,19 +1228,23 @@ class ApiClient:
         except TypeError:
             return data
 
-    def __deserialize_object(self, value):
+    @staticmethod
+    def __deserialize_object(value):
         """Return an original value.
 
         :return: object.
         """
         return value
 
-    def __deserialize_date(self, string):
+    @staticmethod
+    def __deserialize_date(string):
         """Deserializes string to date.
 
         :param string: str.
         :return: date.
         """
+        from dateutil.parser import parse
+
         try:
             return parse(string).date()
         except ImportError:
@@ -721,7 +1255,8 @@ class ApiClient:
                 reason="Failed to parse `{0}` as date object".format(string)
             )
 
-    def __deserialize_datetime(self, string):
+    @staticmethod
+    def __deserialize_datetime(string):
         """Deserializes string to datetime.
 
         The string should be in iso8601 datetime format.
@@ -729,6 +1264,8 @@ class ApiClient:
         :param string: str.
         :return: datetime.
         """
+        from dateutil.parser import parse
+
         try:
             return parse(string)
         except ImportError:
@@ -742,7 +1279,8 @@ class ApiClient:
                 )
             )
 
-    def __deserialize_enum(self, data, klass):
+    @staticmethod
+    def __deserialize_enum(data, klass):
         """Deserializes primitive type to enum.
 
         :param data: primitive type.
@@ -759,13 +1297,3 @@ class ApiClient:
                     .format(data, klass)
                 )
             )
-
-    def __deserialize_model(self, data, klass):
-        """Deserializes list or dict to model.
-
-        :param data: dict, list.
-        :param klass: class literal.
-        :return: model object.
-        """
-
-        return klass.from_dict(data)
@@ -0,0 +1,258 @@
+import asyncio
+import io
+import re
+import ssl
+import time
+from typing import Optional
+
+import aiohttp
+
+from appifyhub import compression
+from appifyhub.exceptions import ApiException, ApiValueError
+
+RESTResponseType = aiohttp.ClientResponse
+
+
+class AsyncRESTResponse(io.IOBase):
+
+    # `metrics.Metrics` recording the time reading the body, and the operation to record it for
+    metrics = None
+    operation = None
+    # size of the request body sent, when known
+    request_bytes: Optional[int] = None
+    # size of the response body as received, before decompressing it
+    wire_bytes: Optional[int] = None
+
+    def __init__(self, resp) -> None:
+        self.response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.data: Optional[bytes] = None
+
+    async def read(self):
+        if self.data is None:
+            started = time.perf_counter() if self.metrics is not None else 0.0
+            # decompress the body as it streams in, instead of buffering it compressed
+            body = compression.Decoder(self.response.headers.get('Content-Encoding'))
+            try:
+                async for chunk in self.response.content.iter_chunked(compression.CHUNK_SIZE):
+                    body.feed(chunk)
+            finally:
+                self.response.release()
+            self.data = body.finish()
+            self.wire_bytes = body.wire_bytes
+            if self.metrics is not None:
+                self.metrics.record_read(
+                    self.operation, time.perf_counter() - started, self.wire_bytes, len(self.data),
+                )
+        return self.data
+
+    def getheaders(self):
+        """Returns a CIMultiDictProxy of the response headers."""
+        return self.response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.response.headers.get(name, default)
+
+
+class AsyncRESTClientObject:
+    """Non-blocking counterpart of `rest.RESTClientObject` built on aiohttp.
+
+    All requests share one `aiohttp.TCPConnector`, so a single event loop can
+    keep many requests in flight over a bounded set of pooled connections.
+    The session is created lazily on the first request, because aiohttp
+    sessions must be created from within a running event loop.
+    """
+
+    def __init__(self, configuration) -> None:
+        # maxsize is the number of requests to a host allowed in parallel
+        self.maxsize = configuration.connection_pool_maxsize
+
+        self.ssl_context = ssl.create_default_context(
+            cafile=configuration.ssl_ca_cert
+        )
+        if configuration.cert_file:
+            self.ssl_context.load_cert_chain(
+                configuration.cert_file, keyfile=configuration.key_file
+            )
+
+        if not configuration.verify_ssl:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        elif configuration.assert_hostname is False:
+            self.ssl_context.check_hostname = False
+
+        self.server_hostname = configuration.tls_server_name
+        self.proxy = configuration.proxy
+        self.proxy_headers = configuration.proxy_headers
+        self.json_codec = configuration.json_codec
+
+        self.pool_manager: Optional[aiohttp.ClientSession] = None
+
+    def _get_pool_manager(self) -> aiohttp.ClientSession:
+        if self.pool_manager is None or self.pool_manager.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.maxsize or 0,
+                limit_per_host=self.maxsize or 0,
+                ssl=self.ssl_context,
+            )
+            self.pool_manager = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=True,
+                # bodies are decompressed by `AsyncRESTResponse.read`
+                auto_decompress=False,
+            )
+        return self.pool_manager
+
+    async def close(self):
+        """Closes the underlying session and all of its pooled connections."""
+        if self.pool_manager is not None and not self.pool_manager.closed:
+            await self.pool_manager.close()
+        self.pool_manager = None
+
+    def classify_error(self, error):
+        """Classifies a transport error for the retry policy.
+
+        :param error: exception raised by `request`.
+        :return: "connect" when the request was never sent, "transient" for
+                 other failures worth retrying, None otherwise.
+        """
+        connect_errors = (
+            aiohttp.ClientConnectorError, getattr(aiohttp, "ConnectionTimeoutError", ()),
+        )
+        if isinstance(error, connect_errors):
+            return "connect"
+        transient_errors = (
+            aiohttp.ServerDisconnectedError, aiohttp.ClientOSError, asyncio.TimeoutError,
+        )
+        if isinstance(error, transient_errors):
+            return "transient"
+        return None
+
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        method = method.upper()
+        assert method in [
+            'GET',
+            'HEAD',
+            'DELETE',
+            'POST',
+            'PUT',
+            'PATCH',
+            'OPTIONS'
+        ]
+
+        if post_params and body:
+            raise ApiValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+
+        timeout = None
+        if _request_timeout:
+            if isinstance(_request_timeout, (int, float)):
+                timeout = aiohttp.ClientTimeout(total=_request_timeout)
+            elif (
+                    isinstance(_request_timeout, tuple)
+                    and len(_request_timeout) == 2
+                ):
+                timeout = aiohttp.ClientTimeout(
+                    sock_connect=_request_timeout[0],
+                    sock_read=_request_timeout[1]
+                )
+
+        args = {
+            "method": method,
+            "url": url,
+            "headers": headers,
+        }
+        if timeout is not None:
+            args["timeout"] = timeout
+        if self.server_hostname:
+            args["server_hostname"] = self.server_hostname
+        if self.proxy:
+            args["proxy"] = self.proxy
+        if self.proxy_headers:
+            args["proxy_headers"] = self.proxy_headers
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+
+            # no content type provided or payload is json
+            content_type = headers.get('Content-Type')
+            if (
+                not content_type
+                or re.search('json', content_type, re.IGNORECASE)
+            ):
+                if body is not None:
+                    args["data"] = self.json_codec.encode(body)
+            elif content_type == 'application/x-www-form-urlencoded':
+                args["data"] = aiohttp.FormData(post_params)
+            elif content_type == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by aiohttp will be
+                # overwritten.
+                del headers['Content-Type']
+                data = aiohttp.FormData()
+                for k, v in post_params:
+                    if isinstance(v, tuple) and len(v) == 3:
+                        data.add_field(
+                            k,
+                            value=v[1],
+                            filename=v[0],
+                            content_type=v[2]
+                        )
+                    elif isinstance(v, dict):
+                        # Ensures that dict objects are serialized
+                        data.add_field(k, self.json_codec.encode(v).decode('utf-8'))
+                    else:
+                        data.add_field(k, v)
+                args["data"] = data
+            # Pass a `string` parameter directly in the body to support
+            # other content types than JSON when `body` argument is
+            # provided in serialized form.
+            elif isinstance(body, str) or isinstance(body, bytes):
+                args["data"] = body
+            elif content_type == 'text/plain' and isinstance(body, bool):
+                args["data"] = "true" if body else "false"
+            else:
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        try:
+            r = await self._get_pool_manager().request(**args)
+        except aiohttp.ClientSSLError as e:
+            msg = "\n".join([type(e).__name__, str(e)])
+            raise ApiException(status=0, reason=msg)
+
+        response = AsyncRESTResponse(r)
+        if isinstance(args.get("data"), (str, bytes)):
+            response.request_bytes = len(args["data"])
+        return response
@@ -0,0 +1,55 @@
+from typing import Callable, Iterable, Iterator, Optional
+
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.bulk import BulkProgress, BulkResult, BulkRunner
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.retry import RetryPolicy
+
+
+def broadcast(
+    api_client,
+    project_id: int,
+    recipients: Iterable[str],
+    message: MessageSendRequest,
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    max_pending: Optional[int] = None,
+    on_progress: Optional[Callable[[BulkProgress], None]] = None,
+) -> Iterator[BulkResult]:
+    """Sends the same message to many users with `MessagingApi.send_message`, many at a time.
+
+    Recipients are read lazily and messaged by a `bulk.BulkRunner`, so
+    results must be consumed for the broadcast to progress:
+
+        message = MessageSendRequest(message_type="EMAIL", message_template_name="newsletter")
+        for result in broadcast(api_client, project_id, recipients, message, rate=200):
+            if not result.ok:
+                failed.append(result.item)
+
+    Throughput grows with `concurrency`, which defaults to the client's
+    `connection_pool_maxsize`, until `rate` or the service caps it.
+
+    :param api_client: ApiClient the messages are sent with.
+    :param project_id: the project the recipients belong to.
+    :param recipients: universal IDs of the users to message.
+    :param message: the message to send to everyone.
+    :param concurrency: see `bulk.BulkRunner`.
+    :param rate: see `bulk.BulkRunner`.
+    :param retry_policy: see `bulk.BulkRunner`. By default, sends are
+                         retried only on connection failures and on 429
+                         and 503 responses. Other server errors and read
+                         timeouts may come after the message went out, so
+                         they are reported instead of risking a duplicate.
+    :param max_pending: see `bulk.BulkRunner`.
+    :param on_progress: see `bulk.BulkRunner`.
+    :return: a `BulkResult` per recipient, holding the universal ID as `item`
+             and the `SimpleResponse` or the error.
+    """
+    messaging_api = MessagingApi(api_client)
+
+    def send_message(universal_id: str):
+        return messaging_api.send_message(project_id, universal_id, message)
+
+    runner = BulkRunner(api_client, concurrency, rate, retry_policy, max_pending, on_progress)
+    return runner.run(send_message, recipients)
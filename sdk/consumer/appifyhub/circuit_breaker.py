@@ -0,0 +1,197 @@
+import collections
+import math
+import threading
+import time
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from appifyhub.exceptions import CircuitOpenError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class Circuit:
+    """Health of a single endpoint, identified by HTTP method and path template."""
+
+    def __init__(self, breaker: 'CircuitBreaker', key: Tuple[str, str]) -> None:
+        self.breaker = breaker
+        self.key = key
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # [second, calls, failures] per second of the rolling window
+        self._buckets: Deque[List[int]] = collections.deque()
+        self._probes = 0
+        self._probe_successes = 0
+
+    def counts(self) -> Tuple[int, int]:
+        """Returns the calls and failures seen within the rolling window."""
+        with self.breaker._lock:
+            self._expire(self.breaker.clock())
+            return self._counts()
+
+    def _counts(self) -> Tuple[int, int]:
+        calls = failures = 0
+        for _, bucket_calls, bucket_failures in self._buckets:
+            calls += bucket_calls
+            failures += bucket_failures
+        return calls, failures
+
+    def _expire(self, now: float) -> None:
+        oldest = math.floor(now) - self.breaker.window + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            self._buckets.popleft()
+
+    def _acquire(self, now: float) -> None:
+        breaker = self.breaker
+        if self.state == OPEN:
+            remaining = self.opened_at + breaker.cool_down - now
+            if remaining > 0:
+                raise CircuitOpenError(self.key[0], self.key[1], remaining)
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= breaker.half_open_calls - self._probe_successes:
+                raise CircuitOpenError(self.key[0], self.key[1], 0.0)
+            self._probes += 1
+
+    def record(self, failed: Optional[bool]) -> None:
+        """Records the outcome of a request let through by `CircuitBreaker.acquire`.
+
+        :param failed: whether the endpoint failed to serve the request, or
+                       None when the request ended before reaching it.
+        """
+        breaker = self.breaker
+        with breaker._lock:
+            now = breaker.clock()
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._open(now)
+                elif failed is not None:
+                    self._probe_successes += 1
+                    if self._probe_successes >= breaker.half_open_calls:
+                        self._buckets.clear()
+                        self._transition(CLOSED)
+                return
+            if failed is None or self.state != CLOSED:
+                return
+
+            second = math.floor(now)
+            if self._buckets and self._buckets[-1][0] == second:
+                bucket = self._buckets[-1]
+            else:
+                bucket = [second, 0, 0]
+                self._buckets.append(bucket)
+            bucket[1] += 1
+            if failed:
+                bucket[2] += 1
+                self._expire(now)
+                calls, failures = self._counts()
+                if (calls >= breaker.minimum_calls
+                        and failures >= calls * breaker.failure_rate_threshold):
+                    self._open(now)
+
+    def record_response(self, response) -> None:
+        """Records a received response, failed when its status is a failure status."""
+        self.record(response.status in self.breaker.failure_statuses)
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._probes = 0
+        self._probe_successes = 0
+        if self.breaker.on_state_change is not None:
+            self.breaker.on_state_change(self.key, previous, state)
+
+
+class CircuitBreaker:
+    """Stops calling endpoints that keep failing, so that callers fail fast.
+
+    Every endpoint, identified by its HTTP method and path template (e.g.
+    `GET /v1/universal/users/{universalId}`), has its own circuit:
+
+    * closed: requests go through while their outcomes are counted over the
+      last `window` seconds. Once at least `minimum_calls` were made and
+      the share of failures reaches `failure_rate_threshold`, the circuit
+      opens.
+    * open: requests fail immediately with `CircuitOpenError`, without
+      taking a pooled connection, until `cool_down` seconds pass.
+    * half-open: up to `half_open_calls` probe requests go through. The
+      circuit closes when they all succeed and opens again when one fails.
+
+    Transport failures, i.e. connection errors, timeouts and dropped
+    connections, and the `failure_statuses` responses count as failures;
+    any other response counts as a success. Other errors, like invalid
+    arguments, are not counted.
+
+    :param failure_rate_threshold: share of failed calls, between 0 and 1,
+                                   that opens the circuit.
+    :param minimum_calls: calls within the window needed before the
+                          failure rate is considered.
+    :param window: length of the rolling window, in whole seconds.
+    :param cool_down: time an open circuit rejects requests, in seconds.
+    :param half_open_calls: probe requests needed to close the circuit.
+    :param failure_statuses: response statuses counted as failures.
+    :param on_state_change: called with the endpoint key, the previous and
+                            the new state on every transition, e.g. for
+                            logging. Called while holding the breaker's lock.
+    :param clock: monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 20,
+        window: int = 30,
+        cool_down: float = 15.0,
+        half_open_calls: int = 1,
+        failure_statuses: Iterable[int] = (500, 502, 503, 504),
+        on_state_change: Optional[Callable[[Tuple[str, str], str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window = max(1, int(window))
+        self.cool_down = cool_down
+        self.half_open_calls = max(1, half_open_calls)
+        self.failure_statuses = frozenset(failure_statuses)
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self._circuits: Dict[Tuple[str, str], Circuit] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, method: str, resource_path: str) -> Circuit:
+        """Lets a request to the endpoint through, or raises `CircuitOpenError`.
+
+        The outcome of the request must then be reported to the returned
+        circuit with `record` or `record_response`.
+        """
+        key = (method, resource_path)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = Circuit(self, key)
+            circuit._acquire(self.clock())
+        return circuit
+
+    def state(self, method: str, resource_path: str) -> str:
+        """Returns the state of the endpoint's circuit."""
+        with self._lock:
+            circuit = self._circuits.get((method, resource_path))
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and self.clock() >= circuit.opened_at + self.cool_down:
+                return HALF_OPEN
+            return circuit.state
+
+    def states(self) -> Dict[Tuple[str, str], str]:
+        """Returns the state of every endpoint called so far."""
+        return {key: self.state(*key) for key in list(self._circuits)}
+
+    def reset(self) -> None:
+        """Closes all circuits and forgets their history."""
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,169 @@
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from typing_extensions import Protocol
+
+from appifyhub.exceptions import ApiException
+
+try:
+    import brotli  # type: ignore[import]
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli  # type: ignore[import]
+    except ImportError:
+        brotli = None
+
+# size of the chunks response bodies are read and decompressed in
+CHUNK_SIZE = 64 * 1024
+
+
+def default_accept_encoding() -> str:
+    """Returns the content codings this installation can decode, best first."""
+    if brotli is not None:
+        return 'br, gzip, deflate'
+    return 'gzip, deflate'
+
+
+class _ContentDecoder(Protocol):
+    """Decompresses a body in one content coding, chunk by chunk."""
+
+    def decompress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+
+class _GzipDecoder:
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes) -> bytes:
+        output = self._decompressor.decompress(data)
+        # a body may hold several gzip members one after the other
+        while self._decompressor.eof and self._decompressor.unused_data:
+            unused_data = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output += self._decompressor.decompress(unused_data)
+        return output
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _DeflateDecoder:
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj()
+        # data fed until the format is known; servers send either zlib
+        # wrapped or raw deflate data for `deflate`
+        self._first_data: Optional[bytes] = b''
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first_data is None:
+            return self._decompressor.decompress(data)
+        self._first_data += data
+        try:
+            output = self._decompressor.decompress(data)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            first_data, self._first_data = self._first_data, None
+            return self._decompressor.decompress(first_data)
+        if output:
+            self._first_data = None
+        return output
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class _BrotliDecoder:
+
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+        self._process = (
+            getattr(self._decompressor, 'process', None) or self._decompressor.decompress
+        )
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._process(data)
+
+    def flush(self) -> bytes:
+        return b''
+
+
+_DECODERS: Dict[str, Callable[[], _ContentDecoder]] = {
+    'gzip': _GzipDecoder,
+    'x-gzip': _GzipDecoder,
+    'deflate': _DeflateDecoder,
+}
+_ERRORS: Tuple[Type[BaseException], ...] = (zlib.error,)
+if brotli is not None:
+    _DECODERS['br'] = _BrotliDecoder
+    _ERRORS += (brotli.error,)
+
+
+class Decoder:
+    """Decodes a response body sent with a `Content-Encoding` as its chunks arrive.
+
+    Bodies in codings that cannot be decoded here are kept as they are,
+    like urllib3 does.
+
+    :param content_encoding: the response's `Content-Encoding` header.
+    """
+
+    def __init__(self, content_encoding: Optional[str] = None) -> None:
+        codings = [coding.strip().lower() for coding in (content_encoding or '').split(',')]
+        codings = [coding for coding in codings if coding and coding != 'identity']
+        if all(coding in _DECODERS for coding in codings):
+            # codings are listed in the order they were applied
+            self._decoders: List[_ContentDecoder] = [
+                _DECODERS[coding]() for coding in reversed(codings)
+            ]
+        else:
+            self._decoders = []
+        self.content_encoding = content_encoding
+        self.wire_bytes = 0
+        """Bytes received, before decoding"""
+        self._parts: List[bytes] = []
+
+    @property
+    def decodes(self) -> bool:
+        """Whether the body gets decoded."""
+        return bool(self._decoders)
+
+    def feed(self, chunk: bytes) -> None:
+        """Decodes the next chunk of the body."""
+        self.wire_bytes += len(chunk)
+        try:
+            for decoder in self._decoders:
+                if not chunk:
+                    break
+                chunk = decoder.decompress(chunk)
+        except _ERRORS as e:
+            raise self._error(e)
+        if chunk:
+            self._parts.append(chunk)
+
+    def finish(self) -> bytes:
+        """Returns the decoded body, once all of it was fed."""
+        try:
+            chunk = b''
+            for decoder in self._decoders:
+                if chunk:
+                    chunk = decoder.decompress(chunk)
+                chunk += decoder.flush()
+        except _ERRORS as e:
+            raise self._error(e)
+        if chunk:
+            self._parts.append(chunk)
+        body = b''.join(self._parts)
+        self._parts = []
+        return body
+
+    def _error(self, error: BaseException) -> ApiException:
+        msg = "Received response with content-encoding: %s, but failed to decode it: %s" % (
+            self.content_encoding, error,
+        )
+        return ApiException(status=0, reason=msg)
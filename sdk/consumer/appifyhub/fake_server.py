@@ -0,0 +1,992 @@
+import base64
+import collections
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+UNIVERSAL_DELIMITER = "$"
+CREATOR_PROJECT_ID = 1
+DEFAULT_VALUE = "******"
+DONE = {"message": "Done"}
+
+# Template variables in the order the service defines them
+VARIABLES = [
+    ("user.name", "Mark Watson"),
+    ("project.name", "Mortgage Calculator"),
+    ("user.code", "123456"),
+    ("user.signature", "123456"),
+]
+
+# (method, resource path, operation) for every consumer and creator operation
+ROUTES = [
+    ("GET", "/heartbeat", "heartbeat"),
+    ("POST", "/v1/universal/auth", "authenticate"),
+    ("GET", "/v1/universal/auth", "get_current_token"),
+    ("PUT", "/v1/universal/auth", "refresh"),
+    ("DELETE", "/v1/universal/auth", "unauthenticate"),
+    ("GET", "/v1/universal/auth/tokens", "get_all_tokens"),
+    ("DELETE", "/v1/universal/auth/tokens", "unauthenticate_tokens"),
+    ("POST", "/v1/projects/{projectId}/signup", "add_user"),
+    ("GET", "/v1/projects/{projectId}/search", "search_users"),
+    ("POST", "/v1/projects/{projectId}/users/{universalId}/message", "send_message"),
+    ("GET", "/v1/universal/users/{universalId}", "get_user"),
+    ("DELETE", "/v1/universal/users/{universalId}", "delete_user"),
+    ("PUT", "/v1/universal/users/{universalId}/authority", "update_authority"),
+    ("PUT", "/v1/universal/users/{universalId}/data", "update_data"),
+    ("PUT", "/v1/universal/users/{universalId}/signature", "update_signature"),
+    ("PUT", "/v1/universal/users/{universalId}/signature/reset", "reset_signature"),
+    ("PUT", "/v1/universal/users/{universalId}/verify/{verificationToken}", "verify_token"),
+    ("POST", "/v1/universal/users/{universalId}/force-verify", "force_verify_user"),
+    ("POST", "/v1/universal/users/{universalId}/push-devices", "add_push_device"),
+    ("GET", "/v1/universal/users/{universalId}/push-devices", "fetch_all_push_devices_for_user"),
+    ("DELETE", "/v1/universal/users/{universalId}/push-devices",
+     "remove_all_push_devices_for_user"),
+    ("GET", "/v1/universal/users/{universalId}/push-devices/{deviceId}", "fetch_push_device"),
+    ("DELETE", "/v1/universal/users/{universalId}/push-devices/{deviceId}", "remove_push_device"),
+    ("POST", "/v1/universal/users/{universalId}/signup-codes", "create_signup_code"),
+    ("GET", "/v1/universal/users/{universalId}/signup-codes", "fetch_all_signup_codes_for_user"),
+    ("POST", "/v1/creator/signup", "add_creator"),
+    ("POST", "/v1/creator/auth", "authenticate_creator"),
+    ("POST", "/v1/creator/apikey", "create_api_key"),
+    ("POST", "/v1/projects", "add_project"),
+    ("GET", "/v1/projects", "get_projects"),
+    ("DELETE", "/v1/projects", "remove_projects_by_creator"),
+    ("GET", "/v1/projects/{projectId}", "get_project"),
+    ("PUT", "/v1/projects/{projectId}", "update_project"),
+    ("DELETE", "/v1/projects/{projectId}", "remove_project"),
+    ("POST", "/v1/projects/{projectId}/messaging/template", "add_template"),
+    ("GET", "/v1/projects/{projectId}/messaging/templates/{templateId}", "fetch_template_by_id"),
+    ("PUT", "/v1/projects/{projectId}/messaging/templates/{templateId}", "update_template"),
+    ("DELETE", "/v1/projects/{projectId}/messaging/templates/{templateId}",
+     "delete_template_by_id"),
+    ("GET", "/v1/projects/{projectId}/messaging/template-search", "search_templates"),
+    ("DELETE", "/v1/projects/{projectId}/messaging/template-search", "delete_templates"),
+    ("GET", "/v1/projects/{projectId}/messaging/template-variables", "get_defined_variables"),
+    ("POST", "/v1/projects/{projectId}/messaging/template-variables", "detect_variables"),
+    ("POST", "/v1/projects/{projectId}/messaging/template-materialize", "materialize"),
+]
+
+# Operations reachable without a bearer token
+PUBLIC_OPERATIONS = {
+    "heartbeat",
+    "authenticate",
+    "authenticate_creator",
+    "add_user",
+    "add_creator",
+    "verify_token",
+    "reset_signature",
+}
+
+
+class FakeHubError(Exception):
+    """Raised by operation handlers to answer with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _compile_route(resource_path: str) -> "re.Pattern[str]":
+    pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", resource_path)
+    return re.compile("^" + pattern + "$")
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+AUTHORITIES = ["DEFAULT", "MODERATOR", "ADMIN", "OWNER"]
+
+_signing_key: Optional[rsa.RSAPrivateKey] = None
+_signing_key_lock = threading.Lock()
+
+
+def signing_key() -> rsa.RSAPrivateKey:
+    """Returns the RSA key signing the tokens, generated once per process."""
+    global _signing_key
+    with _signing_key_lock:
+        if _signing_key is None:
+            _signing_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return _signing_key
+
+
+def public_key_pem() -> str:
+    """Returns the public key verifying the tokens, as a PEM `PUBLIC KEY` block."""
+    return signing_key().public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode("ascii")
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _jwt(claims: Dict[str, Any]) -> str:
+    """Encodes and signs the claims the way the service does (RS256)."""
+    signing_input = "%s.%s" % (
+        _b64url(json.dumps({"typ": "JWT", "alg": "RS256"}).encode("utf-8")),
+        _b64url(json.dumps(claims, separators=(",", ":")).encode("utf-8")),
+    )
+    signature = signing_key().sign(
+        signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256(),
+    )
+    return signing_input + "." + _b64url(signature)
+
+
+def _like(pattern: str, value: Optional[str]) -> bool:
+    """Mirrors the service's SQL `LIKE` matching (`%` and `_` wildcards)."""
+    if value is None:
+        return False
+    regex = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.fullmatch(regex, value, re.IGNORECASE | re.DOTALL) is not None
+
+
+def _flag(query: Dict[str, List[str]], name: str) -> Optional[bool]:
+    value = _param(query, name)
+    return None if value is None else value.lower() == "true"
+
+
+def _param(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _apply_settables(target: Dict[str, Any], request: Dict[str, Any]) -> None:
+    for field, settable in request.items():
+        if settable is not None:
+            target[field] = settable["value"]
+
+
+class FakeAppifyHub:
+    """In-process stand-in for the Appify Hub service.
+
+    Serves every route the consumer and creator SDKs call from a local
+    threaded HTTP server, keeping projects, users, tokens and templates in
+    memory. It is meant for tests, benchmarks and load tests that need to
+    drive `ApiClient` without network access:
+
+        with FakeAppifyHub(latency=0.005) as hub:
+            project = hub.add_project("Project")
+            user = hub.add_user(project["project_id"], "user@example.com")
+            configuration = Configuration(host=hub.host)
+            configuration.access_token = hub.create_token(user["universal_id"])
+
+    Any known, unblocked bearer token grants access to everything; the
+    service's privilege model is not reproduced.
+
+    :param latency: seconds to wait before answering, either a fixed number
+                    or a (min, max) range sampled uniformly per request.
+    :param error_rate: probability of failing a request with `error_status`.
+    :param error_status: status code used for randomly injected failures.
+    :param seed: seed for the latency and failure sampling.
+    :param etags: tag successful GET responses with an `ETag` and answer
+                  `If-None-Match` requests for unchanged data with
+                  304 Not Modified.
+    :param compression: gzip response bodies of at least `min_compress_size`
+                        bytes for requests accepting gzip.
+    :param min_compress_size: smallest body compressed, in bytes.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        etags: bool = False,
+        compression: bool = False,
+        min_compress_size: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.etags = etags
+        self.compression = compression
+        self.min_compress_size = min_compress_size
+
+        self.routes = [
+            (method, _compile_route(resource_path), operation)
+            for method, resource_path, operation in ROUTES
+        ]
+        self.lock = threading.RLock()
+        self.random = random.Random(seed)
+        self.failures: List[Dict[str, Any]] = []
+        self.calls: Dict[str, int] = collections.Counter()
+        self.reset()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        """Base URL to use as `Configuration.host`."""
+        return "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def start(self) -> "FakeAppifyHub":
+        """Starts serving requests in a background thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving requests and closes the listening socket."""
+        if self.thread is not None:
+            self.server.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeAppifyHub":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        """Drops all state, keeping only the built-in creator project."""
+        with self.lock:
+            self.projects: Dict[int, Dict[str, Any]] = {}
+            self.users: Dict[str, Dict[str, Any]] = {}
+            self.tokens: Dict[str, Dict[str, Any]] = {}
+            self.templates: Dict[int, Dict[str, Any]] = {}
+            self.push_devices: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            self.signup_codes: Dict[str, List[Dict[str, Any]]] = {}
+            self.messages: List[Dict[str, Any]] = []
+            self.signatures: Dict[str, str] = {}
+            self.verification_tokens: Dict[str, str] = {}
+            self.project_owners: Dict[int, str] = {}
+            self.template_projects: Dict[int, int] = {}
+            self.failures.clear()
+            self.calls.clear()
+            self.not_modified = 0
+            self.project_ids = itertools.count(CREATOR_PROJECT_ID)
+            self.template_ids = itertools.count(1)
+            self.add_project("Appify Hub", type="COMMERCIAL", user_id_type="EMAIL")
+
+    # Fault injection
+
+    def fail_next(
+        self,
+        status: int = 503,
+        count: int = 1,
+        operation: Optional[str] = None,
+        retry_after: Optional[int] = None,
+    ) -> None:
+        """Fails the next `count` requests (optionally only to `operation`).
+
+        :param status: status code of the injected failures.
+        :param count: number of requests to fail.
+        :param operation: SDK operation name, e.g. `"search_users"`.
+        :param retry_after: seconds to send in a `Retry-After` header, if any.
+        """
+        with self.lock:
+            self.failures.append({
+                "status": status,
+                "remaining": count,
+                "operation": operation,
+                "retry_after": retry_after,
+            })
+
+    def _injected_failure(self, operation: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            for failure in self.failures:
+                if failure["operation"] in (None, operation):
+                    failure["remaining"] -= 1
+                    if failure["remaining"] <= 0:
+                        self.failures.remove(failure)
+                    return failure
+            if self.error_rate and self.random.random() < self.error_rate:
+                return {"status": self.error_status, "retry_after": None}
+            return None
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            with self.lock:
+                return self.random.uniform(*self.latency)
+        return self.latency
+
+    # Seeding
+
+    def add_project(
+        self, name: str, owner_universal_id: Optional[str] = None, **fields: Any,
+    ) -> Dict[str, Any]:
+        """Stores a project and returns it in `ProjectResponse` form."""
+        with self.lock:
+            project_id = next(self.project_ids)
+            now = _now()
+            project = {
+                "project_id": project_id,
+                "type": "FREE",
+                "state": {"status": "ACTIVE", "usable_features": [], "unusable_features": []},
+                "user_id_type": "CUSTOM",
+                "name": name,
+                "description": None,
+                "logo_url": None,
+                "website_url": None,
+                "language_tag": None,
+                "max_users": 10000,
+                "anyone_can_search": False,
+                "on_hold": False,
+                "requires_signup_codes": False,
+                "max_signup_codes_per_user": 0,
+                "mailgun_config": None,
+                "twilio_config": None,
+                "firebase_config": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            project.update(fields)
+            self.projects[project_id] = project
+            if owner_universal_id is not None:
+                self.project_owners[project_id] = owner_universal_id
+            return project
+
+    def add_user(
+        self, project_id: int, user_id: str, raw_signature: str = "password", **fields: Any,
+    ) -> Dict[str, Any]:
+        """Stores a user and returns it in `UserResponse` form."""
+        with self.lock:
+            self._project(project_id)
+            universal_id = "%s%s%d" % (user_id, UNIVERSAL_DELIMITER, project_id)
+            if universal_id in self.users:
+                raise FakeHubError(409, "Request Error: User already exists")
+            now = _now()
+            user = {
+                "user_id": user_id,
+                "project_id": project_id,
+                "universal_id": universal_id,
+                "name": None,
+                "type": "PERSONAL",
+                "authority": "DEFAULT",
+                "allows_spam": False,
+                "contact": None,
+                "contact_type": "CUSTOM",
+                "birthday": None,
+                "company": None,
+                "language_tag": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            user.update(fields)
+            self.users[universal_id] = user
+            self.signatures[universal_id] = raw_signature
+            self.verification_tokens[universal_id] = secrets.token_hex(8)
+            return user
+
+    def add_template(
+        self, project_id: int, name: str, content: str, **fields: Any,
+    ) -> Dict[str, Any]:
+        """Stores a message template and returns it in `MessageTemplateResponse` form."""
+        with self.lock:
+            self._project(project_id)
+            now = _now()
+            template: Dict[str, Any] = {
+                "id": next(self.template_ids),
+                "name": name,
+                "language_tag": "en",
+                "title": name,
+                "content": content,
+                "is_html": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            template.update(fields)
+            self.templates[template["id"]] = template
+            self.template_projects[template["id"]] = project_id
+            return template
+
+    def create_token(
+        self, universal_id: str, is_static: bool = False, origin: Optional[str] = None,
+    ) -> str:
+        """Issues a bearer token for the user and returns its value."""
+        with self.lock:
+            user = self._user(universal_id)
+            created_at = int(time.time())
+            expires_at = created_at + 86400
+            authorities = AUTHORITIES[:AUTHORITIES.index(user["authority"]) + 1]
+            claims = {
+                "sub": universal_id,
+                "iat": created_at,
+                "exp": expires_at,
+                # the service's claims are all strings
+                "user_id": user["user_id"],
+                "project_id": str(user["project_id"]),
+                "universal_id": universal_id,
+                "authorities": ",".join(authorities),
+                "is_static": str(is_static).lower(),
+                "ip_address": "127.0.0.1",
+                # keeps tokens issued within the same second unique
+                "jti": secrets.token_hex(8),
+            }
+            if origin is not None:
+                claims["origin"] = origin
+            token_value = _jwt(claims)
+            self.tokens[token_value] = {
+                "token_value": token_value,
+                "user_id": user["user_id"],
+                "project_id": user["project_id"],
+                "universal_id": universal_id,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created_at)),
+                "expires_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(expires_at)),
+                "authority": user["authority"],
+                "is_blocked": False,
+                "origin": origin,
+                "ip_address": "127.0.0.1",
+                "geo": None,
+                "is_static": is_static,
+            }
+            return token_value
+
+    # Lookups
+
+    def _project(self, project_id: Any) -> Dict[str, Any]:
+        project = self.projects.get(int(project_id))
+        if project is None:
+            raise FakeHubError(404, "Request Error: Project not found")
+        return project
+
+    def _user(self, universal_id: str) -> Dict[str, Any]:
+        user = self.users.get(universal_id)
+        if user is None:
+            raise FakeHubError(404, "Request Error: User not found")
+        return user
+
+    def _template(self, project_id: Any, template_id: Any) -> Dict[str, Any]:
+        template = self.templates.get(int(template_id))
+        if template is None or self.template_projects[template["id"]] != int(project_id):
+            raise FakeHubError(404, "Request Error: Template not found")
+        return template
+
+    def _token(self, authorization: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not authorization or not authorization.startswith("Bearer "):
+            return None
+        token = self.tokens.get(authorization[len("Bearer "):])
+        if token is None:
+            raise FakeHubError(401, "Unauthorized: Invalid token")
+        if token["is_blocked"]:
+            raise FakeHubError(401, "Access Error: Token is blocked")
+        return token
+
+    def _issue(self, credentials: Dict[str, Any], creator: bool) -> Dict[str, Any]:
+        universal_id = credentials["universal_id"]
+        user = self.users.get(universal_id)
+        if (
+            user is None
+            or self.signatures[universal_id] != credentials["signature"]
+            or (user["project_id"] == CREATOR_PROJECT_ID) != creator
+        ):
+            raise FakeHubError(401, "Credentials Error: Invalid credentials")
+        return {"token_value": self.create_token(universal_id, origin=credentials.get("origin"))}
+
+    def _materialize(
+        self, template: Dict[str, Any], user: Optional[Dict[str, Any]],
+        project: Optional[Dict[str, Any]],
+    ) -> str:
+        values = {
+            "user.name": user and user["name"],
+            "project.name": project and project["name"],
+            "user.code": user and self.verification_tokens.get(user["universal_id"]),
+            "user.signature": user and self.signatures.get(user["universal_id"]),
+        }
+        content = template["content"]
+        for code, _ in VARIABLES:
+            content = content.replace("{{%s}}" % code, values[code] or DEFAULT_VALUE)
+        return content
+
+    def _find_template(
+        self, project_id: int, name: str, user: Optional[Dict[str, Any]],
+        project: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        matching = [
+            template for template_id, template in self.templates.items()
+            if self.template_projects[template_id] == project_id and template["name"] == name
+        ]
+        if not matching:
+            raise FakeHubError(404, "No matching templates")
+        # language selection priority: (1) user, (2) project, (3) last updated
+        for source in (user, project):
+            language_tag = source["language_tag"] if source is not None else None
+            for template in matching:
+                if template["language_tag"] == language_tag:
+                    return template
+        return max(matching, key=lambda template: template["updated_at"])
+
+    def _delete_user(self, universal_id: str) -> None:
+        self._user(universal_id)
+        stores: Tuple[Dict[str, Any], ...] = (
+            self.users, self.push_devices, self.signup_codes, self.signatures,
+            self.verification_tokens,
+        )
+        for store in stores:
+            store.pop(universal_id, None)
+        for token in self.tokens.values():
+            if token["universal_id"] == universal_id:
+                token["is_blocked"] = True
+
+    def _delete_project(self, project_id: int) -> None:
+        self._project(project_id)
+        users = [u for u, user in self.users.items() if user["project_id"] == project_id]
+        for universal_id in users:
+            self._delete_user(universal_id)
+        for template_id in [t for t, p in self.template_projects.items() if p == project_id]:
+            del self.templates[template_id]
+            del self.template_projects[template_id]
+        del self.projects[project_id]
+        self.project_owners.pop(project_id, None)
+
+    # Operations: heartbeat and authentication
+
+    def _op_heartbeat(self, request):
+        return {
+            "beat_time": _now(),
+            "request_ip": request["client"],
+            "request_geo": None,
+            "version": "fake",
+        }
+
+    def _op_authenticate(self, request):
+        return self._issue(request["body"], creator=False)
+
+    def _op_authenticate_creator(self, request):
+        return self._issue(request["body"], creator=True)
+
+    def _op_create_api_key(self, request):
+        origin = (request["body"] or {}).get("origin")
+        universal_id = request["token"]["universal_id"]
+        return {"token_value": self.create_token(universal_id, is_static=True, origin=origin)}
+
+    def _op_get_current_token(self, request):
+        return request["token"]
+
+    def _op_refresh(self, request):
+        token = request["token"]
+        token["is_blocked"] = True
+        return {"token_value": self.create_token(token["universal_id"], origin=token["origin"])}
+
+    def _op_get_all_tokens(self, request):
+        universal_id = _param(request["query"], "user_id") or request["token"]["universal_id"]
+        valid = _flag(request["query"], "valid")
+        return [
+            token for token in self.tokens.values()
+            if token["universal_id"] == universal_id
+            and (valid is None or valid != token["is_blocked"])
+        ]
+
+    def _op_unauthenticate(self, request):
+        universal_id = _param(request["query"], "user_id") or request["token"]["universal_id"]
+        if _flag(request["query"], "all"):
+            for token in self.tokens.values():
+                if token["universal_id"] == universal_id:
+                    token["is_blocked"] = True
+        else:
+            request["token"]["is_blocked"] = True
+        return DONE
+
+    def _op_unauthenticate_tokens(self, request):
+        for token_value in request["query"].get("token_ids", []):
+            if token_value in self.tokens:
+                self.tokens[token_value]["is_blocked"] = True
+        return DONE
+
+    # Operations: users
+
+    def _op_add_user(self, request):
+        project = self._project(request["params"]["projectId"])
+        body = dict(request["body"])
+        user_id = body.pop("user_id", None) or secrets.token_hex(8)
+        raw_signature = body.pop("raw_signature")
+        signup_code = body.pop("signup_code", None)
+        if project["requires_signup_codes"]:
+            code = next(
+                (
+                    c for codes in self.signup_codes.values() for c in codes
+                    if c["code"] == signup_code and not c["is_used"]
+                ),
+                None,
+            )
+            if code is None:
+                raise FakeHubError(422, "Request Error: Signup code is invalid")
+            code["is_used"] = True
+            code["used_at"] = _now()
+        fields = {key: value for key, value in body.items() if value is not None}
+        return self.add_user(project["project_id"], user_id, raw_signature, **fields)
+
+    def _op_add_creator(self, request):
+        body = dict(request["body"])
+        user_id = body.pop("user_id")
+        raw_signature = body.pop("raw_signature")
+        body.pop("signup_code", None)
+        fields = {key: value for key, value in body.items() if value is not None}
+        return self.add_user(
+            CREATOR_PROJECT_ID, user_id, raw_signature,
+            contact=user_id, contact_type="EMAIL", **fields,
+        )
+
+    def _op_get_user(self, request):
+        return self._user(request["params"]["universalId"])
+
+    def _op_delete_user(self, request):
+        self._delete_user(request["params"]["universalId"])
+        return DONE
+
+    def _op_search_users(self, request):
+        project = self._project(request["params"]["projectId"])
+        name = _param(request["query"], "user_name")
+        contact = _param(request["query"], "user_contact")
+        if name is not None:
+            field, pattern = "name", name
+        elif contact is not None:
+            field, pattern = "contact", contact
+        else:
+            raise FakeHubError(404, "At least one user property is required for querying")
+        return [
+            user for user in self.users.values()
+            if user["project_id"] == project["project_id"] and _like(pattern, user[field])
+        ]
+
+    def _op_update_authority(self, request):
+        user = self._user(request["params"]["universalId"])
+        user["authority"] = request["body"]["authority"]
+        user["updated_at"] = _now()
+        return user
+
+    def _op_update_data(self, request):
+        user = self._user(request["params"]["universalId"])
+        body = dict(request["body"])
+        company = body.pop("company", None)
+        _apply_settables(user, body)
+        if company is not None:
+            if company["value"] is None:
+                user["company"] = None
+            else:
+                user["company"] = dict(user["company"] or {})
+                _apply_settables(user["company"], company["value"])
+        user["updated_at"] = _now()
+        return user
+
+    def _op_update_signature(self, request):
+        universal_id = request["params"]["universalId"]
+        user = self._user(universal_id)
+        if self.signatures[universal_id] != request["body"]["raw_signature_old"]:
+            raise FakeHubError(401, "Credentials Error: Invalid credentials")
+        self.signatures[universal_id] = request["body"]["raw_signature_new"]
+        user["updated_at"] = _now()
+        return user
+
+    def _op_reset_signature(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        self.signatures[universal_id] = secrets.token_hex(4)
+        return DONE
+
+    def _op_verify_token(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        if self.verification_tokens.get(universal_id) != request["params"]["verificationToken"]:
+            raise FakeHubError(404, "Request Error: Verification token not found")
+        del self.verification_tokens[universal_id]
+        return DONE
+
+    def _op_force_verify_user(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        self.verification_tokens.pop(universal_id, None)
+        return DONE
+
+    # Operations: push devices and signup codes
+
+    def _op_add_push_device(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        device = {"id": request["body"]["id"], "type": request["body"]["type"]}
+        self.push_devices.setdefault(universal_id, {})[device["id"]] = device
+        return device
+
+    def _op_fetch_all_push_devices_for_user(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        return {"devices": list(self.push_devices.get(universal_id, {}).values())}
+
+    def _op_fetch_push_device(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        device = self.push_devices.get(universal_id, {}).get(request["params"]["deviceId"])
+        if device is None:
+            raise FakeHubError(404, "Request Error: Push device not found")
+        return device
+
+    def _op_remove_all_push_devices_for_user(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        self.push_devices.pop(universal_id, None)
+        return DONE
+
+    def _op_remove_push_device(self, request):
+        universal_id = request["params"]["universalId"]
+        self._user(universal_id)
+        devices = self.push_devices.get(universal_id, {})
+        if devices.pop(request["params"]["deviceId"], None) is None:
+            raise FakeHubError(404, "Request Error: Push device not found")
+        return DONE
+
+    def _op_create_signup_code(self, request):
+        universal_id = request["params"]["universalId"]
+        user = self._user(universal_id)
+        codes = self.signup_codes.setdefault(universal_id, [])
+        if len(codes) >= self._project(user["project_id"])["max_signup_codes_per_user"]:
+            raise FakeHubError(422, "Request Error: Signup code limit reached")
+        code = {
+            "code": secrets.token_hex(4).upper(),
+            "is_used": False,
+            "created_at": _now(),
+            "used_at": None,
+        }
+        codes.append(code)
+        return code
+
+    def _op_fetch_all_signup_codes_for_user(self, request):
+        universal_id = request["params"]["universalId"]
+        user = self._user(universal_id)
+        return {
+            "signup_codes": self.signup_codes.get(universal_id, []),
+            "max_signup_codes": self._project(user["project_id"])["max_signup_codes_per_user"],
+        }
+
+    # Operations: messaging
+
+    def _op_send_message(self, request):
+        project = self._project(request["params"]["projectId"])
+        user = self._user(request["params"]["universalId"])
+        body = request["body"]
+        if body.get("message_template_id") is not None:
+            template = self._template(project["project_id"], body["message_template_id"])
+        elif body.get("message_template_name") is not None:
+            template = self._find_template(
+                project["project_id"], body["message_template_name"], user, project,
+            )
+        else:
+            raise FakeHubError(
+                422, "Request Error: One of [Template ID, Template Name] are required",
+            )
+        self.messages.append({
+            "project_id": project["project_id"],
+            "universal_id": user["universal_id"],
+            "message_type": body["message_type"],
+            "template_id": template["id"],
+            "title": template["title"],
+            "materialized": self._materialize(template, user, project),
+        })
+        return DONE
+
+    # Operations: projects
+
+    def _op_add_project(self, request):
+        body = {key: value for key, value in request["body"].items() if value is not None}
+        owner_universal_id = body.pop("owner_universal_id")
+        self._user(owner_universal_id)
+        return self.add_project(body.pop("name"), owner_universal_id, **body)
+
+    def _op_get_project(self, request):
+        return self._project(request["params"]["projectId"])
+
+    def _op_get_projects(self, request):
+        creator_id = _param(request["query"], "creator_id") or request["token"]["universal_id"]
+        return [
+            self.projects[p] for p, owner in self.project_owners.items() if owner == creator_id
+        ]
+
+    def _op_update_project(self, request):
+        project = self._project(request["params"]["projectId"])
+        body = dict(request["body"])
+        status = body.pop("status", None)
+        _apply_settables(project, body)
+        if status is not None:
+            project["state"]["status"] = status["value"]
+        project["updated_at"] = _now()
+        return project
+
+    def _op_remove_project(self, request):
+        self._delete_project(int(request["params"]["projectId"]))
+        return DONE
+
+    def _op_remove_projects_by_creator(self, request):
+        creator_id = _param(request["query"], "creator_id") or request["token"]["universal_id"]
+        for project_id in [p for p, owner in self.project_owners.items() if owner == creator_id]:
+            self._delete_project(project_id)
+        return DONE
+
+    # Operations: message templates
+
+    def _op_add_template(self, request):
+        body = dict(request["body"])
+        project_id = self._project(request["params"]["projectId"])["project_id"]
+        return self.add_template(project_id, body.pop("name"), body.pop("content"), **body)
+
+    def _op_fetch_template_by_id(self, request):
+        return self._template(request["params"]["projectId"], request["params"]["templateId"])
+
+    def _op_update_template(self, request):
+        template = self._template(request["params"]["projectId"], request["params"]["templateId"])
+        _apply_settables(template, request["body"])
+        template["updated_at"] = _now()
+        return template
+
+    def _op_delete_template_by_id(self, request):
+        template = self._template(request["params"]["projectId"], request["params"]["templateId"])
+        del self.templates[template["id"]]
+        del self.template_projects[template["id"]]
+        return DONE
+
+    def _op_search_templates(self, request):
+        project_id = self._project(request["params"]["projectId"])["project_id"]
+        name = _param(request["query"], "name")
+        language_tag = _param(request["query"], "language_tag")
+        return [
+            template for template_id, template in self.templates.items()
+            if self.template_projects[template_id] == project_id
+            and (name is None or template["name"] == name)
+            and (name is None or language_tag is None or template["language_tag"] == language_tag)
+        ]
+
+    def _op_delete_templates(self, request):
+        for template in self._op_search_templates(request):
+            del self.templates[template["id"]]
+            del self.template_projects[template["id"]]
+        return DONE
+
+    def _op_get_defined_variables(self, request):
+        self._project(request["params"]["projectId"])
+        return [{"code": code, "example": example} for code, example in VARIABLES]
+
+    def _op_detect_variables(self, request):
+        self._project(request["params"]["projectId"])
+        content = request["body"]["content"]
+        return [
+            {"code": code, "example": example}
+            for code, example in VARIABLES
+            if "{{%s}}" % code in content
+        ]
+
+    def _op_materialize(self, request):
+        project_id = self._project(request["params"]["projectId"])["project_id"]
+        inputs = request["body"] or {}
+        user = self._user(inputs["user_id"]) if inputs.get("user_id") else None
+        project = self._project(inputs["project_id"]) if inputs.get("project_id") else None
+        template_id = _param(request["query"], "id")
+        name = _param(request["query"], "name")
+        if template_id is not None:
+            template = self._template(project_id, template_id)
+        elif name is not None:
+            template = self._find_template(project_id, name, user, project)
+        else:
+            raise FakeHubError(
+                422, "Request Error: One of [Template ID, Template Name] are required",
+            )
+        return {"template": template, "materialized": self._materialize(template, user, project)}
+
+    # Request handling
+
+    def handle(
+        self, method: str, target: str, headers, body: bytes, client: str,
+    ) -> Tuple[int, Dict[str, str], Any]:
+        """Answers one request, returning (status, extra headers, JSON payload)."""
+        url = urlsplit(target)
+        for route_method, pattern, operation in self.routes:
+            match = pattern.match(url.path)
+            if match and route_method == method:
+                break
+        else:
+            return 404, {}, {"message": "Not found"}
+
+        with self.lock:
+            self.calls[operation] += 1
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        failure = self._injected_failure(operation)
+        if failure is not None:
+            extra = {}
+            if failure["retry_after"] is not None:
+                extra["Retry-After"] = str(failure["retry_after"])
+            return failure["status"], extra, {"message": "Injected failure"}
+
+        try:
+            with self.lock:
+                token = self._token(headers.get("Authorization"))
+                if token is None and operation not in PUBLIC_OPERATIONS:
+                    raise FakeHubError(401, "Unauthorized: Full authentication is required")
+                request = {
+                    "params": {name: unquote(value) for name, value in match.groupdict().items()},
+                    "query": parse_qs(url.query, keep_blank_values=True),
+                    "body": json.loads(body) if body else None,
+                    "token": token,
+                    "client": client,
+                }
+                handler = getattr(self, "_op_" + operation)
+                return 200, {}, handler(request)
+        except FakeHubError as e:
+            return e.status, {}, {"message": e.message}
+        except (KeyError, TypeError, ValueError) as e:
+            return 422, {}, {"message": "Request Error: %s" % e}
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def handle_any(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = hub.handle(
+                    self.command, self.path, self.headers, body, self.client_address[0]
+                )
+                data = json.dumps(payload).encode("utf-8")
+                if hub.etags and self.command == "GET" and status == 200:
+                    headers["ETag"] = '"%s"' % hashlib.sha1(data).hexdigest()
+                    if self.headers.get("If-None-Match") == headers["ETag"]:
+                        with hub.lock:
+                            hub.not_modified += 1
+                        status, data = 304, b""
+                if (
+                    hub.compression
+                    and data
+                    and len(data) >= hub.min_compress_size
+                    and "gzip" in (self.headers.get("Accept-Encoding") or "")
+                ):
+                    data = gzip.compress(data)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = handle_any
+
+        return Handler
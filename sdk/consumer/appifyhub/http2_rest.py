@@ -0,0 +1,347 @@
+import re
+import ssl
+from typing import Any, Dict, Optional
+
+import httpx
+
+from appifyhub.exceptions import ApiException, ApiValueError
+from appifyhub.rest import RESTResponse
+
+_METHODS = ['GET', 'HEAD', 'DELETE', 'POST', 'PUT', 'PATCH', 'OPTIONS']
+
+
+class _HttpxResponse:
+    """Gives an httpx response the urllib3 response interface read by `RESTResponse`."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    @property
+    def closed(self) -> bool:
+        return self._response.is_closed
+
+    def stream(self, amt: int, decode_content: bool = False):
+        """Yields the body as received; `RESTResponse` decompresses it."""
+        try:
+            yield from self._response.iter_raw(amt)
+        finally:
+            self._response.close()
+
+
+class _AsyncHttpxResponse:
+    """Gives an httpx response the aiohttp response interface read by `AsyncRESTResponse`."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    @property
+    def content(self) -> '_AsyncHttpxResponse':
+        # aiohttp responses expose their body stream as `content`
+        return self
+
+    async def iter_chunked(self, n: int):
+        """Yields the body as received; `AsyncRESTResponse` decompresses it."""
+        try:
+            async for chunk in self._response.aiter_raw(n):
+                yield chunk
+        finally:
+            await self._response.aclose()
+
+    def release(self) -> None:
+        # the stream is closed by `iter_chunked`
+        pass
+
+
+def _ssl_context(configuration) -> ssl.SSLContext:
+    ssl_context = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
+    if configuration.cert_file:
+        ssl_context.load_cert_chain(configuration.cert_file, keyfile=configuration.key_file)
+    if not configuration.verify_ssl:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    elif configuration.assert_hostname is False:
+        ssl_context.check_hostname = False
+    return ssl_context
+
+
+def _client_args(configuration) -> Dict[str, Any]:
+    """Arguments shared by the blocking and the asyncio httpx clients."""
+    maxsize = configuration.connection_pool_maxsize
+    args = {
+        "http2": True,
+        "verify": _ssl_context(configuration),
+        "limits": httpx.Limits(max_connections=maxsize, max_keepalive_connections=maxsize),
+        "trust_env": True,
+    }
+    if configuration.proxy:
+        args["proxy"] = httpx.Proxy(configuration.proxy, headers=configuration.proxy_headers)
+    return args
+
+
+def _request_args(
+    json_codec, method, url, headers, body, post_params, _request_timeout, server_hostname,
+) -> Dict[str, Any]:
+    """Builds the arguments of `httpx.Client.build_request` for a request."""
+    method = method.upper()
+    assert method in _METHODS
+
+    if post_params and body:
+        raise ApiValueError(
+            "body parameter cannot be used with post_params parameter."
+        )
+
+    post_params = post_params or {}
+    headers = headers or {}
+
+    args = {
+        "method": method,
+        "url": url,
+        "headers": headers,
+    }
+    if _request_timeout:
+        if isinstance(_request_timeout, (int, float)):
+            args["timeout"] = httpx.Timeout(_request_timeout)
+        elif (
+                isinstance(_request_timeout, tuple)
+                and len(_request_timeout) == 2
+            ):
+            args["timeout"] = httpx.Timeout(
+                None,
+                connect=_request_timeout[0],
+                read=_request_timeout[1]
+            )
+    if server_hostname:
+        args["extensions"] = {"sni_hostname": server_hostname}
+
+    # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+    if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+
+        # no content type provided or payload is json
+        content_type = headers.get('Content-Type')
+        if (
+            not content_type
+            or re.search('json', content_type, re.IGNORECASE)
+        ):
+            if body is not None:
+                args["content"] = json_codec.encode(body)
+        elif content_type == 'application/x-www-form-urlencoded':
+            args["data"] = dict(post_params)
+        elif content_type == 'multipart/form-data':
+            # must del headers['Content-Type'], or the correct
+            # Content-Type which generated by httpx will be
+            # overwritten.
+            del headers['Content-Type']
+            data = {}
+            files = []
+            for k, v in post_params:
+                if isinstance(v, tuple) and len(v) == 3:
+                    files.append((k, v))
+                elif isinstance(v, dict):
+                    # Ensures that dict objects are serialized
+                    data[k] = json_codec.encode(v).decode('utf-8')
+                else:
+                    data[k] = v
+            args["data"] = data
+            args["files"] = files
+        # Pass a `string` parameter directly in the body to support
+        # other content types than JSON when `body` argument is
+        # provided in serialized form.
+        elif isinstance(body, str) or isinstance(body, bytes):
+            args["content"] = body
+        elif content_type == 'text/plain' and isinstance(body, bool):
+            args["content"] = "true" if body else "false"
+        else:
+            # Cannot generate the request from given parameters
+            msg = """Cannot prepare a request message for provided
+                     arguments. Please check that your arguments match
+                     declared content type."""
+            raise ApiException(status=0, reason=msg)
+    return args
+
+
+def _request_bytes(args) -> Optional[int]:
+    content = args.get("content")
+    return len(content) if isinstance(content, (str, bytes)) else None
+
+
+def _ssl_error(error) -> Optional[ssl.SSLError]:
+    """Returns the SSL error behind an httpx connection error, if any."""
+    while error is not None:
+        if isinstance(error, ssl.SSLError):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def _classify_error(error):
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return "connect"
+    transient_errors = (
+        httpx.ReadTimeout, httpx.WriteTimeout, httpx.NetworkError, httpx.RemoteProtocolError,
+    )
+    if isinstance(error, transient_errors):
+        return "transient"
+    return None
+
+
+class HTTP2RESTClientObject:
+    """Drop-in alternative to `rest.RESTClientObject` speaking HTTP/2, built on httpx.
+
+    Requests made from any number of threads are multiplexed as streams
+    over a few connections per host (at most
+    `Configuration.connection_pool_maxsize`), instead of taking a connection
+    each. Servers not offering HTTP/2 are spoken to over HTTP/1.1.
+    """
+
+    def __init__(self, configuration) -> None:
+        client_args = _client_args(configuration)
+        if isinstance(configuration.retries, int) and "proxy" not in client_args:
+            # httpx only retries failed connection attempts
+            client_args["transport"] = httpx.HTTPTransport(
+                http2=True,
+                verify=client_args["verify"],
+                limits=client_args["limits"],
+                retries=configuration.retries,
+            )
+        self.pool_manager = httpx.Client(**client_args)
+        self.server_hostname = configuration.tls_server_name
+        self.json_codec = configuration.json_codec
+
+    def close(self) -> None:
+        """Closes the client and its connections."""
+        self.pool_manager.close()
+
+    def classify_error(self, error):
+        """Classifies a transport error for the retry policy.
+
+        :param error: exception raised by `request`.
+        :return: "connect" when the request was never sent, "transient" for
+                 other failures worth retrying, None otherwise.
+        """
+        return _classify_error(error)
+
+    def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        args = _request_args(
+            self.json_codec, method, url, headers, body, post_params, _request_timeout,
+            self.server_hostname,
+        )
+        try:
+            r = self.pool_manager.send(self.pool_manager.build_request(**args), stream=True)
+        except httpx.ConnectError as e:
+            ssl_error = _ssl_error(e)
+            if ssl_error is None:
+                raise
+            msg = "\n".join([type(ssl_error).__name__, str(ssl_error)])
+            raise ApiException(status=0, reason=msg)
+
+        response = RESTResponse(_HttpxResponse(r))
+        response.request_bytes = _request_bytes(args)
+        return response
+
+
+class AsyncHTTP2RESTClientObject:
+    """Non-blocking counterpart of `HTTP2RESTClientObject`, used by the AsyncApiClient.
+
+    All the requests of an event loop are multiplexed as streams over a few
+    connections per host (at most `Configuration.connection_pool_maxsize`).
+    """
+
+    def __init__(self, configuration) -> None:
+        self.client_args = _client_args(configuration)
+        self.server_hostname = configuration.tls_server_name
+        self.json_codec = configuration.json_codec
+        self.pool_manager: Optional[httpx.AsyncClient] = None
+
+    def _get_pool_manager(self) -> httpx.AsyncClient:
+        if self.pool_manager is None or self.pool_manager.is_closed:
+            self.pool_manager = httpx.AsyncClient(**self.client_args)
+        return self.pool_manager
+
+    async def close(self):
+        """Closes the underlying client and all of its connections."""
+        if self.pool_manager is not None and not self.pool_manager.is_closed:
+            await self.pool_manager.aclose()
+        self.pool_manager = None
+
+    def classify_error(self, error):
+        """Classifies a transport error for the retry policy.
+
+        :param error: exception raised by `request`.
+        :return: "connect" when the request was never sent, "transient" for
+                 other failures worth retrying, None otherwise.
+        """
+        return _classify_error(error)
+
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        # the AsyncApiClient already depends on aiohttp, which async_rest needs
+        from appifyhub import async_rest
+
+        args = _request_args(
+            self.json_codec, method, url, headers, body, post_params, _request_timeout,
+            self.server_hostname,
+        )
+        pool_manager = self._get_pool_manager()
+        try:
+            r = await pool_manager.send(pool_manager.build_request(**args), stream=True)
+        except httpx.ConnectError as e:
+            ssl_error = _ssl_error(e)
+            if ssl_error is None:
+                raise
+            msg = "\n".join([type(ssl_error).__name__, str(ssl_error)])
+            raise ApiException(status=0, reason=msg)
+
+        response = async_rest.AsyncRESTResponse(_AsyncHttpxResponse(r))
+        response.request_bytes = _request_bytes(args)
+        return response
@@ -2,7 +2,7 @@
 
 # flake8: noqa
 """
-    Appify Hub's Consumer API
+    Consumer API · Appify Hub
 
     The full specification of the service's API used by the end-users.
 
@@ -14,28 +14,75 @@
 """  # noqa: E501
 
 
-# import models into model package
-from appifyhub.models.authority import Authority
-from appifyhub.models.heartbeat_response import HeartbeatResponse
-from appifyhub.models.message_send_request import MessageSendRequest
-from appifyhub.models.organization_dto import OrganizationDto
-from appifyhub.models.organization_updater_dto import OrganizationUpdaterDto
-from appifyhub.models.organization_updater_settable import OrganizationUpdaterSettable
-from appifyhub.models.push_device_request import PushDeviceRequest
-from appifyhub.models.push_device_response import PushDeviceResponse
-from appifyhub.models.push_device_type import PushDeviceType
-from appifyhub.models.push_devices_response import PushDevicesResponse
-from appifyhub.models.settable_request import SettableRequest
-from appifyhub.models.signup_code_response import SignupCodeResponse
-from appifyhub.models.signup_codes_response import SignupCodesResponse
-from appifyhub.models.simple_response import SimpleResponse
-from appifyhub.models.token_details_response import TokenDetailsResponse
-from appifyhub.models.token_response import TokenResponse
-from appifyhub.models.user_contact_type import UserContactType
-from appifyhub.models.user_credentials_request import UserCredentialsRequest
-from appifyhub.models.user_response import UserResponse
-from appifyhub.models.user_signup_request import UserSignupRequest
-from appifyhub.models.user_type import UserType
-from appifyhub.models.user_update_authority_request import UserUpdateAuthorityRequest
-from appifyhub.models.user_update_data_request import UserUpdateDataRequest
-from appifyhub.models.user_update_signature_request import UserUpdateSignatureRequest
+import importlib
+from typing import TYPE_CHECKING
+
+# public names, resolved on first attribute access (see `__getattr__`)
+_LAZY_IMPORTS = {
+    'Authority': 'appifyhub.models.authority',
+    'HeartbeatResponse': 'appifyhub.models.heartbeat_response',
+    'MessageSendRequest': 'appifyhub.models.message_send_request',
+    'OrganizationDto': 'appifyhub.models.organization_dto',
+    'OrganizationUpdaterDto': 'appifyhub.models.organization_updater_dto',
+    'OrganizationUpdaterSettable': 'appifyhub.models.organization_updater_settable',
+    'PushDeviceRequest': 'appifyhub.models.push_device_request',
+    'PushDeviceResponse': 'appifyhub.models.push_device_response',
+    'PushDeviceType': 'appifyhub.models.push_device_type',
+    'PushDevicesResponse': 'appifyhub.models.push_devices_response',
+    'SettableRequest': 'appifyhub.models.settable_request',
+    'SignupCodeResponse': 'appifyhub.models.signup_code_response',
+    'SignupCodesResponse': 'appifyhub.models.signup_codes_response',
+    'SimpleResponse': 'appifyhub.models.simple_response',
+    'TokenDetailsResponse': 'appifyhub.models.token_details_response',
+    'TokenResponse': 'appifyhub.models.token_response',
+    'UserContactType': 'appifyhub.models.user_contact_type',
+    'UserCredentialsRequest': 'appifyhub.models.user_credentials_request',
+    'UserResponse': 'appifyhub.models.user_response',
+    'UserSignupRequest': 'appifyhub.models.user_signup_request',
+    'UserType': 'appifyhub.models.user_type',
+    'UserUpdateAuthorityRequest': 'appifyhub.models.user_update_authority_request',
+    'UserUpdateDataRequest': 'appifyhub.models.user_update_data_request',
+    'UserUpdateSignatureRequest': 'appifyhub.models.user_update_signature_request',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+if TYPE_CHECKING:
+    from appifyhub.models.authority import Authority
+    from appifyhub.models.heartbeat_response import HeartbeatResponse
+    from appifyhub.models.message_send_request import MessageSendRequest
+    from appifyhub.models.organization_dto import OrganizationDto
+    from appifyhub.models.organization_updater_dto import OrganizationUpdaterDto
+    from appifyhub.models.organization_updater_settable import OrganizationUpdaterSettable
+    from appifyhub.models.push_device_request import PushDeviceRequest
+    from appifyhub.models.push_device_response import PushDeviceResponse
+    from appifyhub.models.push_device_type import PushDeviceType
+    from appifyhub.models.push_devices_response import PushDevicesResponse
+    from appifyhub.models.settable_request import SettableRequest
+    from appifyhub.models.signup_code_response import SignupCodeResponse
+    from appifyhub.models.signup_codes_response import SignupCodesResponse
+    from appifyhub.models.simple_response import SimpleResponse
+    from appifyhub.models.token_details_response import TokenDetailsResponse
+    from appifyhub.models.token_response import TokenResponse
+    from appifyhub.models.user_contact_type import UserContactType
+    from appifyhub.models.user_credentials_request import UserCredentialsRequest
+    from appifyhub.models.user_response import UserResponse
+    from appifyhub.models.user_signup_request import UserSignupRequest
+    from appifyhub.models.user_type import UserType
+    from appifyhub.models.user_update_authority_request import UserUpdateAuthorityRequest
+    from appifyhub.models.user_update_data_request import UserUpdateDataRequest
+    from appifyhub.models.user_update_signature_request import UserUpdateSignatureRequest
@@ -0,0 +1,35 @@
+from typing import Dict, Optional, Tuple
+
+# (HTTP method, resource path) of every API operation, mapped to the operation name
+OPERATIONS: Dict[Tuple[str, str], str] = {
+    ("GET", "/heartbeat"): "heartbeat",
+    ("GET", "/v1/projects/{projectId}/search"): "search_users",
+    ("POST", "/v1/projects/{projectId}/signup"): "add_user",
+    ("POST", "/v1/projects/{projectId}/users/{universalId}/message"): "send_message",
+    ("DELETE", "/v1/universal/auth"): "unauthenticate",
+    ("GET", "/v1/universal/auth"): "get_current_token",
+    ("POST", "/v1/universal/auth"): "authenticate",
+    ("PUT", "/v1/universal/auth"): "refresh",
+    ("DELETE", "/v1/universal/auth/tokens"): "unauthenticate_tokens",
+    ("GET", "/v1/universal/auth/tokens"): "get_all_tokens",
+    ("DELETE", "/v1/universal/users/{universalId}"): "delete_user",
+    ("GET", "/v1/universal/users/{universalId}"): "get_user",
+    ("PUT", "/v1/universal/users/{universalId}/authority"): "update_authority",
+    ("PUT", "/v1/universal/users/{universalId}/data"): "update_data",
+    ("DELETE", "/v1/universal/users/{universalId}/push-devices"):
+        "remove_all_push_devices_for_user",
+    ("GET", "/v1/universal/users/{universalId}/push-devices"): "fetch_all_push_devices_for_user",
+    ("POST", "/v1/universal/users/{universalId}/push-devices"): "add_push_device",
+    ("DELETE", "/v1/universal/users/{universalId}/push-devices/{deviceId}"): "remove_push_device",
+    ("GET", "/v1/universal/users/{universalId}/push-devices/{deviceId}"): "fetch_push_device",
+    ("PUT", "/v1/universal/users/{universalId}/signature"): "update_signature",
+    ("PUT", "/v1/universal/users/{universalId}/signature/reset"): "reset_signature",
+    ("GET", "/v1/universal/users/{universalId}/signup-codes"): "fetch_all_signup_codes_for_user",
+    ("POST", "/v1/universal/users/{universalId}/signup-codes"): "create_signup_code",
+    ("PUT", "/v1/universal/users/{universalId}/verify/{verificationToken}"): "verify_token",
+}
+
+
+def operation_name(method: str, resource_path: str) -> Optional[str]:
+    """Returns the name of the operation serving the method and resource path template."""
+    return OPERATIONS.get((method, resource_path))
@@ -0,0 +1,306 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.bulk import error_retry_delay
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL,
+    universal_id TEXT NOT NULL,
+    message TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (dead, next_attempt_at);
+"""
+
+_COLUMNS = 'id, project_id, universal_id, message, attempts, last_error, created_at'
+_MESSAGE_FIELDS = {field.alias or name for name, field in MessageSendRequest.model_fields.items()}
+
+
+class OutboxEntry:
+    """A message stored in the outbox."""
+
+    def __init__(self, id: int, project_id: int, universal_id: str, message: str,
+                 attempts: int, last_error: Optional[str], created_at: float) -> None:
+        self.id = id
+        self.project_id = project_id
+        self.universal_id = universal_id
+        self.message: Optional[MessageSendRequest] = None
+        """The message to send, or None if the stored one can't be read"""
+        self.read_error: Optional[str] = None
+        """Why the stored message can't be read, if it can't"""
+        try:
+            self.message = _read_message(message)
+        except ValueError as e:
+            self.read_error = 'Unreadable message: %s' % _describe(e)
+        self.attempts = attempts
+        """Number of sends tried so far"""
+        self.last_error = last_error
+        """Description of the last failed send, if any"""
+        self.created_at = created_at
+
+    def __repr__(self) -> str:
+        return 'OutboxEntry(id=%d, universal_id=%r, attempts=%d)' % (
+            self.id, self.universal_id, self.attempts,
+        )
+
+
+class Outbox:
+    """Durable queue of `MessagingApi.send_message` calls, sent by a background worker.
+
+    `send_message` only appends the message to a local SQLite database and
+    returns, so callers do not wait for the service. Once `start`ed, a
+    worker thread sends the stored messages in batches of `batch_size`,
+    `concurrency` at a time, and deletes each one when the service
+    accepts it. Messages survive restarts of the process.
+
+    Sends are not idempotent, so only those the service did not act on
+    are scheduled again after the policy's delay: connection failures and
+    429 and 503 responses by default. Messages that still fail after the
+    policy's `max_attempts`, or fail with another error (e.g. a 404 for an
+    unknown user, or a 502 or read timeout after which the message may
+    have gone out), become dead letters, as do stored messages that can't
+    be read back. They stay in the database for `dead_letters` and
+    `retry_dead_letters`.
+
+    :param api_client: ApiClient the messages are sent with.
+    :param path: path of the SQLite database, created if missing.
+    :param batch_size: messages taken from the database at a time.
+    :param concurrency: sends in flight at most.
+    :param poll_interval: seconds the worker sleeps at most when idle.
+    :param retry_policy: RetryPolicy scheduling failed sends. By default 8
+                         attempts per message, backing off up to 5 minutes,
+                         on connection failures and 429 and 503 responses.
+    :param on_dead_letter: called with each message becoming a dead letter.
+    :param clock: wall clock time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        path: str = 'appifyhub-outbox.sqlite3',
+        batch_size: int = 50,
+        concurrency: int = 8,
+        poll_interval: float = 1.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        on_dead_letter: Optional[Callable[[OutboxEntry], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.api_client = api_client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                max_attempts=8,
+                backoff_base=1.0,
+                backoff_max=300.0,
+                retry_statuses=(429, 503),
+                max_retry_after=3600.0,
+                rejected_statuses=(429, 503),
+                budget=None,
+            )
+        self.retry_policy = retry_policy
+        self.on_dead_letter = on_dead_letter
+        self.clock = clock
+        self._messaging_api = MessagingApi(api_client)
+        self._pool = ThreadPoolExecutor(concurrency, thread_name_prefix='appifyhub-outbox')
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        # WAL keeps committed messages across process crashes without an fsync per message
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # one batch at a time, so that no message is taken by two batches
+        self._batch_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def send_message(
+        self, project_id: int, universal_id: str, message_send_request: MessageSendRequest,
+    ) -> int:
+        """Stores a message to send, returning its ID in the outbox."""
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT INTO outbox'
+                ' (project_id, universal_id, message, next_attempt_at, created_at)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (project_id, universal_id, message_send_request.to_json(), 0, self.clock()),
+            )
+        self._wake.set()
+        assert cursor.lastrowid is not None, "Message not stored"
+        return cursor.lastrowid
+
+    def pending(self) -> int:
+        """Returns the number of messages waiting to be sent."""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM outbox WHERE dead = 0').fetchone()[0]
+
+    def dead_letters(self, limit: int = 100) -> List[OutboxEntry]:
+        """Returns the oldest messages that could not be sent."""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT %s FROM outbox WHERE dead = 1 ORDER BY id LIMIT ?' % _COLUMNS, (limit,),
+            ).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def retry_dead_letters(self, ids: Optional[Iterable[int]] = None) -> int:
+        """Queues dead letters (all by default) to be sent again, returning how many were."""
+        with self._lock:
+            if ids is None:
+                cursor = self._db.execute(
+                    'UPDATE outbox SET dead = 0, attempts = 0, next_attempt_at = 0 WHERE dead = 1',
+                )
+            else:
+                cursor = self._db.executemany(
+                    'UPDATE outbox SET dead = 0, attempts = 0, next_attempt_at = 0'
+                    ' WHERE dead = 1 AND id = ?',
+                    [(id,) for id in ids],
+                )
+        self._wake.set()
+        return cursor.rowcount
+
+    def process_batch(self) -> int:
+        """Sends one batch of due messages, returning how many were tried."""
+        with self._batch_lock:
+            return self._process_batch()
+
+    def _process_batch(self) -> int:
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT %s FROM outbox'
+                ' WHERE dead = 0 AND next_attempt_at <= ? ORDER BY id LIMIT ?' % _COLUMNS,
+                (self.clock(), self.batch_size),
+            ).fetchall()
+        entries = [OutboxEntry(*row) for row in rows]
+        outcomes = list(self._pool.map(self._send, entries))
+
+        sent = [(entry.id,) for entry, outcome in zip(entries, outcomes) if outcome is None]
+        failed = [outcome for outcome in outcomes if outcome is not None]
+        with self._lock:
+            self._db.execute('BEGIN')
+            try:
+                self._db.executemany('DELETE FROM outbox WHERE id = ?', sent)
+                self._db.executemany(
+                    'UPDATE outbox'
+                    ' SET attempts = attempts + 1, next_attempt_at = ?, dead = ?, last_error = ?'
+                    ' WHERE id = ?',
+                    failed,
+                )
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+        if self.on_dead_letter is not None:
+            for entry, outcome in zip(entries, outcomes):
+                if outcome is not None and outcome[1]:
+                    entry.attempts += 1
+                    entry.last_error = outcome[2]
+                    self.on_dead_letter(entry)
+        return len(entries)
+
+    def flush(self) -> None:
+        """Sends messages until none is due, e.g. before shutting down."""
+        while self.process_batch():
+            pass
+
+    def start(self) -> 'Outbox':
+        """Starts sending the stored messages in a background thread."""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name='appifyhub-outbox-worker', daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread after its current batch. Unsent messages stay stored."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping = True
+            self._wake.set()
+            thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Stops the worker and closes the database."""
+        self.stop()
+        self._pool.shutdown()
+        self._db.close()
+
+    def __enter__(self) -> 'Outbox':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _send(self, entry: OutboxEntry):
+        """Sends a message, returning None or the update to store for a failed send."""
+        if entry.message is None:
+            # a corrupt row; sending it again would fail the same way
+            return (0, 1, entry.read_error, entry.id)
+        try:
+            self._messaging_api.send_message(entry.project_id, entry.universal_id, entry.message)
+            return None
+        except Exception as e:
+            delay = error_retry_delay(
+                self.retry_policy, self.api_client, entry.attempts + 1, 'POST', 'send_message', {},
+                e,
+            )
+            error = _describe(e)
+            if delay is None:
+                return (0, 1, error, entry.id)
+            return (self.clock() + delay, 0, error, entry.id)
+
+    def _next_attempt_in(self) -> float:
+        with self._lock:
+            next_attempt_at = self._db.execute(
+                'SELECT MIN(next_attempt_at) FROM outbox WHERE dead = 0',
+            ).fetchone()[0]
+        if next_attempt_at is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(0.0, next_attempt_at - self.clock()))
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.clear()
+            try:
+                if self.process_batch():
+                    continue
+                delay = self._next_attempt_in()
+            except Exception:
+                logger.exception('Sending the outbox messages failed')
+                delay = self.poll_interval
+            self._wake.wait(delay)
+
+
+def _read_message(message: str) -> Optional[MessageSendRequest]:
+    """Reads back a stored message, refusing the fields `from_dict` would drop."""
+    stored = json.loads(message)
+    if not isinstance(stored, dict):
+        raise ValueError('Not a stored message: %r' % message)
+    unknown = sorted(set(stored) - _MESSAGE_FIELDS)
+    if unknown:
+        raise ValueError('Unknown fields: %s' % ', '.join(unknown))
+    return MessageSendRequest.from_dict(stored)
+
+
+def _describe(error: Exception) -> str:
+    return '%s: %s' % (type(error).__name__, ' '.join(str(error).strip().split('\n')[:2]))
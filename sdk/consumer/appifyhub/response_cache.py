@@ -0,0 +1,316 @@
+import abc
+import collections
+import hashlib
+import itertools
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from urllib3._collections import HTTPHeaderDict
+
+from appifyhub import compression
+
+# seconds responses of the read-heavy operations stay fresh, unless configured otherwise
+DEFAULT_TTLS = {
+    'get_user': 30.0,
+    'get_project': 60.0,
+    'fetch_template_by_id': 300.0,
+    'search_templates': 60.0,
+    'get_defined_variables': 3600.0,
+}
+
+# cached operation -> operations changing its data
+INVALIDATED_BY = {
+    'get_user': (
+        'update_data', 'update_authority', 'update_signature', 'reset_signature',
+        'verify_token', 'delete_user', 'force_verify_user',
+    ),
+    'search_users': (
+        'add_user', 'update_data', 'update_authority',
+        'verify_token', 'delete_user', 'force_verify_user',
+    ),
+    'get_current_token': ('refresh', 'unauthenticate', 'unauthenticate_tokens'),
+    'get_all_tokens': ('authenticate', 'refresh', 'unauthenticate', 'unauthenticate_tokens'),
+    'fetch_all_push_devices_for_user': (
+        'add_push_device', 'remove_push_device', 'remove_all_push_devices_for_user', 'delete_user',
+    ),
+    'fetch_push_device': (
+        'add_push_device', 'remove_push_device', 'remove_all_push_devices_for_user', 'delete_user',
+    ),
+    'fetch_all_signup_codes_for_user': ('create_signup_code', 'add_user', 'delete_user'),
+    'get_projects': (
+        'add_project', 'update_project', 'remove_project', 'remove_projects_by_creator',
+    ),
+    'get_project': ('update_project', 'remove_project', 'remove_projects_by_creator'),
+    'fetch_template_by_id': (
+        'update_template', 'delete_template_by_id', 'delete_templates',
+        'remove_project', 'remove_projects_by_creator',
+    ),
+    'search_templates': (
+        'add_template', 'update_template', 'delete_template_by_id', 'delete_templates',
+        'remove_project', 'remove_projects_by_creator',
+    ),
+}
+
+# mutating operation -> cached operations it makes stale
+_INVALIDATES = {
+    mutation: tuple(
+        cached for cached, mutations in INVALIDATED_BY.items() if mutation in mutations
+    )
+    for mutation in set(itertools.chain.from_iterable(INVALIDATED_BY.values()))
+}
+
+# cached operation -> path parameter its responses are scoped to
+_SCOPE_PARAMS = {
+    'get_user': 'universalId',
+    'search_users': 'projectId',
+    'fetch_all_push_devices_for_user': 'universalId',
+    'fetch_push_device': 'universalId',
+    'fetch_all_signup_codes_for_user': 'universalId',
+    'get_project': 'projectId',
+    'fetch_template_by_id': 'projectId',
+    'search_templates': 'projectId',
+}
+
+# headers describing a response body as sent, dropped from the cached responses decoded on arrival
+_DECODED_HEADERS = ('content-encoding', 'content-length')
+
+
+class CacheStore(abc.ABC):
+    """Storage of cached responses.
+
+    Implement it to share the cache between processes, e.g. on top of
+    Redis or memcached. Keys are strings, values are dicts of strings,
+    bytes and numbers that such implementations may pickle.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value stored under the key, or None."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Stores the value, dropping it after `ttl` seconds unless None."""
+
+
+class InMemoryStore(CacheStore):
+    """Thread-safe store evicting the least recently used values beyond `max_entries`.
+
+    :param max_entries: values kept at most.
+    :param clock: monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._values: 'collections.OrderedDict[str, Tuple[Any, Optional[float]]]' = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self.clock():
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._values[key] = (value, None if ttl is None else self.clock() + ttl)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class CachedHttpResponse:
+    """Stands in for the HTTP response a cache entry was made from."""
+
+    def __init__(self, entry: Dict[str, Any]) -> None:
+        self.status = entry['status']
+        self.reason = entry['reason']
+        self.headers = HTTPHeaderDict(entry['headers'])
+        self.data = entry['data']
+
+    def release(self) -> None:
+        pass
+
+
+class CacheLookup:
+    """Outcome of `ResponseCache.lookup` for a cacheable request."""
+
+    def __init__(
+        self, key: str, ttl: float, entry: Optional[Dict[str, Any]], fresh: bool, headers,
+    ) -> None:
+        self.key = key
+        self.ttl = ttl
+        self.entry = entry
+        """Cached response, if any"""
+        self.fresh = fresh
+        """Whether the cached response can be used without asking the server"""
+        self.headers = headers
+        """Headers to send, asking to revalidate the cached response if it has an ETag"""
+
+
+class ResponseCache:
+    """Caches responses of read operations until they expire or their data changes.
+
+    Successful GET responses of the operations with a TTL are served from
+    the store for `ttls[operation]` seconds. A stale response that came
+    with an `ETag` is kept `revalidate_for` seconds longer, and is then
+    revalidated with `If-None-Match`, so that unchanged data is not
+    downloaded again.
+
+    Mutating operations (see `INVALIDATED_BY`) drop the cached responses
+    of the operations reading their data. When the mutation targets a
+    resource the read is scoped to, e.g. `update_data` for the user read
+    by `get_user`, only the responses for that resource are dropped.
+    Responses are dropped by switching their scope to a new generation, so
+    any `CacheStore` can be shared by many clients.
+
+    :param store: CacheStore holding the responses, an `InMemoryStore` by default.
+    :param ttls: seconds the responses stay fresh, by operation name.
+                 Operations without a TTL are not cached. Defaults to
+                 `DEFAULT_TTLS`.
+    :param revalidate_for: seconds stale responses with an ETag are kept.
+    :param namespace: prefix of the store keys.
+    :param clock: wall clock time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        store: Optional[CacheStore] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        revalidate_for: float = 300.0,
+        namespace: str = 'appifyhub',
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = InMemoryStore() if store is None else store
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.revalidate_for = revalidate_for
+        self.namespace = namespace
+        self.clock = clock
+
+    def lookup(
+        self, method: str, url: str, headers: Optional[Dict[str, str]],
+    ) -> Optional[CacheLookup]:
+        """Finds the cached response for a request, or None if the request is not cacheable."""
+        operation = getattr(url, 'operation', None)
+        if method != 'GET' or operation is None:
+            return None
+        ttl = self.ttls.get(operation)
+        if not ttl:
+            return None
+
+        digest = hashlib.sha256(url.encode('utf-8'))
+        for name, value in sorted((headers or {}).items()):
+            digest.update(('\n%s: %s' % (name.lower(), value)).encode('utf-8'))
+        generation = self._generation(operation, _scope(url))
+        key = '%s:response:%s:%s:%s' % (self.namespace, operation, generation, digest.hexdigest())
+
+        entry = self.store.get(key)
+        fresh = entry is not None and entry['fresh_until'] > self.clock()
+        if entry is not None and not fresh and entry['etag']:
+            headers = dict(headers or {}, **{'If-None-Match': entry['etag']})
+        return CacheLookup(key, ttl, entry, fresh, headers)
+
+    def complete(self, lookup: CacheLookup, response) -> Optional[Dict[str, Any]]:
+        """Caches a read response, returning the cached entry to use in its place, if any.
+
+        :param lookup: the lookup made for the request.
+        :param response: the response, already read.
+        """
+        if response.status == 304 and lookup.entry is not None:
+            entry = dict(lookup.entry, fresh_until=self.clock() + lookup.ttl)
+        elif (response.status == 200
+              and 'no-store' not in (response.getheader('Cache-Control') or '')):
+            headers = dict(response.getheaders())
+            if compression.Decoder(response.getheader('Content-Encoding')).decodes:
+                # the body is cached decoded, so its coding and size headers no longer apply
+                headers = {
+                    name: value for name, value in headers.items()
+                    if name.lower() not in _DECODED_HEADERS
+                }
+            entry = {
+                'status': response.status,
+                'reason': response.reason,
+                'headers': headers,
+                'data': response.data,
+                'etag': response.getheader('ETag'),
+                'fresh_until': self.clock() + lookup.ttl,
+            }
+        else:
+            return None
+        keep_for = lookup.ttl + (self.revalidate_for if entry['etag'] else 0)
+        self.store.set(lookup.key, entry, keep_for)
+        return entry if response.status == 304 else None
+
+    def invalidate(self, method: str, url: str) -> None:
+        """Drops the cached responses made stale by a mutating request."""
+        operation = getattr(url, 'operation', None)
+        if method == 'GET' or operation is None or operation not in _INVALIDATES:
+            return
+        params = _path_params(url)
+        for cached_operation in _INVALIDATES[operation]:
+            # mutations not scoped like the read drop the responses of all scopes
+            param = _SCOPE_PARAMS.get(cached_operation)
+            self._bump(cached_operation, params.get(param) if param else None)
+
+    def _generation(self, operation: str, scope: Optional[str]) -> str:
+        # a read is keyed by the generation of its operation and of its scope,
+        # so bumping either makes its cached responses unreachable
+        generations = []
+        for key in self._generation_keys(operation, scope):
+            generation = self.store.get(key)
+            if generation is None:
+                generation = uuid.uuid4().hex
+                self.store.set(key, generation, self._generation_ttl())
+            generations.append(generation)
+        return '.'.join(generations)
+
+    def _generation_keys(self, operation: str, scope: Optional[str]) -> Iterable[str]:
+        yield '%s:generation:%s' % (self.namespace, operation)
+        if scope is not None:
+            yield '%s:generation:%s:%s' % (self.namespace, operation, scope)
+
+    def _bump(self, operation: str, scope: Optional[str]) -> None:
+        key = list(self._generation_keys(operation, scope))[-1]
+        self.store.set(key, uuid.uuid4().hex, self._generation_ttl())
+
+    def _generation_ttl(self) -> float:
+        # a generation only needs to outlive the responses stored under it;
+        # once it expires, the next read starts a new one
+        return max(self.ttls.values(), default=0) + self.revalidate_for
+
+
+def _path_params(url) -> Dict[str, str]:
+    """Extracts the (still quoted) path parameters of a request URL."""
+    template = getattr(url, 'resource_path', None)
+    if not template:
+        return {}
+    names = template.split('/')
+    values = urlsplit(url).path.split('/')[-len(names):]
+    return {
+        name[1:-1]: value
+        for name, value in zip(names, values)
+        if name.startswith('{') and name.endswith('}')
+    }
+
+
+def _scope(url) -> Optional[str]:
+    operation = getattr(url, 'operation', None)
+    param = _SCOPE_PARAMS.get(operation) if operation is not None else None
+    return _path_params(url).get(param) if param else None
+
@@ -0,0 +1,232 @@
+import asyncio
+import base64
+import binascii
+import calendar
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from appifyhub.models.token_details_response import TokenDetailsResponse
+from appifyhub.models.token_response import TokenResponse
+
+logger = logging.getLogger(__name__)
+
+# date-time formats of TokenDetailsResponse.expires_at, all in UTC
+_TIME_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%S')
+
+
+class TokenManager:
+    """Keeps an access token fresh by refreshing it before it expires.
+
+    The manager installs itself as `refresh_api_key_hook` of the client's
+    configuration. Every request then reads the manager's current token,
+    and so do copies of the configuration and the AsyncApiClients built
+    from it. A refreshed token therefore replaces the old one in a single
+    step for all requests that start afterwards.
+
+    Once `start`ed, a background thread calls `AuthApi.refresh`
+    `refresh_before` seconds before the token expires. Should the thread
+    fall behind, the first request within `min_validity` seconds of the
+    expiration refreshes the token itself. Concurrent requests wait for
+    that new token instead of sending one the service would reject.
+    Requests made on an event loop never refresh it themselves, as that
+    would block the loop; they wake the background thread instead.
+
+    :param api_client: ApiClient used for the refresh calls. Its
+                       configuration's `access_token` is the initial token.
+                       AsyncApiClients are not supported.
+    :param refresh_before: seconds before the expiration the token is refreshed.
+    :param min_validity: seconds of validity a token needs to be sent.
+    :param retry_interval: seconds between attempts after a failed refresh.
+    :param poll_interval: seconds the background thread sleeps at most
+                          between checks of the clock.
+    :param on_refresh: called with each new TokenResponse, e.g. to store it.
+    :param on_error: called with the exceptions of failed background
+                     refreshes, which are logged otherwise.
+    :param clock: wall clock time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        refresh_before: float = 300.0,
+        min_validity: float = 30.0,
+        retry_interval: float = 5.0,
+        poll_interval: float = 60.0,
+        on_refresh: Optional[Callable[[TokenResponse], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        from appifyhub.async_api_client import AsyncApiClient
+
+        if isinstance(api_client, AsyncApiClient):
+            raise TypeError(
+                'TokenManager refreshes tokens through a blocking ApiClient,'
+                ' not an AsyncApiClient',
+            )
+        self.api_client = api_client
+        self.refresh_before = refresh_before
+        self.min_validity = min_validity
+        self.retry_interval = retry_interval
+        self.poll_interval = poll_interval
+        self.on_refresh = on_refresh
+        self.on_error = on_error
+        self.clock = clock
+        self.refreshes = 0
+        """Number of tokens obtained by refreshing"""
+        self._state: Tuple[Optional[str], float] = (None, float('inf'))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        configuration = api_client.configuration
+        if configuration.access_token is not None:
+            self.track(configuration.access_token)
+        configuration.refresh_api_key_hook = self
+
+    @property
+    def token_value(self) -> Optional[str]:
+        """The current token."""
+        return self._state[0]
+
+    @property
+    def expires_at(self) -> float:
+        """When the current token expires, in seconds since the epoch."""
+        return self._state[1]
+
+    def track(self, token: Union[str, TokenResponse, TokenDetailsResponse]) -> None:
+        """Makes the token the current one, e.g. after authenticating again.
+
+        The expiration is read from the token itself. For tokens that do
+        not carry it, it is taken from `expires_at` of the
+        TokenDetailsResponse, fetching it if needed.
+        """
+        if isinstance(token, TokenDetailsResponse):
+            token_value, expires_at = token.token_value, _parse_time(token.expires_at)
+        else:
+            token_value = token if isinstance(token, str) else token.token_value
+            token_expiry = _token_expiry(token_value)
+            if token_expiry is None:
+                from appifyhub.api.auth_api import AuthApi
+
+                auth_api = AuthApi(self.api_client)
+                details = auth_api.get_current_token(_request_auth=_bearer(token_value))
+                expires_at = _parse_time(details.expires_at)
+            else:
+                expires_at = token_expiry
+        # a single assignment, so readers never see a token with another one's expiration
+        self._state = (token_value, expires_at)
+        self._wake.set()
+
+    def refresh(self) -> str:
+        """Exchanges the current token for a new one right away, returning the new one."""
+        return self._refresh(self._state[0])
+
+    def start(self) -> 'TokenManager':
+        """Starts refreshing the token in a background thread."""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name='appifyhub-token-manager', daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread, waiting for a running refresh to finish."""
+        thread = self._thread
+        if thread is not None:
+            self._stopping = True
+            self._wake.set()
+            thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'TokenManager':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def __call__(self, configuration) -> None:
+        """Sets the current token on a configuration about to authenticate a request."""
+        token_value, expires_at = self._state
+        if token_value is None:
+            return
+        if expires_at - self.clock() < self.min_validity:
+            if _in_event_loop():
+                # a refresh here would block the event loop
+                self._wake.set()
+            else:
+                token_value = self._refresh(token_value)
+        configuration.access_token = token_value
+
+    def _refresh(self, stale_token_value: Optional[str]) -> str:
+        with self._lock:
+            token_value = self._state[0]
+            if token_value is None:
+                raise ValueError('No access token to refresh')
+            # whoever waited for the lock while another thread refreshed uses the new token
+            if token_value == stale_token_value:
+                from appifyhub.api.auth_api import AuthApi
+
+                # explicit credentials keep the refresh call itself away from this hook
+                response = AuthApi(self.api_client).refresh(_request_auth=_bearer(token_value))
+                self.track(response)
+                self.refreshes += 1
+                if self.on_refresh is not None:
+                    self.on_refresh(response)
+                token_value = response.token_value
+            return token_value
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.clear()
+            token_value, expires_at = self._state
+            delay = expires_at - self.refresh_before - self.clock()
+            if token_value is not None and delay <= 0:
+                try:
+                    self._refresh(token_value)
+                    continue
+                except Exception as e:
+                    if self.on_error is not None:
+                        self.on_error(e)
+                    else:
+                        logger.warning('Refreshing the access token failed: %s', e)
+                    delay = self.retry_interval
+            self._wake.wait(min(delay, self.poll_interval))
+
+
+def _bearer(token_value: str) -> Dict[str, str]:
+    return {
+        'in': 'header', 'type': 'bearer', 'key': 'Authorization', 'value': 'Bearer ' + token_value,
+    }
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _token_expiry(token_value: str) -> Optional[float]:
+    """Reads the expiration claim of a JWT, without verifying it."""
+    try:
+        payload = token_value.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return None
+
+
+def _parse_time(value: str) -> float:
+    for time_format in _TIME_FORMATS:
+        try:
+            return float(calendar.timegm(time.strptime(value, time_format)))
+        except ValueError:
+            pass
+    raise ValueError('Unknown date-time format: %s' % value)
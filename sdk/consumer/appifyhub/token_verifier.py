@@ -0,0 +1,264 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+
+from appifyhub.exceptions import TokenVerificationError, UnauthorizedException
+from appifyhub.models.authority import Authority
+from appifyhub.models.token_details_response import TokenDetailsResponse
+from appifyhub.response_cache import InMemoryStore
+
+ALGORITHM = 'RS256'
+# Authority values from the least to the most privileged
+AUTHORITIES = ['DEFAULT', 'MODERATOR', 'ADMIN', 'OWNER']
+
+
+class SigningKeys:
+    """Public keys the service signs its tokens with, loaded once and cached.
+
+    :param keys: public keys, as PEM strings (`PUBLIC KEY` or `RSA PUBLIC KEY`
+                 blocks) or `cryptography` RSAPublicKey objects.
+    :param loader: returns the current public keys, e.g. by reading them from
+                   a file or a secret store. Called again after `ttl`
+                   seconds, and when a token's signature matches none of the
+                   cached keys (at most once per `min_refresh_interval`
+                   seconds), so that rotated keys are picked up.
+    :param ttl: seconds the loaded keys are used for.
+    :param min_refresh_interval: least seconds between two loads.
+    :param clock: monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[Union[str, RSAPublicKey]] = (),
+        loader: Optional[Callable[[], Iterable[Union[str, RSAPublicKey]]]] = None,
+        ttl: float = 3600.0,
+        min_refresh_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.loader = loader
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.clock = clock
+        self._keys = [_public_key(key) for key in keys]
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def keys(self) -> List[RSAPublicKey]:
+        """Returns the cached keys, loading them if they expired."""
+        if self.loader is not None:
+            with self._lock:
+                if self._loaded_at is None or self.clock() - self._loaded_at >= self.ttl:
+                    self._load(self.loader)
+        return self._keys
+
+    def refresh(self) -> bool:
+        """Loads the keys again unless they were just loaded, telling whether they were."""
+        if self.loader is None:
+            return False
+        with self._lock:
+            if (self._loaded_at is not None
+                    and self.clock() - self._loaded_at < self.min_refresh_interval):
+                return False
+            self._load(self.loader)
+            return True
+
+    def _load(self, loader: Callable[[], Iterable[Union[str, RSAPublicKey]]]) -> None:
+        self._keys = [_public_key(key) for key in loader()]
+        self._loaded_at = self.clock()
+
+
+class TokenVerifier:
+    """Verifies the service's access tokens locally instead of asking the service.
+
+    `decode` checks the token's RS256 signature against `signing_keys` and
+    its expiration, and returns the same `TokenDetailsResponse` that
+    `AuthApi.get_current_token` would, without a network round trip.
+
+    Signatures cannot tell whether a token was blocked (e.g. by logging out
+    or refreshing it), so `verify` also asks the service about tokens it has
+    not seen within the last `blocked_ttl` seconds, calling
+    `get_current_token` with the token through `api_client` and remembering
+    the outcome. Pass `check_blocked=False` to trust the signature alone.
+
+    :param signing_keys: SigningKeys, or an iterable of PEM public keys.
+    :param api_client: ApiClient (for `verify`) or AsyncApiClient (for
+                       `verify_async`) used for the blocked-token checks.
+    :param check_blocked: whether `verify` asks the service about blocked tokens.
+    :param blocked_ttl: seconds the service's answer about a token is remembered.
+    :param max_cached: tokens remembered at most.
+    :param leeway: seconds of clock difference tolerated for the token times.
+    :param clock: wall clock time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        signing_keys: Union[SigningKeys, Iterable[Union[str, RSAPublicKey]]],
+        api_client=None,
+        check_blocked: bool = True,
+        blocked_ttl: float = 30.0,
+        max_cached: int = 10000,
+        leeway: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if not isinstance(signing_keys, SigningKeys):
+            signing_keys = SigningKeys(signing_keys)
+        self.signing_keys = signing_keys
+        self.api_client = api_client
+        self.check_blocked = check_blocked
+        self.blocked_ttl = blocked_ttl
+        self.leeway = leeway
+        self.clock = clock
+        self._checked = InMemoryStore(max_entries=max_cached, clock=clock)
+
+    def decode(self, token_value: str) -> TokenDetailsResponse:
+        """Verifies the token's signature and expiration and returns its details.
+
+        :raises TokenVerificationError: when the token is invalid or expired.
+        """
+        claims = self._verified_claims(token_value)
+        now = self.clock()
+        try:
+            created_at, expires_at = int(claims['iat']), int(claims['exp'])
+            universal_id = str(claims['universal_id'])
+            user_id, project_id = universal_id.rsplit('$', 1)
+            authorities = str(claims.get('authorities', '')).split(',')
+            details = TokenDetailsResponse(
+                token_value=token_value,
+                user_id=user_id,
+                project_id=int(project_id),
+                universal_id=universal_id,
+                created_at=_format_time(created_at),
+                expires_at=_format_time(expires_at),
+                authority=Authority(AUTHORITIES[max(
+                    (AUTHORITIES.index(a) for a in authorities if a in AUTHORITIES),
+                    default=0,
+                )]),
+                is_blocked=False,
+                origin=_optional(claims.get('origin')),
+                ip_address=_optional(claims.get('ip_address')),
+                geo=_optional(claims.get('geo')),
+                is_static=str(claims.get('is_static')).lower() == 'true',
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise TokenVerificationError('Invalid token claims: %s' % e) from e
+        if expires_at <= now - self.leeway:
+            raise TokenVerificationError('Token expired')
+        if created_at > now + self.leeway:
+            raise TokenVerificationError('Token issued in the future')
+        return details
+
+    def verify(self, token_value: str) -> TokenDetailsResponse:
+        """Like `decode`, also rejecting tokens the service reports as blocked."""
+        details = self.decode(token_value)
+        if self.check_blocked and not self._check_cached(token_value):
+            from appifyhub.api.auth_api import AuthApi
+
+            try:
+                AuthApi(self.api_client).get_current_token(_request_auth=_bearer(token_value))
+            except UnauthorizedException as e:
+                self._reject(token_value, e)
+            self._accept(token_value)
+        return details
+
+    async def verify_async(self, token_value: str) -> TokenDetailsResponse:
+        """Asynchronous `verify`, for an AsyncApiClient."""
+        details = self.decode(token_value)
+        if self.check_blocked and not self._check_cached(token_value):
+            from appifyhub.api.async_auth_api import AsyncAuthApi
+
+            try:
+                auth_api = AsyncAuthApi(self.api_client)
+                await auth_api.get_current_token(_request_auth=_bearer(token_value))
+            except UnauthorizedException as e:
+                self._reject(token_value, e)
+            self._accept(token_value)
+        return details
+
+    def _verified_claims(self, token_value: str) -> Dict[str, Any]:
+        try:
+            header_segment, claims_segment, signature_segment = token_value.split('.')
+            header = json.loads(_b64decode(header_segment))
+            claims = json.loads(_b64decode(claims_segment))
+            signature = _b64decode(signature_segment)
+        except (AttributeError, ValueError, binascii.Error) as e:
+            raise TokenVerificationError('Malformed token') from e
+        if (not isinstance(header, dict) or header.get('alg') != ALGORITHM
+                or not isinstance(claims, dict)):
+            raise TokenVerificationError('Unsupported token algorithm')
+
+        message = ('%s.%s' % (header_segment, claims_segment)).encode('ascii')
+        def signed() -> bool:
+            return any(_signed_by(key, message, signature) for key in self.signing_keys.keys())
+
+        if not signed():
+            # the keys may have been rotated since they were loaded
+            if not (self.signing_keys.refresh() and signed()):
+                raise TokenVerificationError('Invalid token signature')
+        return claims
+
+    def _check_cached(self, token_value: str) -> bool:
+        """Returns True for tokens the service recently accepted, raises for rejected ones."""
+        reason = self._checked.get(token_value)
+        if reason is None:
+            return False
+        if reason is not True:
+            raise TokenVerificationError(reason)
+        return True
+
+    def _accept(self, token_value: str) -> None:
+        self._checked.set(token_value, True, self.blocked_ttl)
+
+    def _reject(self, token_value: str, error: UnauthorizedException) -> None:
+        reason = 'Token rejected by the service'
+        if error.body:
+            try:
+                reason += ': %s' % json.loads(error.body)['message']
+            except (TypeError, ValueError, KeyError):
+                pass
+        self._checked.set(token_value, reason, self.blocked_ttl)
+        raise TokenVerificationError(reason) from error
+
+
+def _public_key(key: Union[str, RSAPublicKey]) -> RSAPublicKey:
+    if isinstance(key, str):
+        loaded = serialization.load_pem_public_key(key.encode('ascii'))
+        if not isinstance(loaded, RSAPublicKey):
+            raise ValueError('Not an RSA public key')
+        return loaded
+    return key
+
+
+def _signed_by(key: RSAPublicKey, message: bytes, signature: bytes) -> bool:
+    """Tells whether the RS256 signature of the message was made with the key's private key."""
+    try:
+        key.verify(signature, message, padding.PKCS1v15(), hashes.SHA256())
+    except InvalidSignature:
+        return False
+    return True
+
+
+def _bearer(token_value: str) -> Dict[str, str]:
+    return {
+        'in': 'header', 'type': 'bearer', 'key': 'Authorization', 'value': 'Bearer ' + token_value,
+    }
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _format_time(timestamp: int) -> str:
+    # the service's date-time format (DateTimeMapper)
+    return time.strftime('%Y-%m-%d %H:%M', time.gmtime(timestamp))
+
+
+def _optional(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
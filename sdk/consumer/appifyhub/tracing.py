@@ -0,0 +1,236 @@
+import contextvars
+import logging
+import re
+import secrets
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = 'traceparent'
+TRACESTATE_HEADER = 'tracestate'
+
+_TRACEPARENT = re.compile(r'^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# the trace of the API call being made in the current thread or task
+_current: contextvars.ContextVar[Optional['Trace']] = contextvars.ContextVar(
+    'appifyhub_trace', default=None,
+)
+# the trace of the last call that returned a response in the current thread or task, until it is
+# deserialized; weak, as `*_without_preload_content` calls never deserialize theirs
+_pending: contextvars.ContextVar[
+    Optional['weakref.ReferenceType[Trace]']
+] = contextvars.ContextVar(
+    'appifyhub_pending_trace', default=None,
+)
+
+
+class Trace:
+    """One API call, from serializing its request to deserializing its response."""
+
+    def __init__(self, tracer: 'Tracer', method: str, url, serialize_seconds: float) -> None:
+        self.tracer = tracer
+        self.method = method
+        self.operation: Optional[str] = getattr(url, 'operation', None)
+        """Name of the API operation, e.g. `get_user`"""
+        self.url_template: Optional[str] = getattr(url, 'resource_path', None)
+        """Resource path template, e.g. `/v1/universal/users/{universalId}`"""
+        self.url = str(url)
+        self.status: Optional[int] = None
+        """HTTP status of the response, once received"""
+        self.attempts = 0
+        """Requests sent, including retries"""
+        self.request_bytes: Optional[int] = None
+        """Size of the request body as sent, when known"""
+        self.response_bytes: Optional[int] = None
+        """Size of the response body, once read and decompressed"""
+        self.response_wire_bytes: Optional[int] = None
+        """Size of the response body as received, once read, when known"""
+        self.timings: Dict[str, float] = {'serialize': serialize_seconds}
+        """Seconds spent per phase: `serialize`, `call`, `read` and `deserialize`"""
+        self.error: Optional[BaseException] = None
+        self.attributes: Dict[str, Any] = {}
+        """Free space for the hooks, e.g. for the spans they started"""
+        self.response = None
+        self.started = time.perf_counter() - serialize_seconds
+        self._call_ended: Optional[float] = None
+        self._token: Optional['contextvars.Token[Optional[Trace]]'] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds since the request started being serialized."""
+        return time.perf_counter() - self.started
+
+
+class TraceHook:
+    """Callbacks around each API call. Override the ones you need.
+
+    Hooks run in the order they were added to the Tracer for `before` and
+    `inject`, and in reverse order for `after` and `error`, so that each
+    hook wraps the ones added after it. Errors raised by hooks are logged
+    and do not affect the call.
+    """
+
+    def before(self, trace: Trace) -> None:
+        """Called when the request is serialized, before anything is sent."""
+
+    def inject(self, trace: Trace, headers: Dict[str, str]) -> None:
+        """Called with the headers of each request sent, to add propagation headers."""
+
+    def after(self, trace: Trace) -> None:
+        """Called when the response was deserialized successfully."""
+
+    def error(self, trace: Trace, error: BaseException) -> None:
+        """Called when the call failed, e.g. on a transport error or an error status."""
+
+
+class TraceContextHook(TraceHook):
+    """Propagates W3C Trace Context (`traceparent`) headers.
+
+    Each call gets a new span ID, in the trace of the span returned by
+    `current` or in a new trace when there is none. The IDs are stored in
+    the trace's attributes as `trace_id`, `span_id` and `parent_span_id`.
+
+    :param current: returns the `traceparent` of the caller's active span,
+                    e.g. from the tracer of your application, or None.
+    :param tracestate: returns the `tracestate` to propagate, or None.
+    """
+
+    def __init__(
+        self,
+        current: Optional[Callable[[], Optional[str]]] = None,
+        tracestate: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        self.current = current
+        self.tracestate = tracestate
+
+    def before(self, trace: Trace) -> None:
+        parent = self.current() if self.current is not None else None
+        match = _TRACEPARENT.match(parent.strip().lower()) if parent else None
+        if match is not None and match.group(1) != 'ff':
+            trace_id, parent_span_id, flags = match.group(2), match.group(3), match.group(4)
+        else:
+            trace_id, parent_span_id, flags = secrets.token_hex(16), None, '01'
+        trace.attributes['trace_id'] = trace_id
+        trace.attributes['span_id'] = secrets.token_hex(8)
+        trace.attributes['parent_span_id'] = parent_span_id
+        trace.attributes['trace_flags'] = flags
+        if self.tracestate is not None:
+            trace.attributes['tracestate'] = self.tracestate()
+
+    def inject(self, trace: Trace, headers: Dict[str, str]) -> None:
+        attributes = trace.attributes
+        headers[TRACEPARENT_HEADER] = '00-%s-%s-%s' % (
+            attributes['trace_id'], attributes['span_id'], attributes['trace_flags'],
+        )
+        if attributes.get('tracestate'):
+            headers[TRACESTATE_HEADER] = attributes['tracestate']
+
+
+class Tracer:
+    """Runs the tracing hooks around the API calls of the clients it is configured for.
+
+    Set it as `Configuration.tracer`. Each call made through the generated
+    API methods gets a `Trace`, passed to the hooks' `before` when its
+    request is serialized, to `inject` for every attempt sent (after the
+    response cache and request coalescing are consulted, so propagation
+    headers never split their keys), and to `after` or `error` once its
+    response was deserialized or the call failed. Calls made with the
+    `*_without_preload_content` methods end without `after`.
+
+    :param hooks: TraceHooks, in the order they run.
+    """
+
+    def __init__(self, hooks: Iterable[TraceHook] = ()) -> None:
+        self.hooks: List[TraceHook] = list(hooks)
+
+    def add_hook(self, hook: TraceHook) -> None:
+        self.hooks.append(hook)
+
+    def start(self, method: str, url, serialize_seconds: float) -> Trace:
+        """Starts the trace of a call whose request was just serialized."""
+        trace = Trace(self, method, url, serialize_seconds)
+        trace._token = _current.set(trace)
+        for hook in self.hooks:
+            self._run(hook.before, trace)
+        return trace
+
+    def inject(self, trace: Trace, headers: Dict[str, str]) -> None:
+        """Lets the hooks add their headers to a request about to be sent."""
+        trace.attempts += 1
+        for hook in self.hooks:
+            self._run(hook.inject, trace, headers)
+
+    def call_ended(self, trace: Trace, started: float, response) -> None:
+        """Records the response of a call, or None if it failed."""
+        trace._call_ended = time.perf_counter()
+        trace.timings['call'] = trace._call_ended - started
+        self._release(trace)
+        if response is not None:
+            trace.status = response.status
+            trace.request_bytes = getattr(response, 'request_bytes', None)
+            trace.response = response
+            _pending.set(weakref.ref(trace))
+
+    def finish(
+        self, trace: Trace, started: Optional[float] = None, error: Optional[BaseException] = None,
+    ) -> None:
+        """Ends a trace, successfully or with an error.
+
+        :param started: `time.perf_counter()` when deserialization started,
+                        if it did.
+        """
+        if started is not None:
+            ended = time.perf_counter()
+            trace.timings['deserialize'] = ended - started
+            if trace._call_ended is not None:
+                trace.timings['read'] = started - trace._call_ended
+        response = trace.response
+        if response is not None and getattr(response, 'data', None) is not None:
+            trace.response_bytes = len(response.data)
+            trace.response_wire_bytes = getattr(response, 'wire_bytes', None)
+        trace.error = error
+        trace.response = None
+        self._release(trace)
+        pending = _pending.get()
+        if pending is not None and pending() is trace:
+            _pending.set(None)
+        for hook in reversed(self.hooks):
+            if error is None:
+                self._run(hook.after, trace)
+            else:
+                self._run(hook.error, trace, error)
+
+    def _release(self, trace: Trace) -> None:
+        """Stops the trace being the current one, restoring the one before it."""
+        token, trace._token = trace._token, None
+        if token is None:
+            return
+        try:
+            _current.reset(token)
+        except ValueError:
+            # started in another context, which keeps its own value
+            pass
+
+    def _run(self, callback: Callable[..., None], *args: Any) -> None:
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception('Tracing hook %r failed', callback)
+
+
+def current_trace(response=None) -> Optional[Trace]:
+    """Returns the trace of the API call being made in this thread or task.
+
+    :param response: when given, returns the trace of the call made in this
+                     thread or task that returned this response instead,
+                     until the response is deserialized.
+    """
+    if response is None:
+        return _current.get()
+    pending = _pending.get()
+    trace = pending() if pending is not None else None
+    if trace is None or trace.response is not response:
+        return None
+    return trace
@@ -0,0 +1,75 @@
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+
+from appifyhub import bulk
+from appifyhub.api.user_api import UserApi
+from appifyhub.bulk import BulkProgress, BulkResult, BulkRunner
+from appifyhub.models.user_signup_request import UserSignupRequest
+from appifyhub.retry import RetryPolicy
+
+Record = Union[UserSignupRequest, Dict[str, Any], str]
+
+
+def import_users(
+    api_client,
+    project_id: int,
+    records: Iterable[Record],
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    max_pending: Optional[int] = None,
+    on_progress: Optional[Callable[[BulkProgress], None]] = None,
+) -> Iterator[BulkResult]:
+    """Signs up a stream of users with `UserApi.add_user`, many at a time.
+
+    Records are read lazily and signed up by a `bulk.BulkRunner`, so
+    results must be consumed for the import to progress:
+
+        for result in import_users(api_client, project_id, users_from_csv("users.csv"), rate=50):
+            if not result.ok:
+                print(result.index, result.error)
+
+    :param api_client: ApiClient the users are signed up with.
+    :param project_id: the project the users join.
+    :param records: UserSignupRequests, or dicts / JSON strings of their fields.
+                    Records that are not valid requests fail on their own.
+    :param concurrency: see `bulk.BulkRunner`.
+    :param rate: see `bulk.BulkRunner`.
+    :param retry_policy: see `bulk.BulkRunner`.
+    :param max_pending: see `bulk.BulkRunner`.
+    :param on_progress: see `bulk.BulkRunner`.
+    :return: a `BulkResult` per record, holding the `UserResponse` or the error.
+    """
+    user_api = UserApi(api_client)
+
+    def add_user(record: Record):
+        return user_api.add_user(project_id, _signup_request(record))
+
+    runner = BulkRunner(api_client, concurrency, rate, retry_policy, max_pending, on_progress)
+    return runner.run(add_user, records)
+
+
+def users_from_csv(source: bulk.Source) -> Iterator[Dict[str, Any]]:
+    """Streams signup records from a CSV file whose header names `UserSignupRequest` fields.
+
+    Organization fields go in columns like `company.name`.
+    """
+    return bulk.read_csv(source, converters={'allows_spam': bulk.parse_bool})
+
+
+def users_from_jsonl(source: bulk.Source) -> Iterator[Union[Dict[str, Any], str]]:
+    """Streams signup records from a JSON Lines file of `UserSignupRequest` objects."""
+    return bulk.read_jsonl(source)
+
+
+def _signup_request(record: Record) -> UserSignupRequest:
+    if isinstance(record, UserSignupRequest):
+        return record
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError('Not a signup record: %r' % (record,))
+    request = UserSignupRequest.from_dict(record)
+    if request is None:
+        raise ValueError('Not a signup record: %r' % (record,))
+    return request
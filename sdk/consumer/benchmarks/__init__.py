@@ -0,0 +1 @@
+# Latency benchmarks for the appifyhub package, run with `python -m benchmarks`.
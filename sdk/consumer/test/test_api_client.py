@@ -0,0 +1,220 @@
+import datetime
+import json
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+import urllib3
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+from appifyhub import rest
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.models.authority import Authority
+from appifyhub.models.heartbeat_response import HeartbeatResponse
+from appifyhub.models.organization_dto import OrganizationDto
+from appifyhub.models.user_response import UserResponse
+from appifyhub.models.user_type import UserType
+
+USER = {
+    "user_id": "user",
+    "project_id": 1,
+    "universal_id": "user$1",
+    "type": "PERSONAL",
+    "authority": "ADMIN",
+    "allows_spam": False,
+    "birthday": "1990-05-17",
+    "company": {"name": "Appify Hub"},
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+
+class Page(BaseModel):
+    """A model with non-None defaults, which the generated models lack"""
+
+    number: StrictInt = 1
+    title: Optional[StrictStr] = "Untitled"
+    tags: List[StrictStr] = Field(default_factory=list)
+    since: Optional[datetime.date] = None
+
+    @classmethod
+    def from_dict(cls, obj):
+        return cls.model_validate(obj)
+
+
+class TestApiClient(unittest.TestCase):
+    """ApiClient unit tests"""
+
+    def setUp(self) -> None:
+        self.api_client = ApiClient()
+
+    def test_deserialize_model_list(self) -> None:
+        users = self.api_client.deserialize(json.dumps([USER, None, USER]), "List[UserResponse]")
+
+        self.assertEqual(len(users), 3)
+        self.assertIsInstance(users[0], UserResponse)
+        self.assertIsNone(users[1])
+        self.assertEqual(users[2].authority, Authority.ADMIN)
+        self.assertEqual(users[2].birthday, datetime.date(1990, 5, 17))
+        self.assertEqual(users[2].company.name, "Appify Hub")
+
+    def test_deserialize_nested_containers(self) -> None:
+        data = self.api_client.deserialize(
+            json.dumps({"a": [1, 2], "b": [3]}),
+            "Dict[str, List[int]]",
+        )
+
+        self.assertEqual(data, {"a": [1, 2], "b": [3]})
+
+    def test_deserialize_native_types(self) -> None:
+        self.assertEqual(self.api_client.deserialize('"2024-02-03"', "date"), datetime.date(2024, 2, 3))
+        self.assertEqual(self.api_client.deserialize('"OWNER"', "Authority"), Authority.OWNER)
+        self.assertEqual(self.api_client.deserialize('{"x": 1}', "object"), {"x": 1})
+        self.assertIsNone(self.api_client.deserialize('null', "UserResponse"))
+
+    def test_deserializers_are_compiled_once(self) -> None:
+        self.api_client.deserialize(json.dumps([USER]), "List[UserResponse]")
+        deserializer = ApiClient._deserializers["List[UserResponse]"]
+
+        ApiClient().deserialize(json.dumps([USER]), "List[UserResponse]")
+
+        self.assertIs(ApiClient._deserializers["List[UserResponse]"], deserializer)
+        self.assertIn("UserResponse", ApiClient._deserializers)
+
+    def test_response_deserialize_validates_json_bytes(self) -> None:
+        response = self.make_response(json.dumps([USER]), "application/json; charset=utf-8")
+
+        result = self.api_client.response_deserialize(response, {"200": "List[UserResponse]"})
+
+        self.assertEqual(result.data, [UserResponse.from_dict(USER)])
+        self.assertIsNotNone(ApiClient._json_adapters["List[UserResponse]"])
+
+    def test_response_deserialize_falls_back_for_non_json(self) -> None:
+        response = self.make_response(json.dumps(USER), "text/plain")
+
+        result = self.api_client.response_deserialize(response, {"200": "UserResponse"})
+
+        self.assertEqual(result.data, UserResponse.from_dict(USER))
+
+    def test_response_deserialize_skips_adapter_for_native_types(self) -> None:
+        response = self.make_response('{"a": 1}', "application/json")
+
+        result = self.api_client.response_deserialize(response, {"200": "Dict[str, int]"})
+
+        self.assertEqual(result.data, {"a": 1})
+        self.assertIsNone(ApiClient._json_adapters["Dict[str, int]"])
+
+    def test_trusted_responses_construct_models(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        api_client = ApiClient(configuration)
+
+        users = api_client.deserialize(json.dumps([USER, None]), "List[UserResponse]")
+
+        self.assertEqual(users, [UserResponse.from_dict(USER), None])
+        self.assertIsInstance(users[0].type, UserType)
+        self.assertIsInstance(users[0].authority, Authority)
+        self.assertIsInstance(users[0].company, OrganizationDto)
+        self.assertEqual(users[0].birthday, datetime.date(1990, 5, 17))
+        self.assertIsNone(users[0].contact_type)
+
+    def test_trusted_responses_skip_validation(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+
+        user = ApiClient(configuration).deserialize(json.dumps(dict(USER, project_id="1")), "UserResponse")
+        heartbeat = ApiClient(configuration).deserialize(
+            '{"beat_time": "2024-01-01T10:00:00Z"}', "HeartbeatResponse",
+        )
+
+        self.assertEqual(user.project_id, "1")
+        self.assertIsInstance(heartbeat, HeartbeatResponse)
+        self.assertEqual(heartbeat.beat_time.hour, 10)
+        with self.assertRaises(ValueError):
+            self.api_client.deserialize(json.dumps(dict(USER, project_id="1")), "UserResponse")
+
+    def test_trusted_responses_skip_json_validation(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        response = self.make_response(json.dumps(dict(USER, project_id="1")), "application/json; charset=utf-8")
+
+        result = ApiClient(configuration).response_deserialize(response, {"200": "UserResponse"})
+
+        self.assertEqual(result.data.project_id, "1")
+
+    def test_trusted_responses_fill_defaults(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        api_client = ApiClient(configuration)
+
+        for body in ('{}', '{"number": 2, "since": "2024-02-03"}', '{"title": null, "tags": ["a"]}'):
+            trusted = api_client.deserialize(body, Page)
+            validated = self.api_client.deserialize(body, Page)
+
+            self.assertEqual(trusted, validated)
+            self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+        self.assertIsNot(api_client.deserialize('{}', Page).tags, api_client.deserialize('{}', Page).tags)
+
+    def test_static_headers_are_built_once(self) -> None:
+        configuration = Configuration(host="https://example.com")
+        configuration.access_token = "first"
+        api_client = ApiClient(configuration, cookie="session=1")
+
+        with mock.patch.object(configuration, "_auth_settings", wraps=configuration._auth_settings) as auth_settings:
+            for _ in range(3):
+                _, _, headers, _, _ = api_client.param_serialize(
+                    "GET", "/v1/users", header_params={"Accept": "application/json"}, auth_settings=["BearerAuth"],
+                )
+
+        self.assertEqual(auth_settings.call_count, 1)
+        self.assertEqual(headers, {
+            "Accept": "application/json",
+            "User-Agent": api_client.user_agent,
+            "Accept-Encoding": configuration.accept_encoding,
+            "Cookie": "session=1",
+            "Authorization": "Bearer first",
+        })
+
+    def test_static_headers_follow_changes(self) -> None:
+        configuration = Configuration(host="https://example.com")
+        api_client = ApiClient(configuration)
+
+        def headers(**kwargs):
+            return api_client.param_serialize("GET", "/v1/users", auth_settings=["BearerAuth"], **kwargs)[2]
+
+        self.assertNotIn("Authorization", headers())
+        configuration.access_token = "first"
+        self.assertEqual(headers()["Authorization"], "Bearer first")
+        configuration.access_token = "second"
+        self.assertEqual(headers()["Authorization"], "Bearer second")
+        api_client.default_headers["X-Tenant"] = "1"
+        self.assertEqual(headers()["X-Tenant"], "1")
+        api_client.set_default_header("X-Tenant", "2")
+        self.assertEqual(headers()["X-Tenant"], "2")
+        del api_client.default_headers["X-Tenant"]
+        self.assertNotIn("X-Tenant", headers())
+        api_client.default_headers = {"X-Other": "3"}
+        self.assertEqual(headers()["X-Other"], "3")
+        api_client.cookie = "session=2"
+        self.assertEqual(headers()["Cookie"], "session=2")
+        self.assertEqual(
+            headers(_request_auth={"in": "header", "type": "bearer", "key": "Authorization", "value": "Bearer once"})["Authorization"],
+            "Bearer once",
+        )
+        self.assertNotIn("Authorization", api_client.param_serialize("GET", "/heartbeat", auth_settings=[])[2])
+
+    @staticmethod
+    def make_response(body, content_type, status=200):
+        response = rest.RESTResponse(urllib3.HTTPResponse(
+            body=body.encode("utf-8"),
+            headers={"Content-Type": content_type},
+            status=status,
+        ))
+        response.read()
+        return response
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from appifyhub.api.async_messaging_api import AsyncMessagingApi
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.models.user_response import UserResponse
+
+USER = {
+    "user_id": "user",
+    "project_id": 1,
+    "universal_id": "user$1",
+    "type": "PERSONAL",
+    "authority": "DEFAULT",
+    "allows_spam": False,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+async def get_user(request):
+    if request.match_info["universal_id"] != USER["universal_id"]:
+        return web.json_response({"message": "Not found"}, status=404)
+    await asyncio.sleep(0.01)
+    return web.json_response(USER)
+
+
+async def send_message(request):
+    body = await request.json()
+    return web.json_response({"message": "Sent " + body["message_type"]})
+
+
+class TestAsyncApiClient(unittest.TestCase):
+    """AsyncApiClient unit tests"""
+
+    def run_with_server(self, scenario):
+        async def run():
+            app = web.Application()
+            app.router.add_get("/v1/universal/users/{universal_id}", get_user)
+            app.router.add_post(
+                "/v1/projects/{project_id}/users/{universal_id}/message",
+                send_message,
+            )
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                configuration = Configuration(host=str(server.make_url("")).rstrip("/"))
+                async with AsyncApiClient(configuration) as api_client:
+                    await scenario(api_client)
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def test_get_user(self) -> None:
+        async def scenario(api_client):
+            user = await AsyncUserApi(api_client).get_user("user$1")
+            self.assertIsInstance(user, UserResponse)
+            self.assertEqual(user.universal_id, "user$1")
+
+        self.run_with_server(scenario)
+
+    def test_concurrent_requests(self) -> None:
+        async def scenario(api_client):
+            api = AsyncUserApi(api_client)
+            users = await asyncio.gather(*[api.get_user("user$1") for _ in range(50)])
+            self.assertEqual(len(users), 50)
+            self.assertTrue(all(user.project_id == 1 for user in users))
+
+        self.run_with_server(scenario)
+
+    def test_send_message_with_http_info(self) -> None:
+        async def scenario(api_client):
+            response = await AsyncMessagingApi(api_client).send_message_with_http_info(
+                1, "user$1", MessageSendRequest(message_type="EMAIL"),
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data.message, "Sent EMAIL")
+
+        self.run_with_server(scenario)
+
+    def test_error_status_raises(self) -> None:
+        async def scenario(api_client):
+            with self.assertRaises(NotFoundException):
+                await AsyncUserApi(api_client).get_user("missing$1")
+
+        self.run_with_server(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main()
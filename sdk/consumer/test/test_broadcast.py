@@ -0,0 +1,91 @@
+import time
+import unittest
+from unittest import mock
+
+import urllib3
+
+from appifyhub.api_client import ApiClient
+from appifyhub.broadcast import broadcast
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException, ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.message_send_request import MessageSendRequest
+
+RECIPIENTS = 40
+LATENCY = 0.05
+
+
+class TestBroadcast(unittest.TestCase):
+    """Fan-out message sender unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(latency=LATENCY).start()
+        self.addCleanup(self.hub.stop)
+        self.project = self.hub.add_project("Calculator")
+        self.hub.add_template(self.project["project_id"], "welcome", "Hi {{user.name}}")
+        self.recipients = [
+            self.hub.add_user(self.project["project_id"], "user%d" % index, name="User %d" % index)["universal_id"]
+            for index in range(RECIPIENTS)
+        ]
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(self.recipients[0])
+        configuration.connection_pool_maxsize = 10
+        self.api_client = ApiClient(configuration)
+        self.message = MessageSendRequest(message_type="EMAIL", message_template_name="welcome")
+
+    def broadcast(self, recipients, **kwargs):
+        return list(broadcast(self.api_client, self.project["project_id"], recipients, self.message, **kwargs))
+
+    def test_sends_concurrently_over_the_connection_pool(self) -> None:
+        progress = []
+        started = time.monotonic()
+
+        results = self.broadcast(iter(self.recipients), on_progress=progress.append)
+
+        # 40 sends of 50ms over 10 connections
+        self.assertLess(time.monotonic() - started, RECIPIENTS * LATENCY / 2)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(sorted(m["universal_id"] for m in self.hub.messages), sorted(self.recipients))
+        self.assertEqual(self.hub.messages[0]["materialized"][:8], "Hi User ")
+        self.assertEqual(len(progress), RECIPIENTS)
+        self.assertEqual((progress[-1].succeeded, progress[-1].in_flight), (RECIPIENTS, 0))
+
+    def test_reports_per_recipient_outcomes(self) -> None:
+        self.hub.fail_next(status=500, operation="send_message")
+        recipients = self.recipients[:2] + ["ghost$%d" % self.project["project_id"]]
+
+        results = sorted(self.broadcast(recipients, concurrency=1), key=lambda result: result.index)
+
+        self.assertIsInstance(results[0].error, ServiceException)
+        self.assertTrue(results[1].ok)
+        self.assertIsInstance(results[2].error, NotFoundException)
+        self.assertEqual(len(self.hub.messages), 1)
+
+    def test_retries_sends_the_service_turned_away(self) -> None:
+        self.hub.fail_next(status=429, operation="send_message", retry_after=0)
+
+        results = self.broadcast(self.recipients[:1])
+
+        self.assertEqual((results[0].ok, results[0].attempts), (True, 2))
+        self.assertEqual(len(self.hub.messages), 1)
+
+    def test_does_not_retry_read_timeouts(self) -> None:
+        pool_manager = self.api_client.rest_client.pool_manager
+        timeout = urllib3.exceptions.ReadTimeoutError(pool_manager, "/", "Read timed out")
+
+        with mock.patch.object(pool_manager, "request", side_effect=timeout) as request:
+            results = self.broadcast(self.recipients[:1])
+
+        self.assertEqual((results[0].ok, results[0].attempts), (False, 1))
+        self.assertEqual(request.call_count, 1)
+
+    def test_caps_the_send_rate(self) -> None:
+        started = time.monotonic()
+
+        self.broadcast(self.recipients[:6], rate=50.0)
+
+        self.assertGreaterEqual(time.monotonic() - started, 5 / 50.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+import asyncio
+import copy
+import unittest
+from unittest import mock
+
+import urllib3
+
+from appifyhub import circuit_breaker
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ApiValueError, CircuitOpenError, NotFoundException, ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.retry import RetryPolicy
+
+GET_USER = ("GET", "/v1/universal/users/{universalId}")
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Circuit breaker unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.clock = FakeClock()
+        self.transitions = []
+        self.breaker = circuit_breaker.CircuitBreaker(
+            failure_rate_threshold=0.5,
+            minimum_calls=4,
+            window=10,
+            cool_down=5.0,
+            on_state_change=lambda key, old, new: self.transitions.append((key, old, new)),
+            clock=self.clock,
+        )
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.circuit_breaker = self.breaker
+        self.user_api = UserApi(ApiClient(self.configuration))
+
+    def get_user(self):
+        return self.user_api.get_user(self.user["universal_id"])
+
+    def fail_get_user(self) -> None:
+        self.hub.fail_next(status=503, operation="get_user")
+        with self.assertRaises(ServiceException):
+            self.get_user()
+
+    def open_circuit(self) -> None:
+        self.get_user()
+        self.get_user()
+        self.fail_get_user()
+        self.fail_get_user()
+
+    def test_opens_at_the_failure_rate_threshold(self) -> None:
+        self.get_user()
+        self.get_user()
+        self.fail_get_user()
+        self.get_user()
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+
+        self.fail_get_user()
+        self.fail_get_user()
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.OPEN)
+        self.assertEqual(self.transitions, [(GET_USER, circuit_breaker.CLOSED, circuit_breaker.OPEN)])
+
+    def test_open_circuit_fails_fast(self) -> None:
+        self.open_circuit()
+        calls = self.hub.calls["get_user"]
+
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.get_user()
+
+        self.assertEqual(self.hub.calls["get_user"], calls)
+        self.assertEqual((raised.exception.method, raised.exception.resource_path), GET_USER)
+        self.assertEqual(raised.exception.retry_after, 5.0)
+
+    def test_circuits_are_per_endpoint(self) -> None:
+        self.open_circuit()
+
+        users = self.user_api.search_users(self.user["project_id"], user_name="Ana")
+
+        self.assertEqual(len(users), 1)
+        self.assertEqual(self.breaker.states(), {
+            GET_USER: circuit_breaker.OPEN,
+            ("GET", "/v1/projects/{projectId}/search"): circuit_breaker.CLOSED,
+        })
+
+    def test_half_open_probe_closes_or_reopens(self) -> None:
+        self.open_circuit()
+        self.clock.now += 5
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.HALF_OPEN)
+
+        self.hub.fail_next(status=500, operation="get_user")
+        with self.assertRaises(ServiceException):
+            self.get_user()
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.OPEN)
+
+        self.clock.now += 5
+        self.assertEqual(self.get_user().name, "Ana")
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+        self.assertEqual([new for _, _, new in self.transitions], [
+            circuit_breaker.OPEN,
+            circuit_breaker.HALF_OPEN,
+            circuit_breaker.OPEN,
+            circuit_breaker.HALF_OPEN,
+            circuit_breaker.CLOSED,
+        ])
+
+    def test_half_open_admits_limited_probes(self) -> None:
+        self.open_circuit()
+        self.clock.now += 5
+
+        probe = self.breaker.acquire(*GET_USER)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.acquire(*GET_USER)
+        probe.record(None)
+        self.breaker.acquire(*GET_USER).record(False)
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+
+    def test_interrupted_probe_is_released(self) -> None:
+        self.open_circuit()
+        self.clock.now += 5
+
+        rest_client = self.user_api.api_client.rest_client
+        with mock.patch.object(rest_client, "request", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.get_user()
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.HALF_OPEN)
+        self.get_user()
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+
+    def test_old_failures_leave_the_window(self) -> None:
+        for _ in range(3):
+            self.fail_get_user()
+        self.clock.now += 10
+
+        self.get_user()
+        self.fail_get_user()
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+        self.assertEqual(self.breaker._circuits[GET_USER].counts(), (2, 1))
+
+    def test_client_errors_and_transport_failures(self) -> None:
+        for _ in range(4):
+            with self.assertRaises(NotFoundException):
+                self.user_api.get_user("missing$1")
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+
+        pool_manager = self.user_api.api_client.rest_client.pool_manager
+        timeout = urllib3.exceptions.ReadTimeoutError(pool_manager, "/", "Read timed out")
+        with mock.patch.object(pool_manager, "request", side_effect=timeout):
+            for _ in range(4):
+                with self.assertRaises(urllib3.exceptions.ReadTimeoutError):
+                    self.get_user()
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.OPEN)
+
+    def test_invalid_arguments_are_not_failures(self) -> None:
+        rest_client = self.user_api.api_client.rest_client
+        with mock.patch.object(rest_client, "request", side_effect=ApiValueError("invalid")):
+            for _ in range(4):
+                with self.assertRaises(ApiValueError):
+                    self.get_user()
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+        self.assertEqual(self.breaker._circuits[GET_USER].counts(), (0, 0))
+
+    def test_stops_retries_once_open(self) -> None:
+        self.configuration.retry_policy = RetryPolicy(max_attempts=10, backoff_base=0.001)
+        self.hub.fail_next(status=503, count=10, operation="get_user")
+
+        with self.assertRaises(CircuitOpenError):
+            self.get_user()
+
+        self.assertEqual(self.hub.calls["get_user"], 4)
+
+    def test_copies_of_the_configuration_share_the_breaker(self) -> None:
+        self.assertIs(copy.deepcopy(self.configuration).circuit_breaker, self.breaker)
+
+    def test_async_requests_fail_fast(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                for _ in range(4):
+                    with self.assertRaises(ServiceException):
+                        await user_api.get_user(self.user["universal_id"])
+                with self.assertRaises(CircuitOpenError):
+                    await user_api.get_user(self.user["universal_id"])
+
+        self.hub.fail_next(status=503, count=4, operation="get_user")
+        asyncio.run(scenario())
+
+        self.assertEqual(self.hub.calls["get_user"], 4)
+
+
+    def test_cancelled_async_probe_is_released(self) -> None:
+        async def stall(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                with mock.patch.object(api_client.rest_client, "request", side_effect=stall):
+                    probe = asyncio.ensure_future(user_api.get_user(self.user["universal_id"]))
+                    await asyncio.sleep(0)
+                    probe.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await probe
+                self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.HALF_OPEN)
+                await user_api.get_user(self.user["universal_id"])
+
+        self.open_circuit()
+        self.clock.now += 5
+        asyncio.run(scenario())
+
+        self.assertEqual(self.breaker.state(*GET_USER), circuit_breaker.CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import asyncio
+import gzip
+import unittest
+import zlib
+
+from appifyhub import compression, metrics
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ApiException
+from appifyhub.fake_server import FakeAppifyHub
+
+BODY = b'{"name": "Ana"}' * 1000
+
+
+def decode(content_encoding, data, chunk_size=100):
+    decoder = compression.Decoder(content_encoding)
+    for start in range(0, len(data), chunk_size):
+        decoder.feed(data[start:start + chunk_size])
+    return decoder.finish(), decoder.wire_bytes
+
+
+class TestCompression(unittest.TestCase):
+    """Response compression unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(compression=True).start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        for index in range(30):
+            self.hub.add_user(project["project_id"], "user%d" % index, name="Ana")
+        self.metrics = metrics.Metrics()
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.metrics = self.metrics
+        self.accept_encodings = []
+        handle = self.hub.handle
+
+        def record_accept_encoding(method, target, headers, body, client):
+            self.accept_encodings.append(headers.get("Accept-Encoding"))
+            return handle(method, target, headers, body, client)
+
+        self.hub.handle = record_accept_encoding
+
+    def test_decodes_chunked_bodies(self) -> None:
+        gzipped = gzip.compress(BODY)
+
+        self.assertEqual(decode("gzip", gzipped), (BODY, len(gzipped)))
+        self.assertEqual(decode("deflate", zlib.compress(BODY))[0], BODY)
+        self.assertEqual(decode("deflate", zlib.compress(BODY)[2:-4])[0], BODY)
+        self.assertEqual(decode("gzip", gzip.compress(BODY[:10]) + gzip.compress(BODY[10:]))[0], BODY)
+        self.assertEqual(decode("identity", BODY), (BODY, len(BODY)))
+        # unknown codings are kept as received
+        self.assertEqual(decode("zstd", b"zstd data"), (b"zstd data", 9))
+        self.assertFalse(compression.Decoder("gzip, zstd").decodes)
+        with self.assertRaises(ApiException):
+            decode("gzip", b"not gzip")
+
+    def test_negotiates_and_decompresses_responses(self) -> None:
+        user_api = UserApi(ApiClient(self.configuration))
+
+        users = user_api.search_users(self.user["project_id"], user_name="Ana")
+        raw = user_api.search_users_without_preload_content(self.user["project_id"], user_name="Ana")
+
+        self.assertEqual(len(users), 31)
+        self.assertEqual(self.accept_encodings, [compression.default_accept_encoding()] * 2)
+        self.assertEqual(raw.headers["Content-Encoding"], "gzip")
+        search_users = self.metrics.snapshot()["search_users"]
+        self.assertEqual(search_users.body_bytes, len(raw.data))
+        self.assertLess(search_users.wire_bytes, search_users.body_bytes)
+        self.assertGreater(search_users.compression_ratio, 1)
+        self.assertIn(
+            'appifyhub_response_wire_bytes_total{operation="search_users"} %d' % search_users.wire_bytes,
+            self.metrics.to_prometheus(),
+        )
+
+    def test_negotiation_can_be_disabled(self) -> None:
+        self.configuration.accept_encoding = None
+        user_api = UserApi(ApiClient(self.configuration))
+
+        user_api.search_users(self.user["project_id"], user_name="Ana")
+
+        # http.client asks for `identity` when no coding is requested
+        self.assertEqual(self.accept_encodings, ["identity"])
+        self.assertEqual(self.metrics.snapshot()["search_users"].compression_ratio, 1.0)
+
+    def test_async_client_decompresses_responses(self) -> None:
+        async def search_users():
+            async with AsyncApiClient(self.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                return await asyncio.gather(
+                    *(user_api.search_users(self.user["project_id"], user_name="Ana") for _ in range(3))
+                )
+
+        results = asyncio.run(search_users())
+
+        self.assertEqual([len(users) for users in results], [31, 31, 31])
+        self.assertEqual(self.accept_encodings, [compression.default_accept_encoding()] * 3)
+        search_users = self.metrics.snapshot()["search_users"]
+        self.assertLess(search_users.wire_bytes, search_users.body_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.fake_server import FakeAppifyHub
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Connection pool statistics and warm-up unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        configuration.connection_pool_maxsize = 4
+        api_client = ApiClient(configuration)
+        self.rest_client = api_client.rest_client
+        self.user_api = UserApi(api_client)
+
+    def stats(self):
+        return self.rest_client.pool_stats().get(self.hub.host)
+
+    def get_user(self) -> None:
+        self.user_api.get_user(self.user["universal_id"])
+
+    def test_reports_connection_reuse(self) -> None:
+        for _ in range(4):
+            self.get_user()
+
+        stats = self.stats()
+        self.assertEqual((stats.active, stats.idle, stats.created), (0, 1, 1))
+        self.assertEqual((stats.requests, stats.reused, stats.reuse_ratio), (4, 3, 0.75))
+        self.assertGreater(stats.wait_seconds, 0)
+        self.assertGreaterEqual(stats.max_wait_seconds, stats.average_wait_seconds)
+
+    def test_reports_active_connections(self) -> None:
+        self.hub.latency = 0.2
+        threads = [threading.Thread(target=self.get_user) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 1
+        while (self.stats() is None or self.stats().active < 3) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        in_flight = self.stats()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((in_flight.active, in_flight.idle), (3, 0))
+        self.assertEqual((self.stats().active, self.stats().idle, self.stats().created), (0, 3, 3))
+
+    def test_warm_up_opens_connections_ahead_of_requests(self) -> None:
+        self.assertEqual(self.rest_client.warm_up(10), 4)
+        self.assertEqual((self.stats().idle, self.stats().created, self.stats().requests), (4, 4, 0))
+
+        for _ in range(3):
+            self.get_user()
+
+        stats = self.stats()
+        self.assertEqual((stats.created, stats.reuse_ratio), (4, 1.0))
+        self.assertEqual(self.rest_client.warm_up(4), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import time
+import unittest
+
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException, UnauthorizedException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.models.user_credentials_request import UserCredentialsRequest
+from appifyhub.models.user_signup_request import UserSignupRequest
+from appifyhub.models.user_update_authority_request import UserUpdateAuthorityRequest
+
+
+class TestFakeServer(unittest.TestCase):
+    """FakeAppifyHub unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.project = self.hub.add_project("Calculator", language_tag="en")
+        self.api_client = ApiClient(Configuration(host=self.hub.host))
+
+    def sign_in(self, universal_id: str, signature: str = "password") -> None:
+        token = AuthApi(self.api_client).authenticate(
+            UserCredentialsRequest(universal_id=universal_id, signature=signature)
+        )
+        self.api_client.configuration.access_token = token.token_value
+
+    def test_signup_authenticate_and_fetch(self) -> None:
+        user_api = UserApi(self.api_client)
+
+        user = user_api.add_user(
+            self.project["project_id"],
+            UserSignupRequest(user_id="ana", raw_signature="secret", name="Ana", contact="ana@example.com"),
+        )
+        self.sign_in(user.universal_id, "secret")
+
+        self.assertEqual(user.universal_id, "ana$%d" % self.project["project_id"])
+        self.assertEqual(user_api.get_user(user.universal_id), user)
+        self.assertEqual(AuthApi(self.api_client).get_current_token().universal_id, user.universal_id)
+
+    def test_search_update_and_message(self) -> None:
+        project_id = self.project["project_id"]
+        for name in ("Ana", "Anabel", "Bob"):
+            self.hub.add_user(project_id, name.lower(), name=name)
+        template = self.hub.add_template(project_id, "welcome", "Hi {{user.name}}, welcome to {{project.name}}{{user.code}}")
+        self.api_client.configuration.access_token = self.hub.create_token("ana$%d" % project_id)
+        user_api = UserApi(self.api_client)
+
+        found = user_api.search_users(project_id, user_name="ana%")
+        updated = user_api.update_authority("bob$%d" % project_id, UserUpdateAuthorityRequest(authority="MODERATOR"))
+        MessagingApi(self.api_client).send_message(
+            project_id, updated.universal_id, MessageSendRequest(message_type="EMAIL", message_template_name="welcome")
+        )
+
+        self.assertEqual(sorted(user.name for user in found), ["Ana", "Anabel"])
+        self.assertEqual(updated.authority, "MODERATOR")
+        self.assertEqual(self.hub.messages[0]["template_id"], template["id"])
+        self.assertTrue(self.hub.messages[0]["materialized"].startswith("Hi Bob, welcome to Calculator"))
+        self.assertEqual(self.hub.calls["search_users"], 1)
+
+    def test_requires_known_token(self) -> None:
+        user = self.hub.add_user(self.project["project_id"], "ana")
+
+        with self.assertRaises(UnauthorizedException):
+            UserApi(self.api_client).get_user(user["universal_id"])
+
+        self.api_client.configuration.access_token = "unknown"
+        with self.assertRaises(UnauthorizedException):
+            UserApi(self.api_client).get_user(user["universal_id"])
+
+    def test_injected_failures_and_latency(self) -> None:
+        user = self.hub.add_user(self.project["project_id"], "ana")
+        self.api_client.configuration.access_token = self.hub.create_token(user["universal_id"])
+        user_api = UserApi(self.api_client)
+        self.hub.fail_next(status=500, count=2, operation="get_user", retry_after=2)
+
+        for _ in range(2):
+            with self.assertRaises(ServiceException) as context:
+                user_api.get_user(user["universal_id"])
+            self.assertEqual(context.exception.headers["Retry-After"], "2")
+        self.assertEqual(user_api.get_user(user["universal_id"]).user_id, "ana")
+
+        self.hub.latency = 0.05
+        started = time.perf_counter()
+        user_api.get_user(user["universal_id"])
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+
+        self.hub.latency = 0.0
+        self.hub.error_rate = 1.0
+        with self.assertRaises(ServiceException):
+            user_api.get_user(user["universal_id"])
+
+    def test_reset_drops_state(self) -> None:
+        self.hub.add_user(self.project["project_id"], "ana")
+
+        self.hub.reset()
+
+        self.assertEqual(list(self.hub.projects), [1])
+        self.assertEqual(self.hub.users, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import importlib.util
+import unittest
+
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.retry import RetryPolicy
+
+HTTPX_INSTALLED = all(importlib.util.find_spec(name) is not None for name in ("httpx", "h2"))
+
+
+@unittest.skipUnless(HTTPX_INSTALLED, "the http2 extra (httpx[http2]) is not installed")
+class TestHTTP2RESTClientObject(unittest.TestCase):
+    """HTTP/2 transport unit tests"""
+
+    def setUp(self) -> None:
+        from appifyhub import http2_rest
+        self.http2_rest = http2_rest
+
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.project = self.hub.add_project("Calculator")
+        self.hub.add_template(self.project["project_id"], "welcome", "Hi {{user.name}}")
+        self.user = self.hub.add_user(self.project["project_id"], "ana", name="Ana")
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.http2 = True
+        self.api_client = ApiClient(self.configuration)
+        self.addCleanup(self.api_client.rest_client.close)
+
+    def test_is_selected_through_the_configuration(self) -> None:
+        self.assertIsInstance(self.api_client.rest_client, self.http2_rest.HTTP2RESTClientObject)
+
+    def test_makes_requests(self) -> None:
+        user_api = UserApi(self.api_client)
+        message = MessageSendRequest(message_type="EMAIL", message_template_name="welcome")
+
+        self.assertEqual(user_api.get_user(self.user["universal_id"]).name, "Ana")
+        MessagingApi(self.api_client).send_message(self.project["project_id"], self.user["universal_id"], message)
+        with self.assertRaises(NotFoundException):
+            user_api.get_user("ghost$%d" % self.project["project_id"])
+
+        self.assertEqual(self.hub.messages[0]["materialized"], "Hi Ana")
+
+    def test_connection_failures_are_retried(self) -> None:
+        configuration = Configuration(host="http://127.0.0.1:1")
+        configuration.http2 = True
+        configuration.retry_policy = RetryPolicy(max_attempts=2, backoff_base=0.001, budget=None)
+        api_client = ApiClient(configuration)
+        self.addCleanup(api_client.rest_client.close)
+
+        with self.assertRaises(Exception) as raised:
+            UserApi(api_client).get_user(self.user["universal_id"])
+
+        self.assertEqual(api_client.rest_client.classify_error(raised.exception), "connect")
+
+    def test_async_client_multiplexes_requests(self) -> None:
+        async def get_users():
+            async with AsyncApiClient(self.configuration) as api_client:
+                self.assertIsInstance(api_client.rest_client, self.http2_rest.AsyncHTTP2RESTClientObject)
+                user_api = AsyncUserApi(api_client)
+                return await asyncio.gather(*(user_api.get_user(self.user["universal_id"]) for _ in range(10)))
+
+        users = asyncio.run(get_users())
+
+        self.assertEqual({user.name for user in users}, {"Ana"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import unittest
+from unittest import mock
+
+from appifyhub import json_codec, rest
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+
+CODECS = [json_codec.JsonCodec()]
+if json_codec.orjson is not None:
+    CODECS.append(json_codec.OrjsonCodec())
+
+
+class RecordingCodec(json_codec.JsonCodec):
+
+    def __init__(self) -> None:
+        self.encoded = []
+        self.decoded = []
+
+    def encode(self, obj):
+        self.encoded.append(obj)
+        return super().encode(obj)
+
+    def decode(self, data):
+        self.decoded.append(data)
+        return super().decode(data)
+
+
+class TestJsonCodec(unittest.TestCase):
+    """JSON codec unit tests"""
+
+    def test_codecs_round_trip(self) -> None:
+        payload = {"name": "Žana", "tags": ["a", "b"], "count": 3, "nested": {"ok": True}}
+
+        for codec in CODECS:
+            encoded = codec.encode(payload)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(json.loads(encoded), payload)
+            self.assertEqual(codec.decode(encoded), payload)
+            self.assertEqual(codec.decode(encoded.decode("utf-8")), payload)
+
+    @unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+    def test_default_codec_prefers_orjson(self) -> None:
+        self.assertIsInstance(json_codec.default_json_codec(), json_codec.OrjsonCodec)
+
+        with mock.patch.object(json_codec, "orjson", None):
+            self.assertIs(type(json_codec.default_json_codec()), json_codec.JsonCodec)
+
+    def test_invalid_json_raises_value_error(self) -> None:
+        for codec in CODECS:
+            with self.assertRaises(ValueError):
+                codec.decode("not json")
+
+    def test_configured_codec_is_used_for_bodies_and_responses(self) -> None:
+        configuration = Configuration()
+        configuration.json_codec = RecordingCodec()
+        api_client = ApiClient(configuration)
+        pool_manager = mock.Mock()
+        api_client.rest_client.pool_manager = pool_manager
+
+        api_client.call_api(
+            "POST", "https://example.com/",
+            header_params={"Content-Type": "application/json"},
+            body={"a": 1},
+        )
+        api_client.call_api(
+            "POST", "https://example.com/",
+            header_params={"Content-Type": "multipart/form-data"},
+            post_params=[("meta", {"b": 2}), ("name", "x")],
+        )
+        data = api_client.deserialize('{"c": 3}', "Dict[str, int]")
+
+        self.assertEqual(configuration.json_codec.encoded, [{"a": 1}, {"b": 2}])
+        self.assertEqual(pool_manager.request.call_args_list[0].kwargs["body"], b'{"a": 1}')
+        self.assertEqual(
+            pool_manager.request.call_args_list[1].kwargs["fields"],
+            [("meta", '{"b": 2}'), ("name", "x")],
+        )
+        self.assertEqual(configuration.json_codec.decoded, ['{"c": 3}'])
+        self.assertEqual(data, {"c": 3})
+        self.assertIsInstance(api_client.rest_client, rest.RESTClientObject)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+from appifyhub import metrics
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import FakeAppifyHub
+
+
+class TestMetrics(unittest.TestCase):
+    """Per-operation metrics unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.metrics = metrics.Metrics()
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.metrics = self.metrics
+        self.user_api = UserApi(ApiClient(self.configuration))
+
+    def test_records_requests_and_phases_per_operation(self) -> None:
+        self.user_api.get_user(self.user["universal_id"])
+        self.user_api.get_user(self.user["universal_id"])
+        with self.assertRaises(NotFoundException):
+            self.user_api.get_user("ghost$%d" % self.user["project_id"])
+        self.user_api.search_users(self.user["project_id"], user_name="Ana")
+
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(sorted(snapshot), ["get_user", "search_users"])
+        get_user = snapshot["get_user"]
+        self.assertEqual(get_user.requests, {"2xx": 2, "4xx": 1})
+        self.assertEqual((get_user.wait.count, get_user.read.count, get_user.deserialize.count), (3, 3, 3))
+        self.assertGreater(get_user.wait.sum, 0)
+        self.assertLessEqual(get_user.wait.quantile(0.5), get_user.wait.quantile(0.99))
+        self.assertEqual(snapshot["search_users"].requests, {"2xx": 1})
+
+    def test_records_transport_failures(self) -> None:
+        configuration = Configuration(host="http://127.0.0.1:1")
+        configuration.retries = 0
+        configuration.metrics = self.metrics
+
+        with self.assertRaises(Exception):
+            UserApi(ApiClient(configuration)).get_user(self.user["universal_id"])
+
+        get_user = self.metrics.snapshot()["get_user"]
+        self.assertEqual(get_user.requests, {metrics.ERROR: 1})
+        self.assertEqual(get_user.wait.count, 0)
+
+    def test_async_client_records_the_same_metrics(self) -> None:
+        async def get_user():
+            async with AsyncApiClient(self.configuration) as api_client:
+                return await AsyncUserApi(api_client).get_user(self.user["universal_id"])
+
+        asyncio.run(get_user())
+
+        get_user = self.metrics.snapshot()["get_user"]
+        self.assertEqual(get_user.requests, {"2xx": 1})
+        self.assertEqual((get_user.read.count, get_user.deserialize.count), (1, 1))
+
+    def test_exports_prometheus_text(self) -> None:
+        self.metrics.record_response("get_user", 200, 0.003)
+        self.metrics.record_response("get_user", 503, 0.2)
+        self.metrics.record_read("get_user", 0.0001)
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn('appifyhub_requests_total{operation="get_user",status_class="5xx"} 1\n', text)
+        self.assertIn('# TYPE appifyhub_wait_seconds histogram\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_user",le="0.005"} 1\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_user",le="0.25"} 2\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_user",le="+Inf"} 2\n', text)
+        self.assertIn('appifyhub_read_seconds_count{operation="get_user"} 1\n', text)
+        self.assertIn('appifyhub_deserialize_seconds_count{operation="get_user"} 0\n', text)
+
+    def test_nothing_is_recorded_when_disabled(self) -> None:
+        self.configuration.metrics = None
+
+        self.user_api.get_user(self.user["universal_id"])
+
+        self.assertEqual(self.metrics.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import importlib
+import inspect
+import pkgutil
+import re
+import unittest
+
+import appifyhub.api
+from appifyhub import fake_server, operations, response_cache
+
+SERIALIZE = re.compile(
+    r"def _(\w+)_serialize\(.*?_auth_settings: List\[str\] = \[(.*?)\].*?"
+    r"method='(\w+)',\s*resource_path='([^']+)'",
+    re.S,
+)
+
+
+def generated_operations():
+    """Returns (method, resource path, operation, authenticated) of each generated operation."""
+    found = []
+    for module_info in pkgutil.iter_modules(appifyhub.api.__path__):
+        if module_info.name.startswith("async_"):
+            continue
+        source = inspect.getsource(importlib.import_module("appifyhub.api." + module_info.name))
+        for operation, auth_settings, method, resource_path in SERIALIZE.findall(source):
+            found.append((method, resource_path, operation, "BearerAuth" in auth_settings))
+    return found
+
+
+class TestOperations(unittest.TestCase):
+    """Checks the hand-kept operation tables against the generated API modules"""
+
+    def setUp(self) -> None:
+        self.generated = generated_operations()
+        # the fake service serves both SDKs, renaming the operations whose names clash
+        self.routes = {(method, path): operation for method, path, operation in fake_server.ROUTES}
+        self.routes_by_name = {operation: route for route, operation in self.routes.items()}
+        self.routes_by_name.update({
+            operation: (method, path) for method, path, operation, _ in self.generated
+        })
+
+    def test_operations_match_the_generated_apis(self) -> None:
+        self.assertTrue(self.generated)
+        generated = {(method, path): operation for method, path, operation, _ in self.generated}
+        self.assertEqual(operations.OPERATIONS, generated)
+
+    def test_fake_server_serves_the_generated_apis(self) -> None:
+        self.assertEqual(len(self.routes), len(fake_server.ROUTES))
+        self.assertEqual(len(set(self.routes.values())), len(fake_server.ROUTES))
+        self.assertLessEqual(fake_server.PUBLIC_OPERATIONS, set(self.routes.values()))
+        for method, resource_path, operation, authenticated in self.generated:
+            route = self.routes.get((method, resource_path))
+            self.assertIsNotNone(route, operation)
+            self.assertEqual(route in fake_server.PUBLIC_OPERATIONS, not authenticated, operation)
+
+    def test_cache_tables_name_served_operations(self) -> None:
+        def method(operation):
+            return self.routes_by_name[operation][0]
+
+        for cached, mutations in response_cache.INVALIDATED_BY.items():
+            self.assertEqual(method(cached), "GET", cached)
+            for mutation in mutations:
+                self.assertNotEqual(method(mutation), "GET", mutation)
+        for cached in response_cache.DEFAULT_TTLS:
+            self.assertEqual(method(cached), "GET", cached)
+        for cached, param in response_cache._SCOPE_PARAMS.items():
+            self.assertIn("{%s}" % param, self.routes_by_name[cached][1], cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.message_send_request import MessageSendRequest
+from appifyhub.outbox import Outbox
+from appifyhub.retry import RetryPolicy
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestOutbox(unittest.TestCase):
+    """Durable message outbox unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.project = self.hub.add_project("Calculator")
+        self.hub.add_template(self.project["project_id"], "welcome", "Hi {{user.name}}")
+        self.user = self.hub.add_user(self.project["project_id"], "ana", name="Ana")
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.api_client = ApiClient(configuration)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "outbox.sqlite3")
+        self.clock = FakeClock()
+        self.message = MessageSendRequest(message_type="EMAIL", message_template_name="welcome")
+        self.dead_letters = []
+        self.outbox = self.open_outbox()
+
+    def open_outbox(self, **kwargs) -> Outbox:
+        kwargs.setdefault(
+            "retry_policy", RetryPolicy(max_attempts=3, jitter=False, rejected_statuses=(429, 503), budget=None),
+        )
+        outbox = Outbox(self.api_client, self.path, clock=self.clock, on_dead_letter=self.dead_letters.append, **kwargs)
+        self.addCleanup(outbox.close)
+        return outbox
+
+    def send(self, universal_id=None, outbox=None) -> int:
+        outbox = outbox or self.outbox
+        return outbox.send_message(self.project["project_id"], universal_id or self.user["universal_id"], self.message)
+
+    def test_messages_are_stored_until_the_worker_sends_them(self) -> None:
+        for _ in range(3):
+            self.send()
+        self.assertEqual((self.outbox.pending(), len(self.hub.messages)), (3, 0))
+
+        self.outbox.flush()
+
+        self.assertEqual((self.outbox.pending(), len(self.hub.messages)), (0, 3))
+        self.assertEqual(self.hub.messages[0]["materialized"], "Hi Ana")
+
+    def test_messages_survive_a_restart(self) -> None:
+        self.send()
+        self.outbox.close()
+
+        reopened = self.open_outbox()
+        reopened.flush()
+
+        self.assertEqual(len(self.hub.messages), 1)
+
+    def test_messages_are_sent_in_batches(self) -> None:
+        outbox = self.open_outbox(batch_size=4)
+        for _ in range(10):
+            self.send(outbox=outbox)
+
+        self.assertEqual([outbox.process_batch() for _ in range(4)], [4, 4, 2, 0])
+
+    def test_failed_sends_are_retried_later(self) -> None:
+        self.hub.fail_next(status=503, operation="send_message")
+        self.send()
+
+        self.assertEqual(self.outbox.process_batch(), 1)
+        self.assertEqual(self.outbox.process_batch(), 0)
+        self.assertEqual(self.outbox.pending(), 1)
+
+        self.clock.now += self.outbox.retry_policy.backoff_base
+        self.outbox.flush()
+
+        self.assertEqual((self.outbox.pending(), len(self.hub.messages)), (0, 1))
+
+    def test_undeliverable_messages_become_dead_letters(self) -> None:
+        self.hub.fail_next(status=503, count=3, operation="send_message")
+        self.send()
+        for _ in range(3):
+            self.outbox.process_batch()
+            self.clock.now += 10
+        unknown_id = self.send("bob$%d" % self.project["project_id"])
+        self.outbox.process_batch()
+
+        dead_letters = self.outbox.dead_letters()
+        self.assertEqual([(entry.id, entry.attempts) for entry in dead_letters], [(1, 3), (unknown_id, 1)])
+        self.assertIn("404", dead_letters[1].last_error)
+        self.assertEqual(len(self.dead_letters), 2)
+        self.assertEqual(self.outbox.pending(), 0)
+
+        self.hub.add_user(self.project["project_id"], "bob", name="Bob")
+        self.assertEqual(self.outbox.retry_dead_letters([unknown_id]), 1)
+        self.outbox.flush()
+
+        self.assertEqual([message["materialized"] for message in self.hub.messages], ["Hi Bob"])
+        self.assertEqual(len(self.outbox.dead_letters()), 1)
+
+    def test_sends_that_may_have_gone_out_are_not_retried(self) -> None:
+        self.outbox = self.open_outbox(retry_policy=None)
+        self.hub.fail_next(status=502, operation="send_message")
+        self.send()
+
+        self.outbox.process_batch()
+
+        self.assertEqual([entry.attempts for entry in self.outbox.dead_letters()], [1])
+        self.assertIn("502", self.outbox.dead_letters()[0].last_error)
+
+    def test_unreadable_messages_become_dead_letters(self) -> None:
+        self.send()
+        self.send()
+        self.outbox._db.executemany("UPDATE outbox SET message = ? WHERE id = ?", [
+            ("{not json", 1),
+            ('{"message_type": "EMAIL", "unknown": 1}', 2),
+        ])
+        self.send()
+
+        self.assertEqual(self.outbox.process_batch(), 3)
+
+        self.assertEqual(len(self.hub.messages), 1)
+        self.assertEqual(self.outbox.pending(), 0)
+        dead_letters = self.outbox.dead_letters()
+        self.assertEqual([entry.id for entry in dead_letters], [1, 2])
+        self.assertEqual([entry.message for entry in dead_letters], [None, None])
+        self.assertIn("Unreadable message: ", dead_letters[0].last_error)
+        self.assertIn("unknown", dead_letters[1].last_error)
+        self.assertEqual([entry.id for entry in self.dead_letters], [1, 2])
+
+    def test_failed_updates_roll_back(self) -> None:
+        self.send()
+        database = self.outbox._db
+
+        class FailingUpdates:
+
+            def __getattr__(self, name):
+                return getattr(database, name)
+
+            def executemany(self, sql, rows):
+                raise sqlite3.OperationalError("disk I/O error")
+
+        self.outbox._db = FailingUpdates()
+        with self.assertRaises(sqlite3.OperationalError):
+            self.outbox.process_batch()
+        self.outbox._db = database
+
+        self.assertFalse(database.in_transaction)
+        self.assertEqual(self.outbox.pending(), 1)
+
+    def test_background_worker_drains_the_outbox(self) -> None:
+        outbox = self.open_outbox(batch_size=5, poll_interval=0.01)
+        outbox.clock = time.time
+        outbox.start()
+        for _ in range(12):
+            self.send(outbox=outbox)
+
+        deadline = time.monotonic() + 5
+        while outbox.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        outbox.stop()
+
+        self.assertEqual(len(self.hub.messages), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import copy
+import unittest
+
+from appifyhub import response_cache
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.user_signup_request import UserSignupRequest
+from appifyhub.models.user_update_authority_request import UserUpdateAuthorityRequest
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Response cache unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(etags=True).start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.ana = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.bob = self.hub.add_user(project["project_id"], "bob", name="Bob")
+        self.clock = FakeClock()
+        self.store = response_cache.InMemoryStore(clock=self.clock)
+        self.cache = self.make_cache()
+        self.user_api = UserApi(self.make_api_client(self.cache))
+
+    def make_cache(self, **kwargs):
+        return response_cache.ResponseCache(store=self.store, revalidate_for=60, clock=self.clock, **kwargs)
+
+    def make_api_client(self, cache, universal_id=None):
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(universal_id or self.ana["universal_id"])
+        configuration.response_cache = cache
+        return ApiClient(configuration)
+
+    def test_reads_are_served_from_the_cache_until_they_expire(self) -> None:
+        for _ in range(3):
+            self.assertEqual(self.user_api.get_user(self.ana["universal_id"]).name, "Ana")
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+        self.clock.now += response_cache.DEFAULT_TTLS["get_user"]
+        self.user_api.get_user(self.ana["universal_id"])
+
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_expired_responses_are_revalidated(self) -> None:
+        self.user_api.get_user(self.ana["universal_id"])
+        self.clock.now += 40
+
+        self.assertEqual(self.user_api.get_user(self.ana["universal_id"]).name, "Ana")
+        self.assertEqual(self.user_api.get_user(self.ana["universal_id"]).name, "Ana")
+
+        self.assertEqual(self.hub.calls["get_user"], 2)
+        self.assertEqual(self.hub.not_modified, 1)
+
+        self.clock.now += 100
+        self.user_api.get_user(self.ana["universal_id"])
+        self.assertEqual(self.hub.not_modified, 1)
+
+    def test_mutations_invalidate_the_affected_reads(self) -> None:
+        self.user_api.get_user(self.ana["universal_id"])
+        self.user_api.get_user(self.bob["universal_id"])
+
+        self.user_api.update_authority(self.bob["universal_id"], UserUpdateAuthorityRequest(authority="MODERATOR"))
+
+        self.assertEqual(self.user_api.get_user(self.bob["universal_id"]).authority, "MODERATOR")
+        self.user_api.get_user(self.ana["universal_id"])
+        self.assertEqual(self.hub.calls["get_user"], 3)
+
+    def test_unscoped_mutations_invalidate_every_scope(self) -> None:
+        self.cache.ttls["search_users"] = 60
+        project_id = self.ana["project_id"]
+        self.assertEqual(len(self.user_api.search_users(project_id, user_name="%")), 2)
+        self.user_api.search_users(project_id, user_name="%")
+
+        self.user_api.add_user(project_id, UserSignupRequest(user_id="cid", raw_signature="secret1", name="Cid"))
+        self.assertEqual(len(self.user_api.search_users(project_id, user_name="%")), 3)
+
+        self.user_api.update_authority(self.bob["universal_id"], UserUpdateAuthorityRequest(authority="MODERATOR"))
+        self.user_api.search_users(project_id, user_name="%")
+
+        self.assertEqual(self.hub.calls["search_users"], 3)
+
+    def test_credentials_are_part_of_the_key(self) -> None:
+        other_user_api = UserApi(self.make_api_client(self.cache, self.bob["universal_id"]))
+
+        self.user_api.get_user(self.ana["universal_id"])
+        other_user_api.get_user(self.ana["universal_id"])
+
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_decoded_responses_are_cached_without_their_coding(self) -> None:
+        self.hub.compression = True
+        self.user_api.get_user(self.ana["universal_id"])
+
+        response = self.user_api.get_user_with_http_info(self.ana["universal_id"])
+
+        self.assertEqual(self.hub.calls["get_user"], 1)
+        self.assertEqual(response.data.name, "Ana")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertNotIn("Content-Length", response.headers)
+
+    def test_failures_are_not_cached(self) -> None:
+        self.hub.fail_next(status=503, operation="get_user")
+        with self.assertRaises(ServiceException):
+            self.user_api.get_user(self.ana["universal_id"])
+
+        self.user_api.get_user(self.ana["universal_id"])
+        self.user_api.get_user(self.ana["universal_id"])
+
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_store_is_shared_between_caches(self) -> None:
+        other_api_client = self.make_api_client(self.make_cache())
+        other_api_client.configuration.access_token = self.user_api.api_client.configuration.access_token
+        other_user_api = UserApi(other_api_client)
+        self.user_api.get_user(self.bob["universal_id"])
+        other_user_api.get_user(self.bob["universal_id"])
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+        other_user_api.update_authority(self.bob["universal_id"], UserUpdateAuthorityRequest(authority="MODERATOR"))
+
+        self.assertEqual(self.user_api.get_user(self.bob["universal_id"]).authority, "MODERATOR")
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_copies_of_the_configuration_share_the_cache(self) -> None:
+        configuration = copy.deepcopy(self.user_api.api_client.configuration)
+
+        self.assertIs(configuration.response_cache, self.cache)
+
+    def test_async_reads_are_cached(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.user_api.api_client.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                first = await user_api.get_user(self.ana["universal_id"])
+                self.clock.now += 40
+                second = await user_api.get_user(self.ana["universal_id"])
+                third = await user_api.get_user(self.ana["universal_id"])
+                return [first.name, second.name, third.name]
+
+        self.assertEqual(asyncio.run(scenario()), ["Ana"] * 3)
+        self.assertEqual(self.hub.calls["get_user"], 2)
+        self.assertEqual(self.hub.not_modified, 1)
+
+    def test_in_memory_store_evicts_least_recently_used(self) -> None:
+        store = response_cache.InMemoryStore(max_entries=2, clock=self.clock)
+        store.set("a", 1, None)
+        store.set("b", 2, 10)
+        store.get("a")
+        store.set("c", 3, None)
+
+        self.assertEqual((store.get("a"), store.get("b"), store.get("c")), (1, None, 3))
+
+        store.set("b", 2, 10)
+        self.clock.now += 10
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(len(store), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import email.utils
+import time
+import unittest
+from unittest import mock
+
+import urllib3
+
+from appifyhub import retry
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.message_send_request import MessageSendRequest
+
+
+class TestRetry(unittest.TestCase):
+    """Retry policy unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.template = self.hub.add_template(project["project_id"], "welcome", "Hi {{user.name}}")
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.retry_policy = retry.RetryPolicy(backoff_base=0.001)
+        self.api_client = ApiClient(self.configuration)
+
+    def send_message(self, **kwargs):
+        return MessagingApi(self.api_client).send_message(
+            self.user["project_id"],
+            self.user["universal_id"],
+            MessageSendRequest(message_type="EMAIL", message_template_id=self.template["id"]),
+            **kwargs,
+        )
+
+    def test_idempotent_requests_are_retried(self) -> None:
+        self.hub.fail_next(status=503, count=2, operation="get_user")
+
+        user = UserApi(self.api_client).get_user(self.user["universal_id"])
+
+        self.assertEqual(user.name, "Ana")
+        self.assertEqual(self.hub.calls["get_user"], 3)
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        self.hub.fail_next(status=502, count=3, operation="get_user")
+
+        with self.assertRaises(ServiceException):
+            UserApi(self.api_client).get_user(self.user["universal_id"])
+        self.assertEqual(self.hub.calls["get_user"], 3)
+
+    def test_non_idempotent_requests_need_a_key(self) -> None:
+        self.hub.fail_next(status=503, operation="send_message")
+        with self.assertRaises(ServiceException):
+            self.send_message()
+        self.assertEqual(self.hub.calls["send_message"], 1)
+
+        self.hub.fail_next(status=503, operation="send_message")
+        self.send_message(_headers={"Idempotency-Key": "message-1"})
+        self.assertEqual(self.hub.calls["send_message"], 3)
+        self.assertEqual(len(self.hub.messages), 1)
+
+        self.hub.fail_next(status=503, operation="refresh")
+        with self.assertRaises(ServiceException):
+            AuthApi(self.api_client).refresh()
+        self.assertEqual(self.hub.calls["refresh"], 1)
+
+    def test_rejected_statuses_are_retried_for_any_method(self) -> None:
+        self.configuration.retry_policy = retry.RetryPolicy(backoff_base=0.001, rejected_statuses=(429, 503))
+        self.hub.fail_next(status=503, operation="send_message")
+        self.send_message()
+        self.assertEqual(self.hub.calls["send_message"], 2)
+
+        self.hub.fail_next(status=502, operation="send_message")
+        with self.assertRaises(ServiceException):
+            self.send_message()
+        self.assertEqual(self.hub.calls["send_message"], 3)
+
+    def test_retry_after_is_honored(self) -> None:
+        self.hub.fail_next(status=429, operation="get_user", retry_after=2)
+
+        with mock.patch("appifyhub.api_client.time.sleep") as sleep:
+            UserApi(self.api_client).get_user(self.user["universal_id"])
+
+        sleep.assert_called_once_with(2.0)
+
+        self.hub.fail_next(status=503, operation="get_user", retry_after=120)
+        with self.assertRaises(ServiceException):
+            UserApi(self.api_client).get_user(self.user["universal_id"])
+
+    def test_connection_failures_are_retried_for_any_method(self) -> None:
+        pool_manager = self.api_client.rest_client.pool_manager
+        send = pool_manager.request
+        failures = []
+
+        def request(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return send(*args, **kwargs)
+
+        with mock.patch.object(pool_manager, "request", side_effect=request) as patched:
+            failures.append(urllib3.exceptions.MaxRetryError(
+                pool_manager, "/", urllib3.exceptions.NewConnectionError(None, "Connection refused"),
+            ))
+            self.send_message()
+            self.assertEqual(patched.call_count, 2)
+
+            failures.append(urllib3.exceptions.ReadTimeoutError(pool_manager, "/", "Read timed out"))
+            with self.assertRaises(urllib3.exceptions.ReadTimeoutError):
+                self.send_message()
+            self.assertEqual(patched.call_count, 3)
+
+        self.assertEqual(len(self.hub.messages), 1)
+
+    def test_budget_limits_retries(self) -> None:
+        budget = retry.RetryBudget(ratio=0.5, min_per_second=0)
+        self.configuration.retry_policy = retry.RetryPolicy(backoff_base=0.001, budget=budget)
+        self.hub.fail_next(status=503, count=2, operation="get_user")
+
+        with self.assertRaises(ServiceException):
+            UserApi(self.api_client).get_user(self.user["universal_id"])
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+    def test_async_requests_are_retried(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                return await AsyncUserApi(api_client).get_user(self.user["universal_id"])
+
+        self.hub.fail_next(status=503, count=2, operation="get_user")
+
+        self.assertEqual(asyncio.run(scenario()).name, "Ana")
+        self.assertEqual(self.hub.calls["get_user"], 3)
+
+    def test_parse_retry_after(self) -> None:
+        in_a_minute = email.utils.formatdate(time.time() + 60, usegmt=True)
+
+        self.assertEqual(retry.parse_retry_after("3"), 3.0)
+        self.assertAlmostEqual(retry.parse_retry_after(in_a_minute), 60, delta=2)
+        self.assertIsNone(retry.parse_retry_after("soon"))
+        self.assertIsNone(retry.parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.single_flight import SingleFlight
+
+CONCURRENCY = 8
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Request coalescing unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(latency=0.2).start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.user["universal_id"])
+        self.configuration.coalesce_requests = True
+        self.api_client = ApiClient(self.configuration)
+
+    def concurrently(self, call):
+        barrier = threading.Barrier(CONCURRENCY)
+
+        def run(index):
+            barrier.wait()
+            try:
+                return call(index)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(CONCURRENCY) as pool:
+            return list(pool.map(run, range(CONCURRENCY)))
+
+    def get_user(self, api_client=None):
+        return UserApi(api_client or self.api_client).get_user(self.user["universal_id"])
+
+    def test_identical_reads_share_one_request(self) -> None:
+        users = self.concurrently(lambda _: self.get_user())
+
+        self.assertEqual([user.name for user in users], ["Ana"] * CONCURRENCY)
+        self.assertEqual(self.hub.calls["get_user"], 1)
+        self.assertEqual(self.api_client._single_flight.coalesced, CONCURRENCY - 1)
+
+        self.get_user()
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_failures_are_shared(self) -> None:
+        self.hub.fail_next(status=503, operation="get_user")
+
+        errors = self.concurrently(lambda _: self.get_user())
+
+        self.assertTrue(all(isinstance(e, ServiceException) for e in errors))
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+    def test_different_credentials_are_not_coalesced(self) -> None:
+        other = Configuration(host=self.hub.host)
+        other.access_token = self.hub.create_token(self.user["universal_id"])
+        other.coalesce_requests = True
+        api_clients = [self.api_client, ApiClient(other)]
+        api_clients[1]._single_flight = self.api_client._single_flight
+
+        self.concurrently(lambda index: self.get_user(api_clients[index % 2]))
+
+        self.assertEqual(self.hub.calls["get_user"], 2)
+
+    def test_writes_and_disabled_clients_are_not_coalesced(self) -> None:
+        self.concurrently(lambda _: AuthApi(self.api_client).refresh())
+        self.assertEqual(self.hub.calls["refresh"], CONCURRENCY)
+
+        self.configuration.coalesce_requests = False
+        self.concurrently(lambda _: self.get_user(ApiClient(self.configuration)))
+        self.assertEqual(self.hub.calls["get_user"], CONCURRENCY)
+
+    def test_async_tasks_share_one_request(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                return await asyncio.gather(*[
+                    user_api.get_user(self.user["universal_id"]) for _ in range(CONCURRENCY)
+                ])
+
+        users = asyncio.run(scenario())
+
+        self.assertEqual([user.name for user in users], ["Ana"] * CONCURRENCY)
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+    def test_cancelled_waiter_does_not_cancel_the_request(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                user_api = AsyncUserApi(api_client)
+                first = asyncio.ensure_future(user_api.get_user(self.user["universal_id"]))
+                second = asyncio.ensure_future(user_api.get_user(self.user["universal_id"]))
+                await asyncio.sleep(0.05)
+                first.cancel()
+                return await second
+
+        self.assertEqual(asyncio.run(scenario()).name, "Ana")
+        self.assertEqual(self.hub.calls["get_user"], 1)
+
+    def test_key_is_released_after_a_failure(self) -> None:
+        group = SingleFlight()
+
+        with self.assertRaises(ValueError):
+            group.do("key", lambda: int("x"))
+
+        self.assertEqual(group.do("key", lambda: 1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import copy
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from appifyhub.api.async_user_api import AsyncUserApi
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api.user_api import UserApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.token_manager import TokenManager
+
+CONCURRENCY = 8
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenManager(unittest.TestCase):
+    """Token refresh manager unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana")
+        self.token = self.hub.create_token(self.user["universal_id"])
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.token
+        self.api_client = ApiClient(self.configuration)
+        self.clock = FakeClock()
+        self.refreshed = threading.Event()
+        self.manager = TokenManager(
+            self.api_client, poll_interval=0.01, retry_interval=0.01, on_refresh=self.on_refresh, clock=self.clock,
+        )
+        self.addCleanup(self.manager.stop)
+
+    def on_refresh(self, response) -> None:
+        # the fake service issues tokens valid from the real time on
+        self.clock.now = time.time()
+        self.refreshed.set()
+
+    def get_user(self, api_client=None):
+        return UserApi(api_client or self.api_client).get_user(self.user["universal_id"])
+
+    def test_tracks_the_expiration_of_the_token(self) -> None:
+        self.assertEqual(self.manager.token_value, self.token)
+        self.assertAlmostEqual(self.manager.expires_at, time.time() + 86400, delta=5)
+
+        details = AuthApi(self.api_client).get_current_token()
+        self.manager.track(details.model_copy(update={"token_value": "opaque"}))
+
+        self.assertEqual(self.manager.token_value, "opaque")
+        self.assertAlmostEqual(self.manager.expires_at, time.time() + 86400, delta=5)
+
+    def test_refreshes_in_the_background_before_the_expiration(self) -> None:
+        self.manager.start()
+        self.get_user()
+        self.assertFalse(self.refreshed.wait(0.1))
+
+        self.clock.now = self.manager.expires_at - self.manager.refresh_before
+
+        self.assertTrue(self.refreshed.wait(5))
+        self.assertNotEqual(self.manager.token_value, self.token)
+        self.assertEqual(self.get_user().name, "Ana")
+        self.assertEqual(self.configuration.access_token, self.manager.token_value)
+        self.assertEqual((self.manager.refreshes, self.hub.calls["refresh"]), (1, 1))
+
+    def test_concurrent_requests_share_one_late_refresh(self) -> None:
+        self.clock.now = self.manager.expires_at - self.manager.min_validity + 1
+        barrier = threading.Barrier(CONCURRENCY)
+
+        def run(_):
+            barrier.wait()
+            return self.get_user(ApiClient(self.configuration)).name
+
+        with ThreadPoolExecutor(CONCURRENCY) as pool:
+            names = list(pool.map(run, range(CONCURRENCY)))
+
+        self.assertEqual(names, ["Ana"] * CONCURRENCY)
+        self.assertEqual(self.hub.calls["refresh"], 1)
+        self.assertTrue(self.hub.tokens[self.token]["is_blocked"])
+
+    def test_copied_configurations_and_async_clients_use_the_new_token(self) -> None:
+        copied = copy.deepcopy(self.configuration)
+        self.manager.refresh()
+
+        self.assertEqual(self.get_user(ApiClient(copied)).name, "Ana")
+
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                return await AsyncUserApi(api_client).get_user(self.user["universal_id"])
+
+        self.assertEqual(asyncio.run(scenario()).name, "Ana")
+
+    def test_the_hook_runs_once_per_request(self) -> None:
+        calls = []
+        manager = self.configuration.refresh_api_key_hook
+
+        def hook(configuration):
+            calls.append(configuration)
+            manager(configuration)
+
+        self.configuration.refresh_api_key_hook = hook
+        api_client = ApiClient(self.configuration)
+        self.get_user(api_client)
+        self.get_user(api_client)
+
+        self.assertEqual(len(calls), 2)
+
+    def test_async_requests_leave_late_refreshes_to_the_thread(self) -> None:
+        self.clock.now = self.manager.expires_at - self.manager.min_validity + 1
+
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                return await AsyncUserApi(api_client).get_user(self.user["universal_id"])
+
+        self.assertEqual(asyncio.run(scenario()).name, "Ana")
+        self.assertEqual(self.hub.calls["refresh"], 0)
+
+        self.manager.start()
+        self.assertTrue(self.refreshed.wait(5))
+
+    def test_rejects_async_clients(self) -> None:
+        with self.assertRaises(TypeError):
+            TokenManager(AsyncApiClient(self.configuration))
+
+    def test_failed_refreshes_are_retried(self) -> None:
+        errors = []
+        self.manager.on_error = errors.append
+        self.hub.fail_next(status=503, operation="refresh")
+        self.clock.now = self.manager.expires_at
+
+        with self.manager:
+            self.assertTrue(self.refreshed.wait(5))
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ServiceException)
+        self.assertEqual(self.hub.calls["refresh"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
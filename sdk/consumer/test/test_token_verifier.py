@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import json
+import time
+import unittest
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from appifyhub import fake_server
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import TokenVerificationError
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.token_verifier import SigningKeys, TokenVerifier
+
+SIGNING_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PUBLIC_KEY_PEM = SIGNING_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM,
+    serialization.PublicFormat.SubjectPublicKeyInfo,
+).decode("ascii")
+
+
+class FakeClock:
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_token(subject: str, claims: dict, created_at: int) -> str:
+    """Signs a token the way the service's JwtHelper does: RS256, with string custom claims."""
+    payload = {key: str(value) for key, value in claims.items()}
+    payload.update(sub=subject, iat=created_at, exp=created_at + 86400)
+    signing_input = "%s.%s" % (
+        b64url(b'{"typ":"JWT","alg":"RS256"}'),
+        b64url(json.dumps(payload).encode("utf-8")),
+    )
+    signature = SIGNING_KEY.sign(
+        signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256(),
+    )
+    return signing_input + "." + b64url(signature)
+
+
+def replace_claims(token_value: str, **claims) -> str:
+    header, payload, signature = token_value.split(".")
+    decoded = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    decoded.update(claims)
+    payload = b64url(json.dumps(decoded).encode())
+    return ".".join([header, payload, signature])
+
+
+class TestTokenVerifier(unittest.TestCase):
+    """Local token verification unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        project = self.hub.add_project("Calculator")
+        self.user = self.hub.add_user(project["project_id"], "ana", name="Ana", authority="ADMIN")
+        self.configuration = Configuration(host=self.hub.host)
+        self.api_client = ApiClient(self.configuration)
+        self.clock = FakeClock(time.time())
+        self.token = sign_token(self.user["universal_id"], {
+            "user_id": "ana",
+            "project_id": self.user["project_id"],
+            "universal_id": self.user["universal_id"],
+            "authorities": "DEFAULT,MODERATOR,ADMIN",
+            "origin": "web",
+            "ip_address": "127.0.0.1",
+            "is_static": "false",
+        }, int(self.clock.now))
+        # tokens of the fake service, which knows whether they are blocked
+        self.hub_token = self.hub.create_token(self.user["universal_id"], origin="web")
+        self.verifier = TokenVerifier(
+            [PUBLIC_KEY_PEM, fake_server.public_key_pem()], self.api_client, clock=self.clock,
+        )
+
+    def test_decodes_the_token_details(self) -> None:
+        details = self.verifier.decode(self.token)
+
+        self.assertEqual(details.universal_id, self.user["universal_id"])
+        self.assertEqual(details.user_id, "ana")
+        self.assertEqual(details.project_id, self.user["project_id"])
+        self.assertEqual(details.authority, "ADMIN")
+        self.assertEqual(details.origin, "web")
+        self.assertFalse(details.is_static)
+        self.assertFalse(details.is_blocked)
+        self.assertEqual(self.hub.calls["get_current_token"], 0)
+
+    def test_rejects_tampered_tokens(self) -> None:
+        tampered = replace_claims(self.token, authorities="DEFAULT,MODERATOR,ADMIN,OWNER")
+
+        with self.assertRaisesRegex(TokenVerificationError, "signature"):
+            self.verifier.decode(tampered)
+        with self.assertRaisesRegex(TokenVerificationError, "Malformed"):
+            self.verifier.decode("not-a-token")
+
+    def test_rejects_other_algorithms(self) -> None:
+        header = b64url(b'{"alg":"none"}')
+        unsigned = ".".join([header, self.token.split(".")[1], ""])
+
+        with self.assertRaisesRegex(TokenVerificationError, "algorithm"):
+            self.verifier.decode(unsigned)
+
+    def test_rejects_expired_tokens(self) -> None:
+        self.clock.now += 86400
+
+        with self.assertRaisesRegex(TokenVerificationError, "expired"):
+            self.verifier.decode(self.token)
+
+        self.verifier.leeway = 60
+        self.verifier.decode(self.token)
+
+    def test_rotated_keys_are_reloaded(self) -> None:
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=1024).public_key()
+        loaded = [[other_key], [PUBLIC_KEY_PEM]]
+        keys = SigningKeys(loader=lambda: loaded.pop(0), min_refresh_interval=0)
+
+        TokenVerifier(keys, check_blocked=False).verify(self.token)
+
+        self.assertEqual(loaded, [])
+
+    def test_blocked_tokens_are_rejected_after_the_cache_expires(self) -> None:
+        self.verifier.verify(self.hub_token)
+        self.verifier.verify(self.hub_token)
+        self.assertEqual(self.hub.calls["get_current_token"], 1)
+
+        self.configuration.access_token = self.hub_token
+        AuthApi(self.api_client).refresh()
+        self.verifier.verify(self.hub_token)
+
+        self.clock.now += self.verifier.blocked_ttl
+        with self.assertRaisesRegex(TokenVerificationError, "blocked"):
+            self.verifier.verify(self.hub_token)
+        with self.assertRaisesRegex(TokenVerificationError, "blocked"):
+            self.verifier.verify(self.hub_token)
+        self.assertEqual(self.hub.calls["get_current_token"], 2)
+
+    def test_async_verification(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(Configuration(host=self.hub.host)) as api_client:
+                verifier = TokenVerifier([fake_server.public_key_pem()], api_client)
+                return await verifier.verify_async(self.hub_token)
+
+        self.assertEqual(asyncio.run(scenario()).universal_id, self.user["universal_id"])
+        self.assertEqual(self.hub.calls["get_current_token"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ApiException
+from appifyhub.fake_server import FakeAppifyHub
+from appifyhub.models.user_signup_request import UserSignupRequest
+from appifyhub.retry import RetryPolicy
+from appifyhub.user_import import import_users, users_from_csv, users_from_jsonl
+
+
+class TestUserImport(unittest.TestCase):
+    """Bulk user import unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(latency=0.005).start()
+        self.addCleanup(self.hub.stop)
+        self.project = self.hub.add_project("Calculator")
+        admin = self.hub.add_user(self.project["project_id"], "admin")
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(admin["universal_id"])
+        self.api_client = ApiClient(configuration)
+        self.retry_policy = RetryPolicy(max_attempts=3, backoff_base=0.001, rejected_statuses=(429, 503), budget=None)
+
+    def import_users(self, records, **kwargs):
+        kwargs.setdefault("retry_policy", self.retry_policy)
+        results = import_users(self.api_client, self.project["project_id"], records, concurrency=4, **kwargs)
+        return sorted(results, key=lambda result: result.index)
+
+    def write(self, content: str) -> str:
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as file:
+            file.write(content)
+        return path
+
+    def test_imports_a_stream_of_users(self) -> None:
+        records = (
+            UserSignupRequest(user_id="user%d" % index, raw_signature="secret1", name="User %d" % index)
+            for index in range(50)
+        )
+
+        results = self.import_users(records)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(results[7].value.universal_id, "user7$%d" % self.project["project_id"])
+        self.assertEqual(self.hub.calls["add_user"], 50)
+
+    def test_reports_failed_records_and_continues(self) -> None:
+        self.hub.add_user(self.project["project_id"], "taken")
+        records = [
+            {"user_id": "ana", "raw_signature": "secret1"},
+            {"user_id": "taken", "raw_signature": "secret1"},
+            {"user_id": "bob"},
+            '{"user_id": "cid", "raw_signature": "secret1"}',
+        ]
+
+        results = self.import_users(records)
+
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, ApiException)
+        self.assertEqual(results[1].error.status, 409)
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertEqual(self.hub.calls["add_user"], 3)
+
+    def test_retries_transient_failures(self) -> None:
+        self.hub.fail_next(status=503, count=2, operation="add_user")
+
+        results = self.import_users([{"user_id": "ana", "raw_signature": "secret1"}])
+
+        self.assertEqual((results[0].ok, results[0].attempts), (True, 3))
+
+    def test_imports_csv_and_jsonl_files(self) -> None:
+        csv_path = self.write("user_id,raw_signature,allows_spam,company.name\nana,secret1,true,Acme\n")
+        jsonl_path = self.write('{"user_id": "bob", "raw_signature": "secret1"}\n{"user_id": \n')
+
+        csv_results = self.import_users(users_from_csv(csv_path))
+        jsonl_results = self.import_users(users_from_jsonl(jsonl_path))
+
+        self.assertEqual(csv_results[0].value.company.name, "Acme")
+        self.assertTrue(csv_results[0].value.allows_spam)
+        self.assertEqual([result.ok for result in jsonl_results], [True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
 # flake8: noqa
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -15,48 +15,123 @@
 """  # noqa: E501
 
 
-__version__ = "1.2.1"
-
-# import apis into sdk package
-from appifyhub.api.auth_api import AuthApi
-from appifyhub.api.messaging_api import MessagingApi
-from appifyhub.api.projects_api import ProjectsApi
-from appifyhub.api.users_api import UsersApi
-
-# import ApiClient
-from appifyhub.api_response import ApiResponse
-from appifyhub.api_client import ApiClient
-from appifyhub.configuration import Configuration
-from appifyhub.exceptions import OpenApiException
-from appifyhub.exceptions import ApiTypeError
-from appifyhub.exceptions import ApiValueError
-from appifyhub.exceptions import ApiKeyError
-from appifyhub.exceptions import ApiAttributeError
-from appifyhub.exceptions import ApiException
-
-# import models into sdk package
-from appifyhub.models.api_key_request import ApiKeyRequest
-from appifyhub.models.creator_credentials_request import CreatorCredentialsRequest
-from appifyhub.models.creator_response import CreatorResponse
-from appifyhub.models.creator_signup_request import CreatorSignupRequest
-from appifyhub.models.detect_variables_request import DetectVariablesRequest
-from appifyhub.models.firebase_config_dto import FirebaseConfigDto
-from appifyhub.models.mailgun_config_dto import MailgunConfigDto
-from appifyhub.models.message_inputs_request import MessageInputsRequest
-from appifyhub.models.message_response import MessageResponse
-from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
-from appifyhub.models.message_template_response import MessageTemplateResponse
-from appifyhub.models.message_template_update_request import MessageTemplateUpdateRequest
-from appifyhub.models.organization_dto import OrganizationDto
-from appifyhub.models.project_create_request import ProjectCreateRequest
-from appifyhub.models.project_feature_response import ProjectFeatureResponse
-from appifyhub.models.project_response import ProjectResponse
-from appifyhub.models.project_state_response import ProjectStateResponse
-from appifyhub.models.project_type import ProjectType
-from appifyhub.models.project_update_request import ProjectUpdateRequest
-from appifyhub.models.project_user_id_type import ProjectUserIDType
-from appifyhub.models.settable_request import SettableRequest
-from appifyhub.models.simple_response import SimpleResponse
-from appifyhub.models.token_response import TokenResponse
-from appifyhub.models.twilio_config_dto import TwilioConfigDto
-from appifyhub.models.variable_response import VariableResponse
+__version__ = "1.2.4"
+
+import importlib
+from typing import TYPE_CHECKING
+
+# public names, resolved on first attribute access (see `__getattr__`)
+_LAZY_IMPORTS = {
+    'AuthApi': 'appifyhub.api.auth_api',
+    'MessagingApi': 'appifyhub.api.messaging_api',
+    'ProjectsApi': 'appifyhub.api.projects_api',
+    'UsersApi': 'appifyhub.api.users_api',
+    'ApiResponse': 'appifyhub.api_response',
+    'ApiClient': 'appifyhub.api_client',
+    'Configuration': 'appifyhub.configuration',
+    'OpenApiException': 'appifyhub.exceptions',
+    'ApiTypeError': 'appifyhub.exceptions',
+    'ApiValueError': 'appifyhub.exceptions',
+    'ApiKeyError': 'appifyhub.exceptions',
+    'ApiAttributeError': 'appifyhub.exceptions',
+    'ApiException': 'appifyhub.exceptions',
+    'ApiKeyRequest': 'appifyhub.models.api_key_request',
+    'CreatorCredentialsRequest': 'appifyhub.models.creator_credentials_request',
+    'CreatorResponse': 'appifyhub.models.creator_response',
+    'CreatorSignupRequest': 'appifyhub.models.creator_signup_request',
+    'DetectVariablesRequest': 'appifyhub.models.detect_variables_request',
+    'FirebaseConfigDto': 'appifyhub.models.firebase_config_dto',
+    'MailgunConfigDto': 'appifyhub.models.mailgun_config_dto',
+    'MessageInputsRequest': 'appifyhub.models.message_inputs_request',
+    'MessageResponse': 'appifyhub.models.message_response',
+    'MessageTemplateCreateRequest': 'appifyhub.models.message_template_create_request',
+    'MessageTemplateResponse': 'appifyhub.models.message_template_response',
+    'MessageTemplateUpdateRequest': 'appifyhub.models.message_template_update_request',
+    'OrganizationDto': 'appifyhub.models.organization_dto',
+    'ProjectCreateRequest': 'appifyhub.models.project_create_request',
+    'ProjectFeatureResponse': 'appifyhub.models.project_feature_response',
+    'ProjectResponse': 'appifyhub.models.project_response',
+    'ProjectStateResponse': 'appifyhub.models.project_state_response',
+    'ProjectType': 'appifyhub.models.project_type',
+    'ProjectUpdateRequest': 'appifyhub.models.project_update_request',
+    'ProjectUserIDType': 'appifyhub.models.project_user_id_type',
+    'SettableRequest': 'appifyhub.models.settable_request',
+    'SimpleResponse': 'appifyhub.models.simple_response',
+    'TokenResponse': 'appifyhub.models.token_response',
+    'TwilioConfigDto': 'appifyhub.models.twilio_config_dto',
+    'VariableResponse': 'appifyhub.models.variable_response',
+    'AsyncApiClient': 'appifyhub.async_api_client',
+    'AsyncAuthApi': 'appifyhub.api.async_auth_api',
+    'AsyncMessagingApi': 'appifyhub.api.async_messaging_api',
+    'AsyncProjectsApi': 'appifyhub.api.async_projects_api',
+    'AsyncUsersApi': 'appifyhub.api.async_users_api',
+}
+
+# the asyncio classes need the optional aiohttp dependency, so star
+# imports leave them out
+__all__ = [name for name in _LAZY_IMPORTS if not name.startswith("Async")]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        # keep `appifyhub.<submodule>` working without importing it upfront
+        try:
+            return importlib.import_module("appifyhub." + name)
+        except ModuleNotFoundError as e:
+            if e.name != "appifyhub." + name:
+                raise
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+if TYPE_CHECKING:
+    from appifyhub.api.auth_api import AuthApi
+    from appifyhub.api.messaging_api import MessagingApi
+    from appifyhub.api.projects_api import ProjectsApi
+    from appifyhub.api.users_api import UsersApi
+    from appifyhub.api_response import ApiResponse
+    from appifyhub.api_client import ApiClient
+    from appifyhub.configuration import Configuration
+    from appifyhub.exceptions import OpenApiException
+    from appifyhub.exceptions import ApiTypeError
+    from appifyhub.exceptions import ApiValueError
+    from appifyhub.exceptions import ApiKeyError
+    from appifyhub.exceptions import ApiAttributeError
+    from appifyhub.exceptions import ApiException
+    from appifyhub.models.api_key_request import ApiKeyRequest
+    from appifyhub.models.creator_credentials_request import CreatorCredentialsRequest
+    from appifyhub.models.creator_response import CreatorResponse
+    from appifyhub.models.creator_signup_request import CreatorSignupRequest
+    from appifyhub.models.detect_variables_request import DetectVariablesRequest
+    from appifyhub.models.firebase_config_dto import FirebaseConfigDto
+    from appifyhub.models.mailgun_config_dto import MailgunConfigDto
+    from appifyhub.models.message_inputs_request import MessageInputsRequest
+    from appifyhub.models.message_response import MessageResponse
+    from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
+    from appifyhub.models.message_template_response import MessageTemplateResponse
+    from appifyhub.models.message_template_update_request import MessageTemplateUpdateRequest
+    from appifyhub.models.organization_dto import OrganizationDto
+    from appifyhub.models.project_create_request import ProjectCreateRequest
+    from appifyhub.models.project_feature_response import ProjectFeatureResponse
+    from appifyhub.models.project_response import ProjectResponse
+    from appifyhub.models.project_state_response import ProjectStateResponse
+    from appifyhub.models.project_type import ProjectType
+    from appifyhub.models.project_update_request import ProjectUpdateRequest
+    from appifyhub.models.project_user_id_type import ProjectUserIDType
+    from appifyhub.models.settable_request import SettableRequest
+    from appifyhub.models.simple_response import SimpleResponse
+    from appifyhub.models.token_response import TokenResponse
+    from appifyhub.models.twilio_config_dto import TwilioConfigDto
+    from appifyhub.models.variable_response import VariableResponse
+    from appifyhub.async_api_client import AsyncApiClient
+    from appifyhub.api.async_auth_api import AsyncAuthApi
+    from appifyhub.api.async_messaging_api import AsyncMessagingApi
+    from appifyhub.api.async_projects_api import AsyncProjectsApi
+    from appifyhub.api.async_users_api import AsyncUsersApi
@@ -1,8 +1,44 @@
 # flake8: noqa
 
-# import apis into api package
-from appifyhub.api.auth_api import AuthApi
-from appifyhub.api.messaging_api import MessagingApi
-from appifyhub.api.projects_api import ProjectsApi
-from appifyhub.api.users_api import UsersApi
+import importlib
+from typing import TYPE_CHECKING
 
+# public names, resolved on first attribute access (see `__getattr__`)
+_LAZY_IMPORTS = {
+    'AuthApi': 'appifyhub.api.auth_api',
+    'MessagingApi': 'appifyhub.api.messaging_api',
+    'ProjectsApi': 'appifyhub.api.projects_api',
+    'UsersApi': 'appifyhub.api.users_api',
+    'AsyncAuthApi': 'appifyhub.api.async_auth_api',
+    'AsyncMessagingApi': 'appifyhub.api.async_messaging_api',
+    'AsyncProjectsApi': 'appifyhub.api.async_projects_api',
+    'AsyncUsersApi': 'appifyhub.api.async_users_api',
+}
+
+# the asyncio classes need the optional aiohttp dependency, so star
+# imports leave them out
+__all__ = [name for name in _LAZY_IMPORTS if not name.startswith("Async")]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+if TYPE_CHECKING:
+    from appifyhub.api.auth_api import AuthApi
+    from appifyhub.api.messaging_api import MessagingApi
+    from appifyhub.api.projects_api import ProjectsApi
+    from appifyhub.api.users_api import UsersApi
+    from appifyhub.api.async_auth_api import AsyncAuthApi
+    from appifyhub.api.async_messaging_api import AsyncMessagingApi
+    from appifyhub.api.async_projects_api import AsyncProjectsApi
+    from appifyhub.api.async_users_api import AsyncUsersApi
@@ -0,0 +1,229 @@
+import asyncio
+import time
+
+from appifyhub.api_client import ApiClient
+from appifyhub import async_rest
+from appifyhub import response_cache
+from appifyhub import single_flight
+from appifyhub.exceptions import ApiException
+
+
+class AsyncApiClient(ApiClient):
+    """Asyncio API client for OpenAPI client library builds.
+
+    Request serialization and response deserialization are shared with
+    `ApiClient`; only the transport differs. Requests go through an
+    `AsyncRESTClientObject`, so `call_api` and `RESTResponse.read` must be
+    awaited. Close the client (or use it as an async context manager) to
+    release the pooled connections.
+
+    :param configuration: .Configuration object for this client
+    :param header_name: a header to pass when making calls to the API.
+    :param header_value: a header value to pass when making calls to
+        the API.
+    :param cookie: a cookie to include in the header when making calls
+        to the API
+    """
+
+    _default = None
+
+    def _create_rest_client(self, configuration):
+        if configuration.http2:
+            from appifyhub.http2_rest import AsyncHTTP2RESTClientObject
+            return AsyncHTTP2RESTClientObject(configuration)
+        return async_rest.AsyncRESTClientObject(configuration)
+
+    def _create_single_flight(self):
+        return single_flight.AsyncSingleFlight()
+
+    def _cached_response(self, entry):
+        response_data = async_rest.AsyncRESTResponse(response_cache.CachedHttpResponse(entry))
+        response_data.data = entry['data']
+        return response_data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the transport and its pooled connections."""
+        await self.rest_client.close()
+
+    @classmethod
+    def get_default(cls):
+        """Return new instance of AsyncApiClient.
+
+        This method returns newly created, based on default constructor,
+        object of AsyncApiClient class or returns a copy of default
+        AsyncApiClient.
+
+        :return: The AsyncApiClient object.
+        """
+        if cls._default is None:
+            cls._default = AsyncApiClient()
+        return cls._default
+
+    @classmethod
+    def set_default(cls, default):
+        """Set default instance of AsyncApiClient.
+
+        It stores default AsyncApiClient.
+
+        :param default: object of AsyncApiClient.
+        """
+        cls._default = default
+
+    # the coroutine counterpart of `ApiClient.call_api`, awaited by the asyncio APIs
+    async def call_api(  # type: ignore[override]
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ) -> async_rest.AsyncRESTResponse:
+        """Makes the HTTP request (asynchronous)
+        :param method: Method to call.
+        :param url: Path to method endpoint.
+        :param header_params: Header parameters to be
+            placed in the request header.
+        :param body: Request body.
+        :param post_params dict: Request post form parameters,
+            for `application/x-www-form-urlencoded`, `multipart/form-data`.
+        :param _request_timeout: timeout setting for this request.
+        :return: AsyncRESTResponse
+        """
+
+        trace = getattr(url, 'trace', None)
+        if trace is None:
+            return await self._call_api_cached(
+                method, url, header_params, body, post_params, _request_timeout
+            )
+
+        started = time.perf_counter()
+        try:
+            response_data = await self._call_api_cached(
+                method, url, header_params, body, post_params, _request_timeout
+            )
+        except BaseException as e:
+            trace.tracer.call_ended(trace, started, None)
+            trace.tracer.finish(trace, error=e)
+            raise
+        trace.tracer.call_ended(trace, started, response_data)
+        return response_data
+
+    async def _call_api_cached(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ):
+        """Performs the request, consulting the response cache and coalescing identical reads."""
+
+        cache = self.configuration.response_cache
+        lookup = None
+        if cache is not None:
+            lookup = cache.lookup(method, url, header_params)
+            if lookup is not None:
+                if lookup.fresh:
+                    return self._cached_response(lookup.entry)
+                header_params = lookup.headers
+
+        try:
+            if method == 'GET' and self.coalesce_requests:
+                async def call():
+                    response_data = await self._call_api(
+                        method, url, header_params, body, post_params, _request_timeout
+                    )
+                    await response_data.read()
+                    return response_data
+                key = single_flight.request_key(method, url, header_params)
+                response_data = await self._single_flight.do(key, call)
+            else:
+                response_data = await self._call_api(
+                    method, url, header_params, body, post_params, _request_timeout
+                )
+        finally:
+            # a failed mutation may still have been applied
+            if cache is not None and lookup is None:
+                cache.invalidate(method, url)
+
+        if lookup is not None:
+            await response_data.read()
+            entry = cache.complete(lookup, response_data)
+            if entry is not None:
+                return self._cached_response(entry)
+        return response_data
+
+    async def _call_api(self, method, url, header_params, body, post_params, _request_timeout):
+        """Performs the request, consulting the circuit breaker and the retry policy."""
+
+        policy = self.configuration.retry_policy
+        if policy is not None:
+            policy.record_request()
+        breaker = self.configuration.circuit_breaker
+        circuit = None
+        metrics = self.configuration.metrics
+        trace = getattr(url, 'trace', None)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                circuit = breaker.acquire(method, getattr(url, 'resource_path', None) or url)
+            started = 0.0
+            try:
+                headers = header_params
+                if policy is not None or trace is not None:
+                    headers = dict(header_params or {})
+                if trace is not None:
+                    # added per attempt, after the cache and coalescing keys were computed
+                    trace.tracer.inject(trace, headers)
+                if metrics is not None:
+                    started = time.perf_counter()
+                # perform request and return response
+                response_data = await self.rest_client.request(
+                    method, url,
+                    headers=headers,
+                    body=body, post_params=post_params,
+                    _request_timeout=_request_timeout
+                )
+
+            except ApiException as e:
+                if circuit is not None:
+                    circuit.record(None)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, None, started)
+                raise e
+
+            except Exception as e:
+                if circuit is not None:
+                    # only transport failures count against the endpoint; errors
+                    # such as invalid arguments never reached it
+                    circuit.record(True if self.rest_client.classify_error(e) else None)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, None, started)
+                delay = self._retry_delay(policy, attempt, method, url, header_params, error=e)
+                if delay is None:
+                    raise
+
+            except BaseException:
+                if circuit is not None:
+                    # cancelled or interrupted; releases a half-open probe
+                    # without judging the endpoint
+                    circuit.record(None)
+                raise
+
+            else:
+                if circuit is not None:
+                    circuit.record_response(response_data)
+                if metrics is not None:
+                    self._record_attempt(metrics, url, response_data, started)
+                delay = self._retry_delay(
+                    policy, attempt, method, url, header_params, response=response_data
+                )
+                if delay is None:
+                    return response_data
+                await response_data.read()
+
+            await asyncio.sleep(delay)
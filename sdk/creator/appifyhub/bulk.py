@@ -0,0 +1,337 @@
+import contextlib
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, TextIO, Tuple, Union
+
+from appifyhub.exceptions import ApiException
+from appifyhub.retry import RetryPolicy
+
+Source = Union[str, 'os.PathLike[str]', TextIO]
+
+
+class RateLimiter:
+    """Thread-safe limit of how many calls start per second.
+
+    Callers are spaced `1 / rate` seconds apart, letting up to `burst`
+    calls through at once after a quiet period.
+
+    :param rate: calls per second.
+    :param burst: calls allowed at once, 1 by default.
+    :param clock: monotonic time source, in seconds.
+    :param sleep: waits the given seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._interval = 1.0 / rate
+        self._next_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Waits until the caller may start a call."""
+        delay = self.reserve()
+        if delay > 0:
+            self.sleep(delay)
+
+    def reserve(self) -> float:
+        """Reserves the next free slot, returning the seconds until it starts."""
+        with self._lock:
+            now = self.clock()
+            # `_next_at` is when the bucket is empty again; it may run
+            # `burst - 1` intervals ahead of the clock
+            next_at = max(self._next_at, now)
+            start_at = max(now, next_at - (self.burst - 1) * self._interval)
+            self._next_at = next_at + self._interval
+            return start_at - now
+
+
+class BulkResult:
+    """Outcome of one item of a bulk run."""
+
+    __slots__ = ('index', 'item', 'value', 'error', 'attempts')
+
+    def __init__(self, index: int, item: Any, value: Any = None, error: Optional[Exception] = None,
+                 attempts: int = 1) -> None:
+        self.index = index
+        """Position of the item in the input"""
+        self.item = item
+        """The input item"""
+        self.value = value
+        """Return value of the call, if it succeeded"""
+        self.error = error
+        """Exception of the last attempt, if it failed"""
+        self.attempts = attempts
+        """Number of calls made for the item"""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return 'BulkResult(index=%d, ok=%s, attempts=%d)' % (self.index, self.ok, self.attempts)
+
+
+class BulkProgress:
+    """Counts of a bulk run, updated as its results come in."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.started_at = clock()
+        self.submitted = 0
+        """Items read from the input so far"""
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        """Calls repeated after a failure"""
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def in_flight(self) -> int:
+        """Items read but not completed yet."""
+        return self.submitted - self.completed
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items completed per second."""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def record(self, result: BulkResult) -> None:
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.retries += result.attempts - 1
+
+    def __repr__(self) -> str:
+        return 'BulkProgress(completed=%d, succeeded=%d, failed=%d, in_flight=%d, %.1f/s)' % (
+            self.completed, self.succeeded, self.failed, self.in_flight, self.throughput)
+
+
+class BulkRunner:
+    """Calls an operation for every item of a stream, many calls at a time.
+
+    Items are read from the input only as results are consumed, at most
+    `max_pending` ahead, so memory use does not grow with the input and a
+    slow consumer slows down the calls. Results are yielded in completion
+    order; `BulkResult.index` tells which item they belong to.
+
+    Failed calls are retried when the retry policy allows it. The calls are
+    treated as not idempotent, so the default policy only retries those the
+    server did not act on: connection failures and 429 and 503 responses.
+
+    :param api_client: ApiClient the calls are made with. The worker
+                       threads share its connection pool.
+    :param concurrency: calls in flight at most. Defaults to the
+                        configuration's `connection_pool_maxsize`.
+    :param rate: calls started per second at most, unlimited when None.
+                 Retries count against the rate too.
+    :param retry_policy: RetryPolicy applied to each item, on top of the
+                         client's own. A policy making 5 attempts by
+                         default; pass `RetryPolicy(max_attempts=1)` to
+                         not retry.
+    :param max_pending: items read ahead at most, twice the concurrency by
+                        default.
+    :param on_progress: called with the run's BulkProgress after each
+                        result, from the thread consuming the results.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_pending: Optional[int] = None,
+        on_progress: Optional[Callable[[BulkProgress], None]] = None,
+    ) -> None:
+        self.api_client = api_client
+        self.concurrency = concurrency or api_client.configuration.connection_pool_maxsize
+        self.rate_limiter = None if rate is None else RateLimiter(rate)
+        if retry_policy is None:
+            retry_policy = RetryPolicy(
+                max_attempts=5, retry_statuses=(429, 503), rejected_statuses=(429, 503),
+            )
+        self.retry_policy = retry_policy
+        self.max_pending = max_pending or 2 * self.concurrency
+        self.on_progress = on_progress
+        self.progress: Optional[BulkProgress] = None
+        """Progress of the latest run"""
+
+    def run(self, call: Callable[[Any], Any], items: Iterable[Any]) -> Iterator[BulkResult]:
+        """Calls `call(item)` for every item, yielding their results as they complete.
+
+        :param call: makes the call for an item.
+        :param items: the input items.
+        """
+        entries = enumerate(items)
+        pending: Set['Future[BulkResult]'] = set()
+        progress = self.progress = BulkProgress()
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='appifyhub-bulk') as pool:
+            try:
+                while True:
+                    while len(pending) < self.max_pending:
+                        entry: Optional[Tuple[int, Any]] = next(entries, None)
+                        if entry is None:
+                            break
+                        pending.add(pool.submit(self._call, call, *entry))
+                        progress.submitted += 1
+                    if not pending:
+                        return
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        progress.record(result)
+                        if self.on_progress is not None:
+                            self.on_progress(progress)
+                        yield result
+            finally:
+                # the consumer stopped early; calls already running still finish
+                for future in pending:
+                    future.cancel()
+
+    def _call(self, call: Callable[[Any], Any], index: int, item: Any) -> BulkResult:
+        self.retry_policy.record_request()
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return BulkResult(index, item, value=call(item), attempts=attempt)
+            except Exception as e:
+                delay = error_retry_delay(
+                    self.retry_policy, self.api_client, attempt, 'POST', None, {}, e,
+                )
+                if delay is None:
+                    return BulkResult(index, item, error=e, attempts=attempt)
+            time.sleep(delay)
+
+
+def error_retry_delay(
+    policy: RetryPolicy,
+    api_client,
+    attempt: int,
+    method: str,
+    operation: Optional[str],
+    headers: Dict[str, str],
+    error: Exception,
+) -> Optional[float]:
+    """Asks a retry policy about a call that raised, returning the delay before retrying or None.
+
+    :param policy: the RetryPolicy.
+    :param api_client: ApiClient the call was made with, classifying transport errors.
+    :param attempt: number of attempts made so far.
+    :param method: HTTP method of the call.
+    :param operation: name of the API operation, if known.
+    :param headers: headers the call was sent with.
+    :param error: the exception the call raised.
+    """
+    if isinstance(error, ApiException):
+        if not error.status:
+            return None
+        return policy.retry_delay(
+            attempt, method, operation, headers, response=_ErrorResponse(error),
+        )
+    error_kind = api_client.rest_client.classify_error(error)
+    if error_kind is None:
+        return None
+    return policy.retry_delay(attempt, method, operation, headers, error_kind=error_kind)
+
+
+class _ErrorResponse:
+    """Presents the response of an ApiException to the retry policy."""
+
+    def __init__(self, error: ApiException) -> None:
+        self.status = error.status
+        self.headers = error.headers or {}
+
+    def getheader(self, name: str, default=None):
+        return self.headers.get(name, default)
+
+
+def read_csv(
+    source: Source, converters: Optional[Dict[str, Callable[[str], Any]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Streams the rows of a CSV file with a header row as dicts.
+
+    Empty cells are left out, and columns named like `company.name` fill
+    nested dicts.
+
+    :param source: path of the file, or a file opened in text mode.
+    :param converters: functions converting the cells of the named columns.
+    """
+    converters = converters or {}
+    with _open(source) as lines:
+        for row in csv.DictReader(lines):
+            record: Dict[str, Any] = {}
+            for column, value in row.items():
+                if column is None or value is None or value == '':
+                    continue
+                converter = converters.get(column)
+                target = record
+                *parents, name = column.split('.')
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[name] = value if converter is None else converter(value)
+            yield record
+
+
+def read_jsonl(source: Source) -> Iterator[Union[Dict[str, Any], str]]:
+    """Streams the objects of a JSON Lines file.
+
+    Lines that are not valid JSON are yielded as they are, so that they
+    fail on their own instead of stopping the whole stream.
+
+    :param source: path of the file, or a file opened in text mode.
+    """
+    with _open(source) as lines:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+
+
+def parse_bool(value: str) -> bool:
+    """Converts a CSV cell like `true`, `yes` or `1` to a boolean."""
+    normalized = value.strip().lower()
+    if normalized in ('true', 'yes', 'y', '1'):
+        return True
+    if normalized in ('false', 'no', 'n', '0'):
+        return False
+    raise ValueError('Not a boolean: %r' % value)
+
+
+@contextlib.contextmanager
+def _open(source: Source) -> Iterator[TextIO]:
+    """Opens a path for reading, or passes an open file through without closing it."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8') as file:
+            yield file
+    else:
+        yield source
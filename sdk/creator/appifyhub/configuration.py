@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -23,6 +23,9 @@ import urllib3
 
 import http.client as httplib
 
+from appifyhub.compression import default_accept_encoding
+from appifyhub.json_codec import default_json_codec
+
 JSON_SCHEMA_VALIDATION_KEYWORDS = {
     'multipleOf', 'maximum', 'exclusiveMaximum',
     'minimum', 'exclusiveMinimum', 'maxLength',
@@ -71,7 +74,7 @@ class Configuration:
                  ) -> None:
         """Constructor
         """
-        self._base_path = "https://api.appifyhub.com" if host is None else host
+        self._base_path = "https://api.cloud.appifyhub.com" if host is None else host
         """Default Base url
         """
         self.server_index = 0 if server_index is None and host is None else server_index
@@ -97,7 +100,8 @@ class Configuration:
         """dict to store API prefix (e.g. Bearer)
         """
         self.refresh_api_key_hook = None
-        """function hook to refresh API key if expired
+        """function hook to refresh API key if expired, called with this
+           configuration before the credentials are read
         """
         self.username = username
         """Username for HTTP basic authentication
@@ -171,9 +175,77 @@ class Configuration:
         self.retries = None
         """Adding retries to override urllib3 default value 3
         """
+        self.retry_policy = None
+        """A `retry.RetryPolicy` applied by the ApiClient to every request.
+           When set, failed idempotent requests and 429/502/503/504 responses
+           are retried with jittered exponential backoff, honoring
+           `Retry-After` and a shared retry budget. Unless `retries` is set as
+           well, urllib3's own retries are then limited to redirects.
+        """
+        self.circuit_breaker = None
+        """A `circuit_breaker.CircuitBreaker` applied by the ApiClient to every
+           request. When set, endpoints that keep failing are not called
+           until their cool-down passes; requests to them raise
+           `CircuitOpenError` right away instead.
+        """
+        self.response_cache = None
+        """A `response_cache.ResponseCache` applied by the ApiClient.
+           When set, responses of the read operations it has a TTL for are
+           served from the cache until they expire or a mutating operation
+           changes their data, and expired responses are revalidated with
+           `If-None-Match` when the server sent an `ETag`.
+        """
+        self.metrics = None
+        """A `metrics.Metrics` recording the requests made by the ApiClient.
+           When set, every request attempt is counted per operation and
+           status class, and the time to its response headers, reading its
+           body and deserializing it is recorded in latency histograms.
+        """
+        self.tracer = None
+        """A `tracing.Tracer` running its hooks around every API call.
+           When set, the hooks are called before a request is sent, after
+           its response was deserialized or when it failed, and may add
+           trace-context headers to every request sent.
+        """
+        self.coalesce_requests = False
+        """Coalesce identical concurrent GET requests.
+           When enabled, a GET request made while the same client is already
+           making a GET request to the same URL with the same headers waits
+           for that request and shares its response instead of calling the
+           server again. Responses are then always read in full, even when
+           requested with `_preload_content=False`.
+        """
         # Enable client side validation
         self.client_side_validation = True
 
+        self.trusted_responses = False
+        """Skip re-validating decoded response data.
+           When enabled, response models are built with `model_construct`,
+           coercing only enums, dates and nested models and filling absent
+           fields with their defaults, instead of running the full strict
+           validation of `from_dict`, or of pydantic's single-pass
+           `validate_json` for JSON bodies. Only enable it for servers you
+           trust to honor the API contract.
+        """
+
+        self.http2 = False
+        """Send the requests over HTTP/2.
+           When enabled, the ApiClient and the AsyncApiClient use an httpx
+           transport (`pip install appifyhub[http2]`) that multiplexes
+           concurrent requests as streams over a few connections per host,
+           at most `connection_pool_maxsize`. Servers not offering HTTP/2
+           are spoken to over HTTP/1.1. Set it before creating the client.
+        """
+
+        self.accept_encoding = default_accept_encoding()
+        """The `Accept-Encoding` header sent with every request.
+           Defaults to the content codings the clients can decompress:
+           gzip and deflate, and br when `brotli` is installed
+           (`pip install appifyhub[brotli]`). Compressed responses are
+           decompressed while they are read. Set it to None to ask for
+           uncompressed responses. Set it before creating the client.
+        """
+
         self.socket_options = None
         """Options to pass down to the underlying urllib3 socket
         """
@@ -186,13 +258,29 @@ class Configuration:
         """date format
         """
 
+        self.json_codec = default_json_codec()
+        """JSON codec used to encode request bodies and decode responses.
+           orjson is used when it is installed, the standard library otherwise.
+           Set a `json_codec.JsonCodec` (or any object with `encode` and
+           `decode`) before creating the ApiClient to override it.
+        """
+
     def __deepcopy__(self, memo):
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k not in ('logger', 'logger_file_handler'):
+            if k not in ('logger', 'logger_file_handler', 'retry_policy', 'circuit_breaker',
+                         'response_cache', 'metrics', 'tracer', 'refresh_api_key_hook'):
                 setattr(result, k, copy.deepcopy(v, memo))
+        # retry budget, circuit states, cached responses, metrics, tracers and token
+        # managers are shared with the copies
+        result.retry_policy = self.retry_policy
+        result.circuit_breaker = self.circuit_breaker
+        result.response_cache = self.response_cache
+        result.metrics = self.metrics
+        result.tracer = self.tracer
+        result.refresh_api_key_hook = self.refresh_api_key_hook
         # shallow copy of loggers
         result.logger = copy.copy(self.logger)
         # use setters to configure loggers
@@ -360,6 +448,12 @@ class Configuration:
 
         :return: The Auth Settings information dict.
         """
+        if self.refresh_api_key_hook is not None:
+            self.refresh_api_key_hook(self)
+        return self._auth_settings()
+
+    def _auth_settings(self):
+        """Gets Auth Settings dict for api client, without calling `refresh_api_key_hook`."""
         auth = {}
         if self.access_token is not None:
             auth['BearerAuth'] = {
@@ -380,7 +474,7 @@ class Configuration:
                "OS: {env}\n"\
                "Python Version: {pyversion}\n"\
                "Version of the API: Latest\n"\
-               "SDK Package Version: 1.2.1".\
+               "SDK Package Version: 1.2.4".\
                format(env=sys.platform, pyversion=sys.version)
 
     def get_host_settings(self):
@@ -390,12 +484,12 @@ class Configuration:
         """
         return [
             {
-                'url': "https://api.appifyhub.com",
-                'description': "Production environment",
+                'url': "https://api.cloud.appifyhub.com",
+                'description': "Live environment",
             },
             {
-                'url': "http://staging.api.appifyhub.com",
-                'description': "Staging environment",
+                'url': "http://staging.api.cloud.appifyhub.com",
+                'description': "Pre-live environment",
             }
         ]
 
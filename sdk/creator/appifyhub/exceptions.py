@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -102,6 +102,25 @@ class ApiKeyError(OpenApiException, KeyError):
         super(ApiKeyError, self).__init__(full_msg)
 
 
+class CircuitOpenError(OpenApiException):
+    def __init__(self, method, resource_path, retry_after) -> None:
+        """
+        Raised instead of sending a request to an endpoint whose circuit
+        breaker is open.
+
+        Args:
+            method (str): the HTTP method of the endpoint
+            resource_path (str): the path template of the endpoint
+            retry_after (float): seconds until the endpoint is probed again
+        """
+        self.method = method
+        self.resource_path = resource_path
+        self.retry_after = retry_after
+        super(CircuitOpenError, self).__init__(
+            "Circuit open for {0} {1}, retry in {2:.1f}s".format(
+                method, resource_path, retry_after))
+
+
 class ApiException(OpenApiException):
 
     def __init__(
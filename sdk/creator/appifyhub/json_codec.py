@@ -0,0 +1,50 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+class JsonCodec:
+    """JSON codec backed by the standard library.
+
+    A codec turns sanitized request bodies into bytes and response bodies
+    into plain Python data. Any object providing `encode` and `decode` can be
+    set as `Configuration.json_codec`.
+    """
+
+    def encode(self, obj: Any) -> bytes:
+        """Serializes the given JSON-compatible object.
+
+        :param obj: The result of `ApiClient.sanitize_for_serialization`.
+        :return: UTF-8 encoded JSON document.
+        """
+        return json.dumps(obj).encode('utf-8')
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        """Parses the given JSON document.
+
+        :param data: JSON document as text or bytes.
+        :return: The decoded data.
+        :raise ValueError: If the document is not valid JSON.
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by orjson."""
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def decode(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+def default_json_codec() -> JsonCodec:
+    """Returns the fastest available codec: orjson if installed, stdlib otherwise."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JsonCodec()
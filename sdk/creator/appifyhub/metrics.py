@@ -0,0 +1,218 @@
+import bisect
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# seconds, from a fast local call up to a slow request
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# status class of requests failing before a response arrived
+ERROR = 'error'
+
+# operation name of requests to URLs not built by `ApiClient.param_serialize`
+UNKNOWN_OPERATION = 'unknown'
+
+# phases of a request, with the help text of their Prometheus histograms
+PHASES = (
+    ('wait', 'Seconds from sending a request (including connecting) to receiving the response'
+             ' headers.'),
+    ('read', 'Seconds spent reading response bodies.'),
+    ('deserialize', 'Seconds spent deserializing response bodies into models.'),
+)
+
+# response body sizes, with the help text of their Prometheus counters
+BYTES = (
+    ('wire_bytes', 'Response body bytes received, before decompressing them.'),
+    ('body_bytes', 'Response body bytes after decompressing them.'),
+)
+
+
+class Histogram:
+    """Distribution of durations over fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        """Upper bounds of the buckets, in seconds"""
+        self.counts = [0] * (len(self.buckets) + 1)
+        """Observations per bucket; the last one is above all bounds"""
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile (0 to 1) by interpolating within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1] if self.buckets else None
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1] if self.buckets else None
+
+    def copy(self) -> 'Histogram':
+        copy = Histogram(self.buckets)
+        copy.counts = list(self.counts)
+        copy.count = self.count
+        copy.sum = self.sum
+        return copy
+
+
+class OperationMetrics:
+    """Metrics of one API operation, e.g. `get_user`."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.requests: Dict[str, int] = {}
+        """Requests made by status class, e.g. `2xx`, or `error` for transport failures"""
+        self.wait = Histogram(buckets)
+        """Time to the response headers, including connecting"""
+        self.read = Histogram(buckets)
+        """Time reading the response body"""
+        self.deserialize = Histogram(buckets)
+        """Time deserializing the response body"""
+        self.wire_bytes = 0
+        """Response body bytes received, compressed when the server compressed them"""
+        self.body_bytes = 0
+        """Response body bytes after decompressing them"""
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Decompressed bytes per byte received, 1.0 when nothing was compressed."""
+        return self.body_bytes / self.wire_bytes if self.wire_bytes else None
+
+    def copy(self) -> 'OperationMetrics':
+        copy = OperationMetrics(())
+        copy.requests = dict(self.requests)
+        copy.wait = self.wait.copy()
+        copy.read = self.read.copy()
+        copy.deserialize = self.deserialize.copy()
+        copy.wire_bytes = self.wire_bytes
+        copy.body_bytes = self.body_bytes
+        return copy
+
+
+class Metrics:
+    """Request count, status and latency metrics per API operation.
+
+    Set it as `Configuration.metrics` to have the ApiClient record every
+    request attempt: its status class, the time until the response headers
+    arrived (connecting and waiting for the server), the time reading the
+    body, and the time deserializing it. The bytes of the bodies read are
+    counted as received and after decompressing them, to show what
+    compression saves. Responses served from the response cache are not
+    recorded. Read the metrics with `snapshot` or export them
+    with `to_prometheus`.
+
+    :param buckets: upper bounds of the latency histogram buckets, in seconds.
+    :param namespace: prefix of the exported Prometheus metric names.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = 'appifyhub',
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._operations: Dict[str, OperationMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record_response(self, operation: str, status: Optional[int], seconds: float) -> None:
+        """Records a request attempt that got a response (or `status` None if it failed)."""
+        status_class = ERROR if status is None else '%dxx' % (status // 100)
+        with self._lock:
+            metrics = self._operation(operation)
+            metrics.requests[status_class] = metrics.requests.get(status_class, 0) + 1
+            if status is not None:
+                metrics.wait.observe(seconds)
+
+    def record_read(self, operation: str, seconds: float,
+                    wire_bytes: Optional[int] = None, body_bytes: Optional[int] = None) -> None:
+        """Records reading a response body.
+
+        :param wire_bytes: size of the body as received, if it differs from `body_bytes`.
+        :param body_bytes: size of the body after decompressing it.
+        """
+        with self._lock:
+            metrics = self._operation(operation)
+            metrics.read.observe(seconds)
+            if body_bytes is not None:
+                metrics.body_bytes += body_bytes
+                metrics.wire_bytes += body_bytes if wire_bytes is None else wire_bytes
+
+    def record_deserialize(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            self._operation(operation).deserialize.observe(seconds)
+
+    def snapshot(self) -> Dict[str, OperationMetrics]:
+        """Returns a copy of the metrics recorded so far, by operation name."""
+        with self._lock:
+            return {operation: metrics.copy() for operation, metrics in self._operations.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        snapshot = sorted(self.snapshot().items())
+        name = self.namespace + '_requests_total'
+        lines = [
+            '# HELP %s Requests made, by operation and status class.' % name,
+            '# TYPE %s counter' % name,
+        ]
+        for operation, metrics in snapshot:
+            for status_class, count in sorted(metrics.requests.items()):
+                labels = _labels(operation=operation, status_class=status_class)
+                lines.append('%s{%s} %d' % (name, labels, count))
+        for field, help in BYTES:
+            name = '%s_response_%s_total' % (self.namespace, field)
+            lines.append('# HELP %s %s' % (name, help))
+            lines.append('# TYPE %s counter' % name)
+            for operation, metrics in snapshot:
+                labels = _labels(operation=operation)
+                lines.append('%s{%s} %d' % (name, labels, getattr(metrics, field)))
+        for phase, help in PHASES:
+            name = '%s_%s_seconds' % (self.namespace, phase)
+            lines.append('# HELP %s %s' % (name, help))
+            lines.append('# TYPE %s histogram' % name)
+            for operation, metrics in snapshot:
+                lines.extend(_histogram_lines(name, operation, getattr(metrics, phase)))
+        return '\n'.join(lines) + '\n'
+
+    def _operation(self, operation: str) -> OperationMetrics:
+        metrics = self._operations.get(operation)
+        if metrics is None:
+            metrics = self._operations[operation] = OperationMetrics(self.buckets)
+        return metrics
+
+
+def _histogram_lines(name: str, operation: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    bounds: List[Tuple[str, int]] = []
+    for upper_bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        bounds.append(('%g' % upper_bound, cumulative))
+    bounds.append(('+Inf', histogram.count))
+    for le, count in bounds:
+        lines.append('%s_bucket{%s} %d' % (name, _labels(operation=operation, le=le), count))
+    lines.append('%s_sum{%s} %r' % (name, _labels(operation=operation), histogram.sum))
+    lines.append('%s_count{%s} %d' % (name, _labels(operation=operation), histogram.count))
+    return lines
+
+
+def _labels(**labels: str) -> str:
+    return ','.join(
+        '%s="%s"' % (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
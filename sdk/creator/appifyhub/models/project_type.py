@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -0,0 +1,30 @@
+from typing import Dict, Optional, Tuple
+
+# (HTTP method, resource path) of every API operation, mapped to the operation name
+OPERATIONS: Dict[Tuple[str, str], str] = {
+    ("POST", "/v1/creator/apikey"): "create_api_key",
+    ("POST", "/v1/creator/auth"): "authenticate",
+    ("POST", "/v1/creator/signup"): "add_user",
+    ("DELETE", "/v1/projects"): "remove_projects_by_creator",
+    ("GET", "/v1/projects"): "get_projects",
+    ("POST", "/v1/projects"): "add_project",
+    ("DELETE", "/v1/projects/{projectId}"): "remove_project",
+    ("GET", "/v1/projects/{projectId}"): "get_project",
+    ("PUT", "/v1/projects/{projectId}"): "update_project",
+    ("POST", "/v1/projects/{projectId}/messaging/template"): "add_template",
+    ("POST", "/v1/projects/{projectId}/messaging/template-materialize"): "materialize",
+    ("DELETE", "/v1/projects/{projectId}/messaging/template-search"): "delete_templates",
+    ("GET", "/v1/projects/{projectId}/messaging/template-search"): "search_templates",
+    ("GET", "/v1/projects/{projectId}/messaging/template-variables"): "get_defined_variables",
+    ("POST", "/v1/projects/{projectId}/messaging/template-variables"): "detect_variables",
+    ("DELETE", "/v1/projects/{projectId}/messaging/templates/{templateId}"):
+        "delete_template_by_id",
+    ("GET", "/v1/projects/{projectId}/messaging/templates/{templateId}"): "fetch_template_by_id",
+    ("PUT", "/v1/projects/{projectId}/messaging/templates/{templateId}"): "update_template",
+    ("POST", "/v1/universal/users/{universalId}/force-verify"): "force_verify_user",
+}
+
+
+def operation_name(method: str, resource_path: str) -> Optional[str]:
+    """Returns the name of the operation serving the method and resource path template."""
+    return OPERATIONS.get((method, resource_path))
@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -14,12 +14,18 @@
 
 
 import io
-import json
 import re
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from appifyhub import compression
 from appifyhub.exceptions import ApiException, ApiValueError
 
 SUPPORTED_SOCKS_PROXIES = {"socks5", "socks5h", "socks4", "socks4a"}
@@ -38,15 +44,37 @@ def is_socks_proxy_url(url):
 
 class RESTResponse(io.IOBase):
 
+    # `metrics.Metrics` recording the time reading the body, and the operation to record it for
+    metrics = None
+    operation = None
+    # size of the request body sent, when known
+    request_bytes: Optional[int] = None
+    # size of the response body as received, before decompressing it
+    wire_bytes: Optional[int] = None
+
     def __init__(self, resp) -> None:
         self.response = resp
         self.status = resp.status
         self.reason = resp.reason
-        self.data = None
+        self.data: Optional[bytes] = None
 
     def read(self):
         if self.data is None:
-            self.data = self.response.data
+            started = time.perf_counter() if self.metrics is not None else 0.0
+            if getattr(self.response, 'closed', True):
+                # the body was preloaded
+                self.data = self.response.data
+            else:
+                # decompress the body as it streams in, instead of buffering it compressed
+                body = compression.Decoder(self.response.headers.get('Content-Encoding'))
+                for chunk in self.response.stream(compression.CHUNK_SIZE, decode_content=False):
+                    body.feed(chunk)
+                self.data = body.finish()
+                self.wire_bytes = body.wire_bytes
+            if self.metrics is not None:
+                self.metrics.record_read(
+                    self.operation, time.perf_counter() - started, self.wire_bytes, len(self.data),
+                )
         return self.data
 
     def getheaders(self):
@@ -58,6 +86,154 @@ class RESTResponse(io.IOBase):
         return self.response.headers.get(name, default)
 
 
+class PoolStats:
+    """Usage of the connection pool of one host."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        """The pool's `scheme://host:port`"""
+        self.active = 0
+        """Connections checked out by requests in flight"""
+        self.idle = 0
+        """Open connections waiting in the pool"""
+        self.created = 0
+        """Connections opened so far, including reconnections"""
+        self.requests = 0
+        """Connections checked out so far"""
+        self.reused = 0
+        """Checkouts that got an already open connection"""
+        self.wait_seconds = 0.0
+        """Time requests spent getting a connection, including opening it"""
+        self.max_wait_seconds = 0.0
+
+    @property
+    def reuse_ratio(self) -> Optional[float]:
+        """Share of the checkouts that did not have to open a connection."""
+        return self.reused / self.requests if self.requests else None
+
+    @property
+    def average_wait_seconds(self) -> Optional[float]:
+        return self.wait_seconds / self.requests if self.requests else None
+
+    def __repr__(self) -> str:
+        return 'PoolStats(%r, active=%d, idle=%d, created=%d, requests=%d, reused=%d)' % (
+            self.key, self.active, self.idle, self.created, self.requests, self.reused,
+        )
+
+
+class _StatsConnection(HTTPConnection):
+    """Connection recording the time it takes to open it."""
+
+    pool: Optional['_StatsConnectionPool'] = None
+    _checked_out_at: Optional[float] = None
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        if self.pool is not None:
+            self.pool._opened(self, time.perf_counter() - started)
+
+
+class _StatsHTTPConnection(_StatsConnection):
+    pass
+
+
+class _StatsHTTPSConnection(_StatsConnection, HTTPSConnection):
+    pass
+
+
+class _StatsConnectionPool(HTTPConnectionPool):
+    """Connection pool keeping `PoolStats`."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats_lock = threading.Lock()
+        self.stats = PoolStats('%s://%s:%s' % (self.scheme, self.host, self.port))
+
+    def _new_conn(self) -> Any:
+        conn = super()._new_conn()
+        if isinstance(conn, _StatsConnection):
+            conn.pool = self
+        return conn
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        opened = getattr(conn, 'sock', None) is not None
+        with self.stats_lock:
+            if isinstance(conn, _StatsConnection):
+                conn._checked_out_at = started
+            self.stats.requests += 1
+            self.stats.active += 1
+            if opened:
+                self.stats.reused += 1
+                self._waited(time.perf_counter() - started)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        with self.stats_lock:
+            self.stats.active -= 1
+        super()._put_conn(conn)
+
+    def _opened(self, conn: _StatsConnection, seconds: float) -> None:
+        with self.stats_lock:
+            self.stats.created += 1
+            checked_out_at = conn._checked_out_at
+            if checked_out_at is not None:
+                # the request waited from its checkout until the connection was open
+                conn._checked_out_at = None
+                self._waited(time.perf_counter() - checked_out_at)
+
+    def _waited(self, seconds: float) -> None:
+        self.stats.wait_seconds += seconds
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, seconds)
+
+    def snapshot(self) -> PoolStats:
+        with self.stats_lock:
+            stats = PoolStats(self.stats.key)
+            stats.__dict__.update(self.stats.__dict__)
+        queue = self.pool
+        if queue is not None:
+            with queue.mutex:
+                stats.idle = sum(
+                    1 for conn in queue.queue if getattr(conn, 'sock', None) is not None
+                )
+        return stats
+
+    def warm_up(self, connections: int) -> int:
+        """Opens connections until `connections` are idle in the pool.
+
+        :return: how many connections were opened.
+        """
+        connections = min(connections, self.pool.maxsize if self.pool is not None else 0)
+        conns = [super(_StatsConnectionPool, self)._get_conn() for _ in range(connections)]
+        closed = [conn for conn in conns if getattr(conn, 'sock', None) is None]
+        try:
+            if closed:
+                with ThreadPoolExecutor(
+                    len(closed), thread_name_prefix='appifyhub-warm-up'
+                ) as executor:
+                    for future in [executor.submit(self._open, conn) for conn in closed]:
+                        future.result()
+        finally:
+            for conn in conns:
+                super(_StatsConnectionPool, self)._put_conn(conn)
+        return len(closed)
+
+    def _open(self, conn: Any) -> None:
+        conn.connect()
+        # verifies the server's certificate like the first request would
+        self._validate_conn(conn)
+
+
+class _StatsHTTPConnectionPool(_StatsConnectionPool):
+    ConnectionCls = _StatsHTTPConnection
+
+
+class _StatsHTTPSConnectionPool(_StatsConnectionPool, HTTPSConnectionPool):
+    ConnectionCls = _StatsHTTPSConnection
+
+
 class RESTClientObject:
 
     def __init__(self, configuration) -> None:
@@ -85,6 +261,15 @@ class RESTClientObject:
 
         if configuration.retries is not None:
             pool_args['retries'] = configuration.retries
+        elif configuration.retry_policy is not None:
+            # failures are retried by the ApiClient according to the policy
+            pool_args['retries'] = urllib3.util.Retry(
+                total=3,
+                connect=0,
+                read=0,
+                status=0,
+                respect_retry_after_header=False,
+            )
 
         if configuration.tls_server_name:
             pool_args['server_hostname'] = configuration.tls_server_name
@@ -111,6 +296,60 @@ class RESTClientObject:
                 self.pool_manager = urllib3.ProxyManager(**pool_args)
         else:
             self.pool_manager = urllib3.PoolManager(**pool_args)
+        if not is_socks_proxy_url(configuration.proxy):
+            self.pool_manager.pool_classes_by_scheme = {
+                'http': _StatsHTTPConnectionPool,
+                'https': _StatsHTTPSConnectionPool,
+            }
+
+        self.host = configuration.host
+        self.json_codec = configuration.json_codec
+
+    def pool_stats(self) -> Dict[str, PoolStats]:
+        """Returns the usage of the connection pools, by `scheme://host:port`.
+
+        Pools behind a SOCKS proxy are not reported.
+        """
+        stats: Dict[str, PoolStats] = {}
+        for key in list(self.pool_manager.pools.keys()):
+            pool = self.pool_manager.pools.get(key)
+            if isinstance(pool, _StatsConnectionPool):
+                snapshot = pool.snapshot()
+                stats[snapshot.key] = snapshot
+        return stats
+
+    def warm_up(self, connections: int, url: Optional[str] = None) -> int:
+        """Opens connections ahead of the first requests, so they do not wait for handshakes.
+
+        The connections are opened in parallel, including their TLS
+        handshakes, and left idle in the pool. At most the pool's
+        `connection_pool_maxsize` are kept.
+
+        :param connections: number of idle connections wanted.
+        :param url: URL of the host to connect to, `Configuration.host` by default.
+        :return: the number of connections opened.
+        """
+        pool = self.pool_manager.connection_from_url(url or self.host)
+        if not isinstance(pool, _StatsConnectionPool):
+            raise ApiValueError("Connections through SOCKS proxies cannot be warmed up.")
+        return pool.warm_up(connections)
+
+    def classify_error(self, error):
+        """Classifies a transport error for the retry policy.
+
+        :param error: exception raised by `request`.
+        :return: "connect" when the request was never sent, "transient" for
+                 other failures worth retrying, None otherwise.
+        """
+        if isinstance(error, urllib3.exceptions.MaxRetryError):
+            error = error.reason
+        if isinstance(error, urllib3.exceptions.ConnectTimeoutError):
+            return "connect"
+        if isinstance(
+            error, (urllib3.exceptions.ReadTimeoutError, urllib3.exceptions.ProtocolError)
+        ):
+            return "transient"
+        return None
 
     def request(
         self,
@@ -167,6 +406,7 @@ class RESTClientObject:
                     read=_request_timeout[1]
                 )
 
+        request_body = None
         try:
             # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
             if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
@@ -177,9 +417,8 @@ class RESTClientObject:
                     not content_type
                     or re.search('json', content_type, re.IGNORECASE)
                 ):
-                    request_body = None
                     if body is not None:
-                        request_body = json.dumps(body)
+                        request_body = self.json_codec.encode(body)
                     r = self.pool_manager.request(
                         method,
                         url,
@@ -204,7 +443,11 @@ class RESTClientObject:
                     # overwritten.
                     del headers['Content-Type']
                     # Ensures that dict objects are serialized
-                    post_params = [(a, json.dumps(b)) if isinstance(b, dict) else (a,b) for a, b in post_params]
+                    post_params = [
+                        (a, self.json_codec.encode(b).decode('utf-8')) if isinstance(b, dict)
+                        else (a, b)
+                        for a, b in post_params
+                    ]
                     r = self.pool_manager.request(
                         method,
                         url,
@@ -218,6 +461,7 @@ class RESTClientObject:
                 # other content types than JSON when `body` argument is
                 # provided in serialized form.
                 elif isinstance(body, str) or isinstance(body, bytes):
+                    request_body = body
                     r = self.pool_manager.request(
                         method,
                         url,
@@ -255,4 +499,7 @@ class RESTClientObject:
             msg = "\n".join([type(e).__name__, str(e)])
             raise ApiException(status=0, reason=msg)
 
-        return RESTResponse(r)
+        response = RESTResponse(r)
+        if isinstance(request_body, (str, bytes)):
+            response.request_bytes = len(request_body)
+        return response
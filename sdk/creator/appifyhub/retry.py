@@ -0,0 +1,192 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+# PUT operations that change state on every call
+NON_IDEMPOTENT_OPERATIONS = frozenset(['refresh', 'reset_signature'])
+
+
+class RetryBudget:
+    """Caps retries at a fraction of the request volume, shared by all clients using it.
+
+    Every first attempt deposits `ratio` tokens and every retry withdraws
+    one, so during an outage retries add at most `ratio` extra load instead
+    of multiplying it. `min_per_second` tokens are added over time so that
+    low-traffic clients can still retry occasional failures.
+
+    :param ratio: retries allowed per request, e.g. 0.2 for 20% extra load.
+    :param min_per_second: retries always allowed per second.
+    :param max_tokens: upper bound of the saved-up retries.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 10.0, max_tokens: float = 100.0,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = min(min_per_second, max_tokens)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Records a first attempt."""
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spends one retry, returning False when the budget is exhausted."""
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._refilled_at) * self.min_per_second
+            self.tokens = min(self.max_tokens, self.tokens + refill)
+            self._refilled_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is attempted again.
+
+    Requests are retried on connection failures and on the `retry_statuses`
+    responses, waiting an exponentially growing, jittered delay or the time
+    the server asks for in `Retry-After`, whichever is longer.
+
+    Only idempotent requests are retried after they may have reached the
+    server: GET, HEAD, OPTIONS, PUT and DELETE (except the operations in
+    `non_idempotent_operations`), the operations in `idempotent_operations`,
+    and any request carrying an `Idempotency-Key` header. Connection
+    failures and the `rejected_statuses` responses are retried for every
+    request, since the server did not act on them.
+
+    :param max_attempts: attempts per request, including the first one.
+    :param backoff_base: delay before the first retry, in seconds.
+    :param backoff_max: upper bound of the computed delay, in seconds.
+    :param jitter: randomize each delay between zero and its computed value
+                   ("full jitter"), so that clients failing together do not
+                   retry together.
+    :param retry_statuses: response statuses worth retrying.
+    :param max_retry_after: longest `Retry-After` to wait for; a response
+                            asking for more is returned without retrying.
+    :param idempotent_operations: operation names that are safe to retry
+                                  although their method is not.
+    :param non_idempotent_operations: operation names that must not be
+                                      retried although their method is.
+    :param rejected_statuses: `retry_statuses` the server answers without
+                              processing the request, e.g. 429 and 503,
+                              retried even when it is not idempotent.
+    :param budget: RetryBudget shared by every request using this policy,
+                   a default one when not given. Set the `budget` attribute
+                   to None to retry without a budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = (429, 502, 503, 504),
+        max_retry_after: float = 60.0,
+        idempotent_operations: Iterable[str] = (),
+        non_idempotent_operations: Iterable[str] = NON_IDEMPOTENT_OPERATIONS,
+        rejected_statuses: Iterable[int] = (),
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+        self.idempotent_operations = frozenset(idempotent_operations)
+        self.non_idempotent_operations = frozenset(non_idempotent_operations)
+        self.rejected_statuses = frozenset(rejected_statuses)
+        self.budget = RetryBudget() if budget is None else budget
+
+    def record_request(self) -> None:
+        """Records a new request (not a retry) against the budget."""
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def is_idempotent(self, method: str, operation: Optional[str], headers) -> bool:
+        """Tells whether repeating the request cannot cause unintended effects."""
+        if operation in self.idempotent_operations:
+            return True
+        if headers and any(k.lower() == IDEMPOTENCY_KEY_HEADER.lower() for k in headers):
+            return True
+        return method in IDEMPOTENT_METHODS and operation not in self.non_idempotent_operations
+
+    def backoff(self, attempt: int) -> float:
+        """Returns the delay before the given retry (1 for the first one)."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_delay(
+        self,
+        attempt: int,
+        method: str,
+        operation: Optional[str],
+        headers,
+        response=None,
+        error_kind: Optional[str] = None,
+    ) -> Optional[float]:
+        """Returns how long to wait before retrying, or None to stop.
+
+        :param attempt: number of attempts made so far.
+        :param method: HTTP method of the request.
+        :param operation: name of the API operation, if known.
+        :param headers: request headers.
+        :param response: the response received, if any.
+        :param error_kind: "connect" when the connection could not be
+                           established, "transient" for other transport
+                           failures, None when a response was received.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is not None:
+            if response.status not in self.retry_statuses:
+                return None
+            unprocessed = response.status in self.rejected_statuses
+        elif error_kind is None:
+            return None
+        else:
+            unprocessed = error_kind == 'connect'
+        if not unprocessed and not self.is_idempotent(method, operation, headers):
+            return None
+
+        delay = self.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.getheader('Retry-After'))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = max(delay, retry_after)
+
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a `Retry-After` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
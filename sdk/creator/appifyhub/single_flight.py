@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def request_key(
+    method: str, url: str, headers: Optional[Dict[str, str]],
+) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """Identifies requests that are guaranteed to get the same response."""
+    if not headers:
+        return method, url, ()
+    return method, url, tuple(sorted((k.lower(), v) for k, v in headers.items()))
+
+
+class _Flight:
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome with concurrent callers.
+
+    A thread calling `do` while another thread is running the call for the
+    same key waits for that call instead of making its own, and gets the
+    same result or exception. The key is forgotten once the call finishes,
+    so later callers make a fresh call.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        """Number of calls that waited for another call's outcome"""
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Returns `fn()`, or the outcome of the call already running for the key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+
+class AsyncSingleFlight:
+    """Asyncio counterpart of `SingleFlight`, sharing calls between the tasks of an event loop.
+
+    The call runs in its own task, so a caller being cancelled does not
+    cancel the call for the other callers waiting on it.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, asyncio.Future[Any]] = {}
+        self.coalesced = 0
+        """Number of calls that waited for another call's outcome"""
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns `await fn()`, or the outcome of the call already running for the key."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(fn())
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
@@ -0,0 +1,280 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.exceptions import ApiValueError
+from appifyhub.models.message_inputs_request import MessageInputsRequest
+from appifyhub.models.message_response import MessageResponse
+from appifyhub.models.message_template_response import MessageTemplateResponse
+from appifyhub.models.project_response import ProjectResponse
+from appifyhub.models.variable_response import VariableResponse
+
+# the service's variables (code, example), in the order it replaces them
+VARIABLES = (
+    ('user.name', 'Mark Watson'),
+    ('project.name', 'Mortgage Calculator'),
+    ('user.code', '123456'),
+    ('user.signature', '123456'),
+)
+VARIABLE_PREFIX = '{{'
+VARIABLE_SUFFIX = '}}'
+# the service's replacement for values it does not know
+DEFAULT_VALUE = '******'
+
+
+def get_defined_variables() -> List[VariableResponse]:
+    """Returns the variables templates can use, like `MessagingApi.get_defined_variables`."""
+    return [VariableResponse(code=code, example=example) for code, example in VARIABLES]
+
+
+def detect_variables(content: str) -> List[VariableResponse]:
+    """Returns the variables used in a text, like `MessagingApi.detect_variables`."""
+    return [
+        VariableResponse(code=code, example=example)
+        for code, example in VARIABLES
+        if _wrap(code) in content
+    ]
+
+
+class TemplateUser:
+    """What the engine may know about the user a message is materialized for.
+
+    Values left as None are replaced like the service replaces values it
+    does not have.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        language_tag: Optional[str] = None,
+        verification_code: Optional[str] = None,
+        signature: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.language_tag = language_tag
+        self.verification_code = verification_code
+        self.signature = signature
+
+
+class CompiledTemplate:
+    """A message template prepared for rendering."""
+
+    def __init__(self, template: MessageTemplateResponse) -> None:
+        self.template = template
+        self.variables = tuple(code for code, _ in VARIABLES if _wrap(code) in template.content)
+        """Codes of the variables in the content"""
+
+    def render(self, value: Callable[[str], Optional[str]]) -> str:
+        """Replaces the variables in the content with `value(code)`.
+
+        Mirrors the service: variables are replaced one after the other, in
+        the order of `VARIABLES`, so a replaced value can itself contain a
+        later variable. `value` is only called for variables found.
+        """
+        content = self.template.content
+        if VARIABLE_PREFIX not in content:
+            return content
+        for code, _ in VARIABLES:
+            wrapped = _wrap(code)
+            if wrapped in content:
+                replacement = value(code)
+                if replacement is None:
+                    replacement = DEFAULT_VALUE
+                content = content.replace(wrapped, replacement)
+        return content
+
+
+class TemplateEngine:
+    """Materializes message templates locally instead of calling `MessagingApi.materialize`.
+
+    Templates are fetched once and compiled, then cached by ID and by name.
+    Cached templates are checked again with the service after `ttl`
+    seconds, and compiled again only when their `updated_at` changed.
+    Project names and languages are cached the same way.
+
+    The Creator API cannot read users, so user values come from
+    `user_resolver`. When a message needs user values that the resolver
+    does not provide, the engine calls `MessagingApi.materialize` instead.
+    The same happens for unknown templates, so that errors match the
+    service's.
+
+    :param api_client: ApiClient fetching the templates and projects.
+    :param user_resolver: returns a TemplateUser for a universal ID, or
+                          None if the user is not known locally.
+    :param ttl: seconds cached templates and projects are used without
+                checking them with the service.
+    :param clock: monotonic time source, in seconds.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        user_resolver: Optional[Callable[[str], Optional[TemplateUser]]] = None,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.user_resolver = user_resolver
+        self.ttl = ttl
+        self.clock = clock
+        self.local_renders = 0
+        """Messages materialized locally"""
+        self.remote_renders = 0
+        """Messages materialized by the service"""
+        self._messaging_api = MessagingApi(api_client)
+        self._projects_api = ProjectsApi(api_client)
+        self._by_id: Dict[Tuple[int, int], Tuple[CompiledTemplate, float]] = {}
+        self._by_name: Dict[Tuple[int, str], Tuple[List[CompiledTemplate], float]] = {}
+        self._projects: Dict[int, Tuple[ProjectResponse, float]] = {}
+        self._lock = threading.Lock()
+
+    def materialize(
+        self,
+        project_id: int,
+        id: Optional[int] = None,
+        name: Optional[str] = None,
+        message_inputs_request: Optional[MessageInputsRequest] = None,
+    ) -> MessageResponse:
+        """Materializes a template found by ID or name, like `MessagingApi.materialize`."""
+        if id is None and name is None:
+            raise ApiValueError('One of [Template ID, Template Name] are required')
+        inputs = message_inputs_request or MessageInputsRequest()
+        try:
+            return self._materialize(project_id, id, name, inputs)
+        except _NotLocal:
+            self.remote_renders += 1
+            return self._messaging_api.materialize(
+                project_id, id=id, name=name, message_inputs_request=inputs,
+            )
+
+    def template(self, project_id: int, template_id: int) -> CompiledTemplate:
+        """Returns the compiled template with the given ID."""
+        now = self.clock()
+        cached = self._by_id.get((project_id, template_id))
+        if cached is not None and now - cached[1] < self.ttl:
+            return cached[0]
+        template = self._messaging_api.fetch_template_by_id(project_id, template_id)
+        return self._compile(project_id, template, now)
+
+    def templates(self, project_id: int, name: str) -> List[CompiledTemplate]:
+        """Returns the compiled templates with the given name, in all languages."""
+        now = self.clock()
+        cached = self._by_name.get((project_id, name))
+        if cached is not None and now - cached[1] < self.ttl:
+            return cached[0]
+        templates = [
+            self._compile(project_id, template, now)
+            for template in self._messaging_api.search_templates(project_id, name=name)
+        ]
+        with self._lock:
+            self._by_name[(project_id, name)] = (templates, now)
+        return templates
+
+    def invalidate(self) -> None:
+        """Drops all cached templates and projects."""
+        with self._lock:
+            self._by_id.clear()
+            self._by_name.clear()
+            self._projects.clear()
+
+    def _materialize(self, project_id: int, id: Optional[int], name: Optional[str],
+                     inputs: MessageInputsRequest) -> MessageResponse:
+        user = _Lazy(lambda: self._user(inputs.user_id))
+        project = _Lazy(lambda: self._project(inputs.project_id))
+        if id is not None:
+            compiled = self.template(project_id, id)
+        else:
+            assert name is not None, 'One of [Template ID, Template Name] are required'
+            compiled = self._select(self.templates(project_id, name), user, project)
+
+        def value(code: str) -> Optional[str]:
+            if code == 'project.name':
+                return project.value and project.value.name
+            if user.value is None:
+                return None
+            if code == 'user.name':
+                return user.value.name
+            if code == 'user.code':
+                return user.value.verification_code
+            return user.value.signature
+
+        materialized = compiled.render(value)
+        self.local_renders += 1
+        return MessageResponse(template=compiled.template, materialized=materialized)
+
+    def _select(
+        self, candidates: List[CompiledTemplate], user: '_Lazy', project: '_Lazy',
+    ) -> CompiledTemplate:
+        if not candidates:
+            raise _NotLocal()
+        if len(candidates) == 1:
+            return candidates[0]
+        # language selection priority: (1) user, (2) project, (3) last updated
+        for source in (user, project):
+            # templates without a language tag match a missing user or project,
+            # or one without a tag
+            language_tag = source.value.language_tag if source.value is not None else None
+            for compiled in candidates:
+                if compiled.template.language_tag == language_tag:
+                    return compiled
+        return max(candidates, key=lambda compiled: compiled.template.updated_at)
+
+    def _user(self, universal_id: Optional[str]) -> Optional[TemplateUser]:
+        if universal_id is None:
+            return None
+        user = self.user_resolver(universal_id) if self.user_resolver is not None else None
+        if user is None:
+            raise _NotLocal()
+        return user
+
+    def _project(self, project_id: Optional[int]) -> Optional[ProjectResponse]:
+        if project_id is None:
+            return None
+        now = self.clock()
+        cached = self._projects.get(project_id)
+        if cached is not None and now - cached[1] < self.ttl:
+            return cached[0]
+        project = self._projects_api.get_project(project_id)
+        with self._lock:
+            self._projects[project_id] = (project, now)
+        return project
+
+    def _compile(
+        self, project_id: int, template: MessageTemplateResponse, now: float,
+    ) -> CompiledTemplate:
+        # templates are cached per project, so a template ID never reaches another
+        # project's template
+        key = (project_id, template.id)
+        with self._lock:
+            cached = self._by_id.get(key)
+            if cached is not None and cached[0].template.updated_at == template.updated_at:
+                compiled = cached[0]
+            else:
+                compiled = CompiledTemplate(template)
+            self._by_id[key] = (compiled, now)
+            return compiled
+
+
+class _NotLocal(Exception):
+    """Raised when a message cannot be materialized locally."""
+
+
+class _Lazy:
+    """A value computed on first use."""
+
+    def __init__(self, compute: Callable[[], object]) -> None:
+        self._compute = compute
+        self._computed = False
+        self._value: object = None
+
+    @property
+    def value(self):
+        if not self._computed:
+            self._value = self._compute()
+            self._computed = True
+        return self._value
+
+
+def _wrap(code: str) -> str:
+    return VARIABLE_PREFIX + code + VARIABLE_SUFFIX
@@ -0,0 +1,184 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+
+SDK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import appifyhub
+imported = time.perf_counter()
+configuration = appifyhub.Configuration(host=%(host)r)
+configuration.access_token = %(access_token)r
+api_client = appifyhub.ApiClient(configuration)
+constructed = time.perf_counter()
+from benchmarks.suite import scenarios
+scenarios(api_client, %(fixtures)r)[%(operation)r]()
+finished = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "construction": constructed - imported,
+    "first_request": finished - constructed,
+}))
+"""
+
+
+def seed(hub: FakeAppifyHub) -> Dict[str, Any]:
+    """Stores the data the scenarios operate on and returns its identifiers."""
+    creator = hub.add_user(CREATOR_PROJECT_ID, "creator@example.com", name="Creator")
+    project = hub.add_project("Benchmark", creator["universal_id"], language_tag="en")
+    templates = [
+        hub.add_template(
+            project["project_id"],
+            "welcome",
+            "Hello {{user.name}}, welcome to {{project.name}}!",
+            title="Welcome %d" % i,
+        )
+        for i in range(100)
+    ]
+    return {
+        "project_id": project["project_id"],
+        "template_id": templates[0]["id"],
+        "access_token": hub.create_token(creator["universal_id"]),
+    }
+
+
+def scenarios(api_client, fixtures: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Returns the operations measured by the suite, keyed by operation name."""
+    from appifyhub import MessageInputsRequest, MessagingApi, ProjectsApi
+
+    projects_api = ProjectsApi(api_client)
+    messaging_api = MessagingApi(api_client)
+    project_id = fixtures["project_id"]
+    template_id = fixtures["template_id"]
+    inputs = MessageInputsRequest(project_id=project_id)
+    return {
+        "get_project": lambda: projects_api.get_project(project_id),
+        "search_templates": lambda: messaging_api.search_templates(project_id, name="welcome"),
+        "materialize": lambda: messaging_api.materialize(
+            project_id, id=template_id, message_inputs_request=inputs,
+        ),
+    }
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Reduces timing samples (in seconds) to summary statistics."""
+    ordered = sorted(samples)
+    return {
+        "unit": "s",
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.mean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def make_api_client(host: str, fixtures: Dict[str, Any]):
+    from appifyhub import ApiClient, Configuration
+
+    configuration = Configuration(host=host)
+    configuration.access_token = fixtures["access_token"]
+    return ApiClient(configuration)
+
+
+def measure_cold_start(
+    host: str, fixtures: Dict[str, Any], operation: str, runs: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Measures import, client construction and first request in fresh interpreters."""
+    samples: Dict[str, List[float]] = {}
+    script = COLD_START_SCRIPT % {
+        "host": host,
+        "access_token": fixtures["access_token"],
+        "fixtures": fixtures,
+        "operation": operation,
+    }
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", script], cwd=SDK_ROOT)
+        for name, value in json.loads(output.decode("utf-8").splitlines()[-1]).items():
+            samples.setdefault(name, []).append(value)
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def measure_construction(host: str, iterations: int) -> Dict[str, Any]:
+    """Measures `ApiClient()` construction in a warm interpreter."""
+    from appifyhub import ApiClient, Configuration
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        ApiClient(Configuration(host=host))
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def measure_steady_state(
+    host: str, fixtures: Dict[str, Any], iterations: int, warmup: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Measures the per-call latency of every scenario after warming up."""
+    results = {}
+    for name, call in scenarios(make_api_client(host, fixtures), fixtures).items():
+        for _ in range(warmup):
+            call()
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+        results[name] = summarize(samples)
+    return results
+
+
+def run(cold_runs: int = 5, iterations: int = 200, warmup: int = 20) -> Dict[str, Any]:
+    """Runs the whole suite against a local fake service and returns the report."""
+    import appifyhub
+
+    with FakeAppifyHub() as hub:
+        fixtures = seed(hub)
+        cold_start = measure_cold_start(hub.host, fixtures, "get_project", cold_runs)
+        benchmarks = {
+            "import_appifyhub": cold_start["import"],
+            "api_client_construction.cold": cold_start["construction"],
+            "api_client_construction.warm": measure_construction(hub.host, iterations),
+            "first_request.get_project": cold_start["first_request"],
+        }
+        for name, result in measure_steady_state(hub.host, fixtures, iterations, warmup).items():
+            benchmarks["steady_state." + name] = result
+
+    return {
+        "package": "appifyhub",
+        "package_version": appifyhub.__version__,
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "benchmarks": benchmarks,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the appifyhub SDK against a local fake service.",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--cold-runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--iterations", type=int, default=200, help="measured calls per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured calls per scenario")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args.cold_runs, args.iterations, args.warmup), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
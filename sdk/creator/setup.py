@@ -1,7 +1,7 @@
 # coding: utf-8
 
 """
-    Appify Hub's Creator API
+    Creator API · Appify Hub
 
     The full specification of the service's API used by the project administrators.
 
@@ -22,7 +22,7 @@ from setuptools import setup, find_packages  # noqa: H301
 # prerequisite: setuptools
 # http://pypi.python.org/pypi/setuptools
 NAME = "appifyhub"
-VERSION = "1.2.1"
+VERSION = "1.2.4"
 PYTHON_REQUIRES = ">=3.7"
 REQUIRES = [
     "urllib3 >= 1.25.3, < 2.1.0",
@@ -30,17 +30,25 @@ REQUIRES = [
     "pydantic >= 2",
     "typing-extensions >= 4.7.1",
 ]
+EXTRAS_REQUIRE = {
+    "asyncio": ["aiohttp >= 3.8.4"],
+    "orjson": ["orjson >= 3.8"],
+    "http2": ["httpx[http2] >= 0.26"],
+    "brotli": ["brotli >= 1.0.9"],
+    "cryptography": ["cryptography >= 41"],
+}
 
 setup(
     name=NAME,
     version=VERSION,
-    description="Appify Hub&#39;s Creator API",
+    description="Creator API · Appify Hub",
     author="Team",
     author_email="contact@appifyhub.com",
     url="",
-    keywords=["OpenAPI", "OpenAPI-Generator", "Appify Hub's Creator API"],
+    keywords=["OpenAPI", "OpenAPI-Generator", "Creator API · Appify Hub"],
     install_requires=REQUIRES,
-    packages=find_packages(exclude=["test", "tests"]),
+    extras_require=EXTRAS_REQUIRE,
+    packages=find_packages(exclude=["test", "tests", "benchmarks"]),
     include_package_data=True,
     license="MIT License",
     long_description_content_type='text/markdown',
@@ -0,0 +1,223 @@
+import datetime
+import json
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+import urllib3
+from pydantic import BaseModel, Field, StrictInt, StrictStr
+
+from appifyhub import rest
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.models.project_feature_response import ProjectFeatureResponse
+from appifyhub.models.project_response import ProjectResponse
+from appifyhub.models.project_state_response import ProjectStateResponse
+from appifyhub.models.project_type import ProjectType
+from appifyhub.models.project_user_id_type import ProjectUserIDType
+
+PROJECT = {
+    "project_id": 1,
+    "type": "COMMERCIAL",
+    "state": {
+        "status": "ACTIVE",
+        "usable_features": [{"name": "BASIC", "is_required": True}],
+        "unusable_features": [],
+    },
+    "user_id_type": "EMAIL",
+    "name": "Tenant",
+    "max_users": 100,
+    "anyone_can_search": False,
+    "on_hold": False,
+    "requires_signup_codes": False,
+    "max_signup_codes_per_user": 0,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+
+class Page(BaseModel):
+    """A model with non-None defaults, which the generated models lack"""
+
+    number: StrictInt = 1
+    title: Optional[StrictStr] = "Untitled"
+    tags: List[StrictStr] = Field(default_factory=list)
+    since: Optional[datetime.date] = None
+
+    @classmethod
+    def from_dict(cls, obj):
+        return cls.model_validate(obj)
+
+
+class TestApiClient(unittest.TestCase):
+    """ApiClient unit tests"""
+
+    def setUp(self) -> None:
+        self.api_client = ApiClient()
+
+    def test_deserialize_model_list(self) -> None:
+        projects = self.api_client.deserialize(
+            json.dumps([PROJECT, None, PROJECT]),
+            "List[ProjectResponse]",
+        )
+
+        self.assertEqual(len(projects), 3)
+        self.assertIsInstance(projects[0], ProjectResponse)
+        self.assertIsNone(projects[1])
+        self.assertEqual(projects[2].type, ProjectType.COMMERCIAL)
+        self.assertEqual(projects[2].state.usable_features[0].name, "BASIC")
+
+    def test_deserialize_nested_containers(self) -> None:
+        data = self.api_client.deserialize(
+            json.dumps({"a": [1, 2], "b": [3]}),
+            "Dict[str, List[int]]",
+        )
+
+        self.assertEqual(data, {"a": [1, 2], "b": [3]})
+
+    def test_deserialize_native_types(self) -> None:
+        self.assertEqual(self.api_client.deserialize('"2024-02-03"', "date"), datetime.date(2024, 2, 3))
+        self.assertEqual(self.api_client.deserialize('"FREE"', "ProjectType"), ProjectType.FREE)
+        self.assertEqual(self.api_client.deserialize('{"x": 1}', "object"), {"x": 1})
+        self.assertIsNone(self.api_client.deserialize('null', "ProjectResponse"))
+
+    def test_deserializers_are_compiled_once(self) -> None:
+        self.api_client.deserialize(json.dumps([PROJECT]), "List[ProjectResponse]")
+        deserializer = ApiClient._deserializers["List[ProjectResponse]"]
+
+        ApiClient().deserialize(json.dumps([PROJECT]), "List[ProjectResponse]")
+
+        self.assertIs(ApiClient._deserializers["List[ProjectResponse]"], deserializer)
+        self.assertIn("ProjectResponse", ApiClient._deserializers)
+
+    def test_response_deserialize_validates_json_bytes(self) -> None:
+        response = self.make_response(json.dumps([PROJECT]), "application/json; charset=utf-8")
+
+        result = self.api_client.response_deserialize(response, {"200": "List[ProjectResponse]"})
+
+        self.assertEqual(result.data, [ProjectResponse.from_dict(PROJECT)])
+        self.assertIsNotNone(ApiClient._json_adapters["List[ProjectResponse]"])
+
+    def test_response_deserialize_falls_back_for_non_json(self) -> None:
+        response = self.make_response(json.dumps(PROJECT), "text/plain")
+
+        result = self.api_client.response_deserialize(response, {"200": "ProjectResponse"})
+
+        self.assertEqual(result.data, ProjectResponse.from_dict(PROJECT))
+
+    def test_response_deserialize_skips_adapter_for_native_types(self) -> None:
+        response = self.make_response('{"a": 1}', "application/json")
+
+        result = self.api_client.response_deserialize(response, {"200": "Dict[str, int]"})
+
+        self.assertEqual(result.data, {"a": 1})
+        self.assertIsNone(ApiClient._json_adapters["Dict[str, int]"])
+
+    def test_trusted_responses_construct_models(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        api_client = ApiClient(configuration)
+
+        projects = api_client.deserialize(json.dumps([PROJECT, None]), "List[ProjectResponse]")
+
+        self.assertEqual(projects, [ProjectResponse.from_dict(PROJECT), None])
+        self.assertIsInstance(projects[0].type, ProjectType)
+        self.assertIsInstance(projects[0].user_id_type, ProjectUserIDType)
+        self.assertIsInstance(projects[0].state, ProjectStateResponse)
+        self.assertIsInstance(projects[0].state.usable_features[0], ProjectFeatureResponse)
+        self.assertIsNone(projects[0].mailgun_config)
+
+    def test_trusted_responses_skip_validation(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+
+        project = ApiClient(configuration).deserialize(json.dumps(dict(PROJECT, max_users="100")), "ProjectResponse")
+
+        self.assertEqual(project.max_users, "100")
+        with self.assertRaises(ValueError):
+            self.api_client.deserialize(json.dumps(dict(PROJECT, max_users="100")), "ProjectResponse")
+
+    def test_trusted_responses_skip_json_validation(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        response = self.make_response(json.dumps(dict(PROJECT, max_users="100")), "application/json; charset=utf-8")
+
+        result = ApiClient(configuration).response_deserialize(response, {"200": "ProjectResponse"})
+
+        self.assertEqual(result.data.max_users, "100")
+
+    def test_trusted_responses_fill_defaults(self) -> None:
+        configuration = Configuration()
+        configuration.trusted_responses = True
+        api_client = ApiClient(configuration)
+
+        for body in ('{}', '{"number": 2, "since": "2024-02-03"}', '{"title": null, "tags": ["a"]}'):
+            trusted = api_client.deserialize(body, Page)
+            validated = self.api_client.deserialize(body, Page)
+
+            self.assertEqual(trusted, validated)
+            self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+        self.assertIsNot(api_client.deserialize('{}', Page).tags, api_client.deserialize('{}', Page).tags)
+
+    def test_static_headers_are_built_once(self) -> None:
+        configuration = Configuration(host="https://example.com")
+        configuration.access_token = "first"
+        api_client = ApiClient(configuration, cookie="session=1")
+
+        with mock.patch.object(configuration, "_auth_settings", wraps=configuration._auth_settings) as auth_settings:
+            for _ in range(3):
+                _, _, headers, _, _ = api_client.param_serialize(
+                    "GET", "/v1/projects", header_params={"Accept": "application/json"}, auth_settings=["BearerAuth"],
+                )
+
+        self.assertEqual(auth_settings.call_count, 1)
+        self.assertEqual(headers, {
+            "Accept": "application/json",
+            "User-Agent": api_client.user_agent,
+            "Accept-Encoding": configuration.accept_encoding,
+            "Cookie": "session=1",
+            "Authorization": "Bearer first",
+        })
+
+    def test_static_headers_follow_changes(self) -> None:
+        configuration = Configuration(host="https://example.com")
+        api_client = ApiClient(configuration)
+
+        def headers(**kwargs):
+            return api_client.param_serialize("GET", "/v1/projects", auth_settings=["BearerAuth"], **kwargs)[2]
+
+        self.assertNotIn("Authorization", headers())
+        configuration.access_token = "first"
+        self.assertEqual(headers()["Authorization"], "Bearer first")
+        configuration.access_token = "second"
+        self.assertEqual(headers()["Authorization"], "Bearer second")
+        api_client.default_headers["X-Tenant"] = "1"
+        self.assertEqual(headers()["X-Tenant"], "1")
+        api_client.set_default_header("X-Tenant", "2")
+        self.assertEqual(headers()["X-Tenant"], "2")
+        del api_client.default_headers["X-Tenant"]
+        self.assertNotIn("X-Tenant", headers())
+        api_client.default_headers = {"X-Other": "3"}
+        self.assertEqual(headers()["X-Other"], "3")
+        api_client.cookie = "session=2"
+        self.assertEqual(headers()["Cookie"], "session=2")
+        self.assertEqual(
+            headers(_request_auth={"in": "header", "type": "bearer", "key": "Authorization", "value": "Bearer once"})["Authorization"],
+            "Bearer once",
+        )
+        self.assertNotIn("Authorization", api_client.param_serialize("GET", "/heartbeat", auth_settings=[])[2])
+
+    @staticmethod
+    def make_response(body, content_type, status=200):
+        response = rest.RESTResponse(urllib3.HTTPResponse(
+            body=body.encode("utf-8"),
+            headers={"Content-Type": content_type},
+            status=status,
+        ))
+        response.read()
+        return response
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import itertools
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from appifyhub.api.async_messaging_api import AsyncMessagingApi
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.async_users_api import AsyncUsersApi
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
+from appifyhub.models.project_create_request import ProjectCreateRequest
+from appifyhub.models.project_response import ProjectResponse
+
+TIMESTAMP = "2024-01-01T00:00:00Z"
+PROJECT_IDS = itertools.count(1)
+
+
+async def add_project(request):
+    body = await request.json()
+    await asyncio.sleep(0.01)
+    return web.json_response({
+        "project_id": next(PROJECT_IDS),
+        "type": body["type"],
+        "state": {"status": "ACTIVE", "usable_features": [], "unusable_features": []},
+        "user_id_type": body["user_id_type"],
+        "name": body["name"],
+        "max_users": 100,
+        "anyone_can_search": False,
+        "on_hold": False,
+        "requires_signup_codes": False,
+        "max_signup_codes_per_user": 0,
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP,
+    })
+
+
+async def add_template(request):
+    body = await request.json()
+    return web.json_response(dict(body, id=7, created_at=TIMESTAMP, updated_at=TIMESTAMP))
+
+
+async def force_verify_user(request):
+    return web.json_response({"message": "Unavailable"}, status=503)
+
+
+class TestAsyncApiClient(unittest.TestCase):
+    """AsyncApiClient unit tests"""
+
+    def run_with_server(self, scenario):
+        async def run():
+            app = web.Application()
+            app.router.add_post("/v1/projects", add_project)
+            app.router.add_post("/v1/projects/{project_id}/messaging/template", add_template)
+            app.router.add_post("/v1/universal/users/{universal_id}/force-verify", force_verify_user)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                configuration = Configuration(host=str(server.make_url("")).rstrip("/"))
+                async with AsyncApiClient(configuration) as api_client:
+                    await scenario(api_client)
+            finally:
+                await server.close()
+
+        asyncio.run(run())
+
+    def test_add_projects_concurrently(self) -> None:
+        async def scenario(api_client):
+            api = AsyncProjectsApi(api_client)
+            requests = [
+                ProjectCreateRequest(
+                    type="FREE",
+                    user_id_type="EMAIL",
+                    owner_universal_id="creator$0",
+                    name="Tenant %d" % index,
+                )
+                for index in range(20)
+            ]
+            projects = await asyncio.gather(*[api.add_project(request) for request in requests])
+            self.assertTrue(all(isinstance(project, ProjectResponse) for project in projects))
+            self.assertEqual(
+                sorted(project.name for project in projects),
+                sorted(request.name for request in requests),
+            )
+
+        self.run_with_server(scenario)
+
+    def test_add_template_with_http_info(self) -> None:
+        async def scenario(api_client):
+            request = MessageTemplateCreateRequest(
+                name="welcome",
+                language_tag="en",
+                title="Welcome",
+                content="Hi {{user.name}}",
+                is_html=False,
+            )
+            response = await AsyncMessagingApi(api_client).add_template_with_http_info(1, request)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data.id, 7)
+            self.assertEqual(response.data.content, request.content)
+
+        self.run_with_server(scenario)
+
+    def test_error_status_raises(self) -> None:
+        async def scenario(api_client):
+            with self.assertRaises(ServiceException):
+                await AsyncUsersApi(api_client).force_verify_user("user$1")
+
+        self.run_with_server(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from benchmarks import suite
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Benchmark suite smoke tests"""
+
+    def test_run_reports_every_benchmark(self) -> None:
+        report = suite.run(cold_runs=1, iterations=2, warmup=1)
+
+        self.assertEqual(report["package"], "appifyhub")
+        self.assertEqual(
+            set(report["benchmarks"]),
+            {
+                "import_appifyhub",
+                "api_client_construction.cold",
+                "api_client_construction.warm",
+                "first_request.get_project",
+                "steady_state.get_project",
+                "steady_state.search_templates",
+                "steady_state.materialize",
+            },
+        )
+        for result in report["benchmarks"].values():
+            self.assertLessEqual(result["min"], result["median"])
+            self.assertLessEqual(result["median"], result["max"])
+
+    def test_summarize(self) -> None:
+        summary = suite.summarize([3.0, 1.0, 2.0, 4.0])
+
+        self.assertEqual(summary["runs"], 4)
+        self.assertEqual(summary["min"], 1.0)
+        self.assertEqual(summary["median"], 2.5)
+        self.assertEqual(summary["mean"], 2.5)
+        self.assertEqual(summary["p95"], 4.0)
+        self.assertEqual(summary["max"], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
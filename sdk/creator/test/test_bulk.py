@@ -0,0 +1,115 @@
+import io
+import threading
+import time
+import unittest
+
+import urllib3
+
+from appifyhub import bulk
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import BadRequestException, ServiceException
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+class TestBulk(unittest.TestCase):
+    """Bulk runner unit tests"""
+
+    def setUp(self) -> None:
+        self.api_client = ApiClient(Configuration(host="http://127.0.0.1:1"))
+
+    def test_rate_limiter_spaces_calls(self) -> None:
+        clock = FakeClock()
+        limiter = bulk.RateLimiter(10, burst=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            limiter.acquire()
+        clock.now = 10.0
+        limiter.acquire()
+
+        self.assertEqual([round(s, 3) for s in clock.sleeps], [0.1, 0.2])
+
+    def test_inputs_are_read_as_results_are_consumed(self) -> None:
+        read = []
+
+        def items():
+            for index in range(100):
+                read.append(index)
+                yield index
+
+        runner = bulk.BulkRunner(self.api_client, concurrency=2, max_pending=4)
+        results = runner.run(lambda item: item * 2, items())
+        first = next(results)
+        self.assertLessEqual(len(read), 5)
+
+        values = sorted([first.value] + [result.value for result in results])
+        self.assertEqual(values, [index * 2 for index in range(100)])
+
+    def test_calls_in_flight_are_bounded(self) -> None:
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def call(item):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+
+        results = list(bulk.BulkRunner(self.api_client, concurrency=3).run(call, range(20)))
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(in_flight[1], 3)
+
+    def test_only_unprocessed_calls_are_retried(self) -> None:
+        attempts = []
+
+        def call(item):
+            attempts.append(item)
+            if item == "flaky" and attempts.count(item) < 3:
+                raise ServiceException(status=503, reason="Service Unavailable")
+            if item == "failing":
+                raise ServiceException(status=502, reason="Bad Gateway")
+            if item == "timeout":
+                raise urllib3.exceptions.ReadTimeoutError(None, "/", "Read timed out")
+            if item == "invalid":
+                raise BadRequestException(status=400, reason="Bad Request")
+            return item
+
+        runner = bulk.BulkRunner(self.api_client, concurrency=1)
+        runner.retry_policy.backoff_base = 0.001
+        flaky, failing, timeout, invalid = sorted(
+            runner.run(call, ["flaky", "failing", "timeout", "invalid"]), key=lambda result: result.index,
+        )
+
+        self.assertEqual((flaky.ok, flaky.value, flaky.attempts), (True, "flaky", 3))
+        for result in (failing, timeout, invalid):
+            self.assertEqual((result.ok, result.attempts), (False, 1))
+        self.assertIsInstance(invalid.error, BadRequestException)
+
+    def test_reads_csv_and_jsonl(self) -> None:
+        rows = io.StringIO("user_id,allows_spam,company.name,name\nana,yes,Acme,\n")
+        lines = io.StringIO('{"user_id": "ana"}\n\nnot json\n')
+
+        self.assertEqual(
+            list(bulk.read_csv(rows, converters={"allows_spam": bulk.parse_bool})),
+            [{"user_id": "ana", "allows_spam": True, "company": {"name": "Acme"}}],
+        )
+        self.assertEqual(list(bulk.read_jsonl(lines)), [{"user_id": "ana"}, "not json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
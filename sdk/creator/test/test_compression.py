@@ -0,0 +1,106 @@
+import asyncio
+import gzip
+import unittest
+import zlib
+
+from appifyhub import compression, metrics
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ApiException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+
+BODY = b'{"name": "Ana"}' * 1000
+
+
+def decode(content_encoding, data, chunk_size=100):
+    decoder = compression.Decoder(content_encoding)
+    for start in range(0, len(data), chunk_size):
+        decoder.feed(data[start:start + chunk_size])
+    return decoder.finish(), decoder.wire_bytes
+
+
+class TestCompression(unittest.TestCase):
+    """Response compression unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(compression=True).start()
+        self.addCleanup(self.hub.stop)
+        creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        for index in range(30):
+            self.hub.add_project("Calculator %d" % index, creator["universal_id"])
+        self.metrics = metrics.Metrics()
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(creator["universal_id"])
+        self.configuration.metrics = self.metrics
+        self.accept_encodings = []
+        handle = self.hub.handle
+
+        def record_accept_encoding(method, target, headers, body, client):
+            self.accept_encodings.append(headers.get("Accept-Encoding"))
+            return handle(method, target, headers, body, client)
+
+        self.hub.handle = record_accept_encoding
+
+    def test_decodes_chunked_bodies(self) -> None:
+        gzipped = gzip.compress(BODY)
+
+        self.assertEqual(decode("gzip", gzipped), (BODY, len(gzipped)))
+        self.assertEqual(decode("deflate", zlib.compress(BODY))[0], BODY)
+        self.assertEqual(decode("deflate", zlib.compress(BODY)[2:-4])[0], BODY)
+        self.assertEqual(decode("gzip", gzip.compress(BODY[:10]) + gzip.compress(BODY[10:]))[0], BODY)
+        self.assertEqual(decode("identity", BODY), (BODY, len(BODY)))
+        # unknown codings are kept as received
+        self.assertEqual(decode("zstd", b"zstd data"), (b"zstd data", 9))
+        self.assertFalse(compression.Decoder("gzip, zstd").decodes)
+        with self.assertRaises(ApiException):
+            decode("gzip", b"not gzip")
+
+    def test_negotiates_and_decompresses_responses(self) -> None:
+        projects_api = ProjectsApi(ApiClient(self.configuration))
+
+        projects = projects_api.get_projects()
+        raw = projects_api.get_projects_without_preload_content()
+
+        self.assertEqual(len(projects), 30)
+        self.assertEqual(self.accept_encodings, [compression.default_accept_encoding()] * 2)
+        self.assertEqual(raw.headers["Content-Encoding"], "gzip")
+        get_projects = self.metrics.snapshot()["get_projects"]
+        self.assertEqual(get_projects.body_bytes, len(raw.data))
+        self.assertLess(get_projects.wire_bytes, get_projects.body_bytes)
+        self.assertGreater(get_projects.compression_ratio, 1)
+        self.assertIn(
+            'appifyhub_response_wire_bytes_total{operation="get_projects"} %d' % get_projects.wire_bytes,
+            self.metrics.to_prometheus(),
+        )
+
+    def test_negotiation_can_be_disabled(self) -> None:
+        self.configuration.accept_encoding = None
+        projects_api = ProjectsApi(ApiClient(self.configuration))
+
+        projects_api.get_projects()
+
+        # http.client asks for `identity` when no coding is requested
+        self.assertEqual(self.accept_encodings, ["identity"])
+        self.assertEqual(self.metrics.snapshot()["get_projects"].compression_ratio, 1.0)
+
+    def test_async_client_decompresses_responses(self) -> None:
+        async def fetch_projects():
+            async with AsyncApiClient(self.configuration) as api_client:
+                projects_api = AsyncProjectsApi(api_client)
+                return await asyncio.gather(
+                    *(projects_api.get_projects() for _ in range(3))
+                )
+
+        results = asyncio.run(fetch_projects())
+
+        self.assertEqual([len(projects) for projects in results], [30, 30, 30])
+        self.assertEqual(self.accept_encodings, [compression.default_accept_encoding()] * 3)
+        get_projects = self.metrics.snapshot()["get_projects"]
+        self.assertLess(get_projects.wire_bytes, get_projects.body_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
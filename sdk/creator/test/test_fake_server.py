@@ -0,0 +1,111 @@
+import unittest
+
+from appifyhub.api.auth_api import AuthApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api.users_api import UsersApi
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException, ServiceException, UnauthorizedException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.models.creator_credentials_request import CreatorCredentialsRequest
+from appifyhub.models.creator_signup_request import CreatorSignupRequest
+from appifyhub.models.detect_variables_request import DetectVariablesRequest
+from appifyhub.models.message_inputs_request import MessageInputsRequest
+from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
+from appifyhub.models.project_create_request import ProjectCreateRequest
+
+
+class TestFakeServer(unittest.TestCase):
+    """FakeAppifyHub unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.api_client = ApiClient(Configuration(host=self.hub.host))
+
+    def sign_up_creator(self) -> str:
+        creator = UsersApi(self.api_client).add_user(
+            CreatorSignupRequest(user_id="ana@example.com", raw_signature="secret", name="Ana", type="PERSONAL")
+        )
+        token = AuthApi(self.api_client).authenticate(
+            CreatorCredentialsRequest(universal_id=creator.universal_id, signature="secret")
+        )
+        self.api_client.configuration.access_token = token.token_value
+        return creator.universal_id
+
+    def test_signup_authenticate_and_manage_projects(self) -> None:
+        universal_id = self.sign_up_creator()
+        projects_api = ProjectsApi(self.api_client)
+
+        project = projects_api.add_project(
+            ProjectCreateRequest(type="FREE", user_id_type="EMAIL", owner_universal_id=universal_id, name="Calculator")
+        )
+        projects_api.remove_project(project.project_id)
+
+        self.assertEqual(universal_id, "ana@example.com$%d" % CREATOR_PROJECT_ID)
+        self.assertEqual(project.name, "Calculator")
+        self.assertEqual(projects_api.get_projects(), [])
+        with self.assertRaises(NotFoundException):
+            projects_api.get_project(project.project_id)
+
+    def test_templates_follow_service_semantics(self) -> None:
+        self.sign_up_creator()
+        project = self.hub.add_project("Calculator", language_tag="de")
+        user = self.hub.add_user(project["project_id"], "bob", name="Bob", language_tag="en")
+        messaging_api = MessagingApi(self.api_client)
+        for language_tag in ("en", "de"):
+            messaging_api.add_template(
+                project["project_id"],
+                MessageTemplateCreateRequest(
+                    name="welcome",
+                    language_tag=language_tag,
+                    title="Welcome",
+                    content="Hi {{user.name}} ({{project.name}}) {{unknown}}",
+                    is_html=False,
+                ),
+            )
+
+        by_user = messaging_api.materialize(
+            project["project_id"],
+            name="welcome",
+            message_inputs_request=MessageInputsRequest(user_id=user["universal_id"], project_id=project["project_id"]),
+        )
+        by_project = messaging_api.materialize(
+            project["project_id"],
+            name="welcome",
+            message_inputs_request=MessageInputsRequest(project_id=project["project_id"]),
+        )
+        variables = messaging_api.detect_variables(
+            project["project_id"], DetectVariablesRequest(content="{{user.signature}} {{user.name}}")
+        )
+
+        self.assertEqual(by_user.template.language_tag, "en")
+        self.assertEqual(by_user.materialized, "Hi Bob (Calculator) {{unknown}}")
+        self.assertEqual(by_project.template.language_tag, "de")
+        self.assertEqual(by_project.materialized, "Hi ****** (Calculator) {{unknown}}")
+        self.assertEqual([variable.code for variable in variables], ["user.name", "user.signature"])
+        self.assertEqual(len(messaging_api.search_templates(project["project_id"], name="welcome")), 2)
+
+    def test_requires_known_token(self) -> None:
+        with self.assertRaises(UnauthorizedException):
+            ProjectsApi(self.api_client).get_project(CREATOR_PROJECT_ID)
+
+    def test_injected_failures(self) -> None:
+        self.sign_up_creator()
+        projects_api = ProjectsApi(self.api_client)
+        self.hub.fail_next(status=500, operation="get_project", retry_after=2)
+
+        with self.assertRaises(ServiceException) as context:
+            projects_api.get_project(CREATOR_PROJECT_ID)
+        self.assertEqual(context.exception.headers["Retry-After"], "2")
+        self.assertEqual(projects_api.get_project(CREATOR_PROJECT_ID).name, "Appify Hub")
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+        self.hub.error_rate = 1.0
+        with self.assertRaises(ServiceException):
+            projects_api.get_project(CREATOR_PROJECT_ID)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import importlib.util
+import unittest
+
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.models.project_create_request import ProjectCreateRequest
+from appifyhub.retry import RetryPolicy
+
+HTTPX_INSTALLED = all(importlib.util.find_spec(name) is not None for name in ("httpx", "h2"))
+
+
+@unittest.skipUnless(HTTPX_INSTALLED, "the http2 extra (httpx[http2]) is not installed")
+class TestHTTP2RESTClientObject(unittest.TestCase):
+    """HTTP/2 transport unit tests"""
+
+    def setUp(self) -> None:
+        from appifyhub import http2_rest
+        self.http2_rest = http2_rest
+
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", self.creator["universal_id"])
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.creator["universal_id"])
+        self.configuration.http2 = True
+        self.api_client = ApiClient(self.configuration)
+        self.addCleanup(self.api_client.rest_client.close)
+
+    def test_is_selected_through_the_configuration(self) -> None:
+        self.assertIsInstance(self.api_client.rest_client, self.http2_rest.HTTP2RESTClientObject)
+
+    def test_makes_requests(self) -> None:
+        projects_api = ProjectsApi(self.api_client)
+        request = ProjectCreateRequest(
+            type="FREE", user_id_type="EMAIL", owner_universal_id=self.creator["universal_id"], name="Tenant",
+        )
+
+        self.assertEqual(projects_api.get_project(self.project["project_id"]).name, "Calculator")
+        project = projects_api.add_project(request)
+        with self.assertRaises(NotFoundException):
+            projects_api.get_project(999)
+
+        self.assertEqual(self.hub.projects[project.project_id]["name"], "Tenant")
+
+    def test_connection_failures_are_retried(self) -> None:
+        configuration = Configuration(host="http://127.0.0.1:1")
+        configuration.http2 = True
+        configuration.retry_policy = RetryPolicy(max_attempts=2, backoff_base=0.001, budget=None)
+        api_client = ApiClient(configuration)
+        self.addCleanup(api_client.rest_client.close)
+
+        with self.assertRaises(Exception) as raised:
+            ProjectsApi(api_client).get_project(self.project["project_id"])
+
+        self.assertEqual(api_client.rest_client.classify_error(raised.exception), "connect")
+
+    def test_async_client_multiplexes_requests(self) -> None:
+        async def get_projects():
+            async with AsyncApiClient(self.configuration) as api_client:
+                self.assertIsInstance(api_client.rest_client, self.http2_rest.AsyncHTTP2RESTClientObject)
+                projects_api = AsyncProjectsApi(api_client)
+                return await asyncio.gather(*(projects_api.get_project(self.project["project_id"]) for _ in range(10)))
+
+        projects = asyncio.run(get_projects())
+
+        self.assertEqual({project.name for project in projects}, {"Calculator"})
+
+
+if __name__ == '__main__':
+    unittest.main()
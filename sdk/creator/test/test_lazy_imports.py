@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import appifyhub
+import appifyhub.api
+import appifyhub.models
+
+SDK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules_after(code):
+    """Runs the code in a fresh interpreter and returns the loaded appifyhub modules."""
+    script = code + "\nimport json, sys\nprint(json.dumps(sorted(m for m in sys.modules if m.startswith(('appifyhub', 'dateutil')))))"
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=SDK_ROOT)
+    return set(json.loads(output.decode("utf-8").splitlines()[-1]))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Lazy package imports unit tests"""
+
+    def test_import_loads_no_submodules(self) -> None:
+        self.assertEqual(loaded_modules_after("import appifyhub"), {"appifyhub"})
+
+    def test_attribute_access_loads_only_what_is_needed(self) -> None:
+        modules = loaded_modules_after("from appifyhub import AuthApi")
+
+        self.assertIn("appifyhub.api.auth_api", modules)
+        self.assertIn("appifyhub.models.token_response", modules)
+        self.assertNotIn("appifyhub.api.projects_api", modules)
+        self.assertNotIn("appifyhub.models.project_response", modules)
+        self.assertNotIn("dateutil", modules)
+
+    def test_public_names_resolve(self) -> None:
+        for package in (appifyhub, appifyhub.api, appifyhub.models):
+            for name in package.__all__:
+                self.assertEqual(getattr(package, name).__name__, name)
+        self.assertIs(getattr(appifyhub.models, "ProjectResponse"), appifyhub.ProjectResponse)
+        self.assertIs(appifyhub.AsyncUsersApi, appifyhub.api.AsyncUsersApi)
+        self.assertIn("UsersApi", dir(appifyhub))
+
+    def test_submodules_resolve_as_attributes(self) -> None:
+        self.assertIs(appifyhub.rest, sys.modules["appifyhub.rest"])
+        self.assertIsNone(getattr(appifyhub.models, "Missing", None))
+        with self.assertRaises(AttributeError):
+            appifyhub.missing_module
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+from appifyhub import metrics
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+
+
+class TestMetrics(unittest.TestCase):
+    """Per-operation metrics unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", creator["universal_id"])
+        self.metrics = metrics.Metrics()
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(creator["universal_id"])
+        self.configuration.metrics = self.metrics
+        self.projects_api = ProjectsApi(ApiClient(self.configuration))
+
+    def test_records_requests_and_phases_per_operation(self) -> None:
+        self.projects_api.get_project(self.project["project_id"])
+        self.projects_api.get_project(self.project["project_id"])
+        with self.assertRaises(NotFoundException):
+            self.projects_api.get_project(999)
+        self.projects_api.get_projects()
+
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(sorted(snapshot), ["get_project", "get_projects"])
+        get_project = snapshot["get_project"]
+        self.assertEqual(get_project.requests, {"2xx": 2, "4xx": 1})
+        self.assertEqual((get_project.wait.count, get_project.read.count, get_project.deserialize.count), (3, 3, 3))
+        self.assertGreater(get_project.wait.sum, 0)
+        self.assertLessEqual(get_project.wait.quantile(0.5), get_project.wait.quantile(0.99))
+        self.assertEqual(snapshot["get_projects"].requests, {"2xx": 1})
+
+    def test_records_transport_failures(self) -> None:
+        configuration = Configuration(host="http://127.0.0.1:1")
+        configuration.retries = 0
+        configuration.metrics = self.metrics
+
+        with self.assertRaises(Exception):
+            ProjectsApi(ApiClient(configuration)).get_project(self.project["project_id"])
+
+        get_project = self.metrics.snapshot()["get_project"]
+        self.assertEqual(get_project.requests, {metrics.ERROR: 1})
+        self.assertEqual(get_project.wait.count, 0)
+
+    def test_async_client_records_the_same_metrics(self) -> None:
+        async def get_project():
+            async with AsyncApiClient(self.configuration) as api_client:
+                return await AsyncProjectsApi(api_client).get_project(self.project["project_id"])
+
+        asyncio.run(get_project())
+
+        get_project = self.metrics.snapshot()["get_project"]
+        self.assertEqual(get_project.requests, {"2xx": 1})
+        self.assertEqual((get_project.read.count, get_project.deserialize.count), (1, 1))
+
+    def test_exports_prometheus_text(self) -> None:
+        self.metrics.record_response("get_project", 200, 0.003)
+        self.metrics.record_response("get_project", 503, 0.2)
+        self.metrics.record_read("get_project", 0.0001)
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn('appifyhub_requests_total{operation="get_project",status_class="5xx"} 1\n', text)
+        self.assertIn('# TYPE appifyhub_wait_seconds histogram\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_project",le="0.005"} 1\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_project",le="0.25"} 2\n', text)
+        self.assertIn('appifyhub_wait_seconds_bucket{operation="get_project",le="+Inf"} 2\n', text)
+        self.assertIn('appifyhub_read_seconds_count{operation="get_project"} 1\n', text)
+        self.assertIn('appifyhub_deserialize_seconds_count{operation="get_project"} 0\n', text)
+
+    def test_nothing_is_recorded_when_disabled(self) -> None:
+        self.configuration.metrics = None
+
+        self.projects_api.get_project(self.project["project_id"])
+
+        self.assertEqual(self.metrics.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
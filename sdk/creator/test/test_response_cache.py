@@ -0,0 +1,170 @@
+import asyncio
+import copy
+import unittest
+
+from appifyhub import response_cache
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException, ServiceException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    """Response cache unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(etags=True).start()
+        self.addCleanup(self.hub.stop)
+        self.creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", self.creator["universal_id"])
+        self.other_project = self.hub.add_project("Notes", self.creator["universal_id"])
+        self.template = self.hub.add_template(self.project["project_id"], "welcome", "Hi {{user.name}}")
+        self.clock = FakeClock()
+        self.store = response_cache.InMemoryStore(clock=self.clock)
+        self.cache = self.make_cache()
+        self.api_client = self.make_api_client(self.cache)
+        self.projects_api = ProjectsApi(self.api_client)
+        self.messaging_api = MessagingApi(self.api_client)
+
+    def make_cache(self, **kwargs):
+        return response_cache.ResponseCache(store=self.store, revalidate_for=60, clock=self.clock, **kwargs)
+
+    def make_api_client(self, cache):
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(self.creator["universal_id"])
+        configuration.response_cache = cache
+        return ApiClient(configuration)
+
+    def test_reads_are_served_from_the_cache_until_they_expire(self) -> None:
+        for _ in range(3):
+            self.assertEqual(self.projects_api.get_project(self.project["project_id"]).name, "Calculator")
+        self.assertEqual(self.hub.calls["get_project"], 1)
+
+        self.clock.now += response_cache.DEFAULT_TTLS["get_project"] + 60
+        self.projects_api.get_project(self.project["project_id"])
+
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+    def test_expired_responses_are_revalidated(self) -> None:
+        project_id = self.project["project_id"]
+        self.messaging_api.fetch_template_by_id(project_id, self.template["id"])
+        self.clock.now += response_cache.DEFAULT_TTLS["fetch_template_by_id"]
+
+        for _ in range(2):
+            template = self.messaging_api.fetch_template_by_id(project_id, self.template["id"])
+
+        self.assertEqual(template.content, "Hi {{user.name}}")
+        self.assertEqual(self.hub.calls["fetch_template_by_id"], 2)
+        self.assertEqual(self.hub.not_modified, 1)
+
+    def test_mutations_invalidate_the_affected_reads(self) -> None:
+        self.projects_api.get_project(self.project["project_id"])
+        self.projects_api.get_project(self.other_project["project_id"])
+
+        self.projects_api.remove_project(self.project["project_id"])
+
+        with self.assertRaises(NotFoundException):
+            self.projects_api.get_project(self.project["project_id"])
+        self.projects_api.get_project(self.other_project["project_id"])
+        self.assertEqual(self.hub.calls["get_project"], 3)
+
+    def test_template_changes_invalidate_template_reads(self) -> None:
+        project_id = self.project["project_id"]
+        self.assertEqual(len(self.messaging_api.search_templates(project_id)), 1)
+        self.messaging_api.fetch_template_by_id(project_id, self.template["id"])
+
+        self.messaging_api.add_template(
+            project_id,
+            MessageTemplateCreateRequest(name="goodbye", language_tag="en", title="Bye", content="Bye", is_html=False),
+        )
+        self.assertEqual(len(self.messaging_api.search_templates(project_id)), 2)
+
+        self.messaging_api.delete_template_by_id(project_id, self.template["id"])
+        with self.assertRaises(NotFoundException):
+            self.messaging_api.fetch_template_by_id(project_id, self.template["id"])
+
+    def test_decoded_responses_are_cached_without_their_coding(self) -> None:
+        self.hub.compression = True
+        self.projects_api.get_project(self.project["project_id"])
+
+        response = self.projects_api.get_project_with_http_info(self.project["project_id"])
+
+        self.assertEqual(self.hub.calls["get_project"], 1)
+        self.assertEqual(response.data.name, "Calculator")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertNotIn("Content-Length", response.headers)
+
+    def test_failures_are_not_cached(self) -> None:
+        self.hub.fail_next(status=503, operation="get_project")
+        with self.assertRaises(ServiceException):
+            self.projects_api.get_project(self.project["project_id"])
+
+        self.projects_api.get_project(self.project["project_id"])
+        self.projects_api.get_project(self.project["project_id"])
+
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+    def test_store_is_shared_between_caches(self) -> None:
+        other_api_client = self.make_api_client(self.make_cache())
+        other_api_client.configuration.access_token = self.api_client.configuration.access_token
+        other_projects_api = ProjectsApi(other_api_client)
+        self.projects_api.get_project(self.project["project_id"])
+        other_projects_api.get_project(self.project["project_id"])
+        self.assertEqual(self.hub.calls["get_project"], 1)
+
+        other_projects_api.remove_project(self.project["project_id"])
+
+        with self.assertRaises(NotFoundException):
+            self.projects_api.get_project(self.project["project_id"])
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+    def test_copies_of_the_configuration_share_the_cache(self) -> None:
+        configuration = copy.deepcopy(self.api_client.configuration)
+
+        self.assertIs(configuration.response_cache, self.cache)
+
+    def test_async_reads_are_cached(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.api_client.configuration) as api_client:
+                projects_api = AsyncProjectsApi(api_client)
+                first = await projects_api.get_project(self.project["project_id"])
+                self.clock.now += response_cache.DEFAULT_TTLS["get_project"]
+                second = await projects_api.get_project(self.project["project_id"])
+                third = await projects_api.get_project(self.project["project_id"])
+                return [first.name, second.name, third.name]
+
+        self.assertEqual(asyncio.run(scenario()), ["Calculator"] * 3)
+        self.assertEqual(self.hub.calls["get_project"], 2)
+        self.assertEqual(self.hub.not_modified, 1)
+
+    def test_in_memory_store_evicts_least_recently_used(self) -> None:
+        store = response_cache.InMemoryStore(max_entries=2, clock=self.clock)
+        store.set("a", 1, None)
+        store.set("b", 2, 10)
+        store.get("a")
+        store.set("c", 3, None)
+
+        self.assertEqual((store.get("a"), store.get("b"), store.get("c")), (1, None, 3))
+
+        store.set("b", 2, 10)
+        self.clock.now += 10
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(len(store), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
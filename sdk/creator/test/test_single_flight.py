@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import ServiceException
+from appifyhub.models.message_template_create_request import MessageTemplateCreateRequest
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.single_flight import SingleFlight
+
+CONCURRENCY = 8
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Request coalescing unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub(latency=0.2).start()
+        self.addCleanup(self.hub.stop)
+        self.creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", self.creator["universal_id"])
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.creator["universal_id"])
+        self.configuration.coalesce_requests = True
+        self.api_client = ApiClient(self.configuration)
+
+    def concurrently(self, call):
+        barrier = threading.Barrier(CONCURRENCY)
+
+        def run(index):
+            barrier.wait()
+            try:
+                return call(index)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(CONCURRENCY) as pool:
+            return list(pool.map(run, range(CONCURRENCY)))
+
+    def get_project(self, api_client=None):
+        return ProjectsApi(api_client or self.api_client).get_project(self.project["project_id"])
+
+    def add_template(self, index):
+        return MessagingApi(self.api_client).add_template(
+            self.project["project_id"],
+            MessageTemplateCreateRequest(name="welcome%d" % index, language_tag="en", title="Hi", content="Hi", is_html=False),
+        )
+
+    def test_identical_reads_share_one_request(self) -> None:
+        projects = self.concurrently(lambda _: self.get_project())
+
+        self.assertEqual([project.name for project in projects], ["Calculator"] * CONCURRENCY)
+        self.assertEqual(self.hub.calls["get_project"], 1)
+        self.assertEqual(self.api_client._single_flight.coalesced, CONCURRENCY - 1)
+
+        self.get_project()
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+    def test_failures_are_shared(self) -> None:
+        self.hub.fail_next(status=503, operation="get_project")
+
+        errors = self.concurrently(lambda _: self.get_project())
+
+        self.assertTrue(all(isinstance(e, ServiceException) for e in errors))
+        self.assertEqual(self.hub.calls["get_project"], 1)
+
+    def test_different_credentials_are_not_coalesced(self) -> None:
+        other = Configuration(host=self.hub.host)
+        other.access_token = self.hub.create_token(self.creator["universal_id"])
+        other.coalesce_requests = True
+        api_clients = [self.api_client, ApiClient(other)]
+        api_clients[1]._single_flight = self.api_client._single_flight
+
+        self.concurrently(lambda index: self.get_project(api_clients[index % 2]))
+
+        self.assertEqual(self.hub.calls["get_project"], 2)
+
+    def test_writes_and_disabled_clients_are_not_coalesced(self) -> None:
+        self.concurrently(self.add_template)
+        self.assertEqual(self.hub.calls["add_template"], CONCURRENCY)
+
+        self.configuration.coalesce_requests = False
+        self.concurrently(lambda _: self.get_project(ApiClient(self.configuration)))
+        self.assertEqual(self.hub.calls["get_project"], CONCURRENCY)
+
+    def test_async_tasks_share_one_request(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                projects_api = AsyncProjectsApi(api_client)
+                return await asyncio.gather(*[
+                    projects_api.get_project(self.project["project_id"]) for _ in range(CONCURRENCY)
+                ])
+
+        projects = asyncio.run(scenario())
+
+        self.assertEqual([project.name for project in projects], ["Calculator"] * CONCURRENCY)
+        self.assertEqual(self.hub.calls["get_project"], 1)
+
+    def test_cancelled_waiter_does_not_cancel_the_request(self) -> None:
+        async def scenario():
+            async with AsyncApiClient(self.configuration) as api_client:
+                projects_api = AsyncProjectsApi(api_client)
+                first = asyncio.ensure_future(projects_api.get_project(self.project["project_id"]))
+                second = asyncio.ensure_future(projects_api.get_project(self.project["project_id"]))
+                await asyncio.sleep(0.05)
+                first.cancel()
+                return await second
+
+        self.assertEqual(asyncio.run(scenario()).name, "Calculator")
+        self.assertEqual(self.hub.calls["get_project"], 1)
+
+    def test_key_is_released_after_a_failure(self) -> None:
+        group = SingleFlight()
+
+        with self.assertRaises(ValueError):
+            group.do("key", lambda: int("x"))
+
+        self.assertEqual(group.do("key", lambda: 1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+
+from appifyhub.api.messaging_api import MessagingApi
+from appifyhub.api_client import ApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.models.detect_variables_request import DetectVariablesRequest
+from appifyhub.models.message_inputs_request import MessageInputsRequest
+from appifyhub.template_engine import TemplateEngine, TemplateUser, detect_variables, get_defined_variables
+
+CONTENT = "Hi {{user.name}}, welcome to {{project.name}}! Your code is {{user.code}}."
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTemplateEngine(unittest.TestCase):
+    """Local template materialization unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.creator = creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", creator["universal_id"])
+        self.project_id = self.project["project_id"]
+        self.template = self.hub.add_template(self.project_id, "welcome", CONTENT)
+        self.user = self.hub.add_user(self.project_id, "bob", name="Bob", language_tag="de")
+        configuration = Configuration(host=self.hub.host)
+        configuration.access_token = self.hub.create_token(creator["universal_id"])
+        self.api_client = ApiClient(configuration)
+        self.messaging_api = MessagingApi(self.api_client)
+        self.clock = FakeClock()
+        self.engine = TemplateEngine(self.api_client, user_resolver=self.resolve, ttl=60, clock=self.clock)
+
+    def resolve(self, universal_id):
+        user = self.hub.users.get(universal_id)
+        if user is None:
+            return None
+        return TemplateUser(
+            name=user["name"],
+            language_tag=user["language_tag"],
+            verification_code=self.hub.verification_tokens.get(universal_id),
+            signature=self.hub.signatures.get(universal_id),
+        )
+
+    def inputs(self, **kwargs) -> MessageInputsRequest:
+        kwargs.setdefault("user_id", self.user["universal_id"])
+        kwargs.setdefault("project_id", self.project_id)
+        return MessageInputsRequest(**kwargs)
+
+    def test_materializes_like_the_service(self) -> None:
+        cases = [
+            dict(id=self.template["id"], message_inputs_request=self.inputs()),
+            dict(name="welcome", message_inputs_request=self.inputs()),
+            dict(name="welcome", message_inputs_request=MessageInputsRequest()),
+            dict(name="welcome", message_inputs_request=self.inputs(user_id=None)),
+        ]
+        for case in cases:
+            local = self.engine.materialize(self.project_id, **case)
+            remote = self.messaging_api.materialize(self.project_id, **case)
+            self.assertEqual(local, remote)
+        self.assertEqual(self.engine.local_renders, len(cases))
+
+    def test_replaces_variables_in_order_like_the_service(self) -> None:
+        self.hub.users[self.user["universal_id"]]["name"] = "{{project.name}} fan"
+        template = self.hub.add_template(self.project_id, "nested", "{{user.name}} / {{user.signature}}")
+        inputs = self.inputs()
+
+        local = self.engine.materialize(self.project_id, id=template["id"], message_inputs_request=inputs)
+
+        self.assertEqual(local.materialized, "Calculator fan / password")
+        self.assertEqual(local, self.messaging_api.materialize(self.project_id, id=template["id"], message_inputs_request=inputs))
+
+    def test_fetches_templates_once_and_refreshes_changed_ones(self) -> None:
+        for _ in range(5):
+            self.engine.materialize(self.project_id, name="welcome", message_inputs_request=self.inputs())
+        self.assertEqual((self.hub.calls["search_templates"], self.hub.calls["get_project"]), (1, 1))
+        self.assertEqual(self.hub.calls["materialize"], 0)
+
+        compiled = self.engine.template(self.project_id, self.template["id"])
+        self.clock.now += 61
+        self.engine.materialize(self.project_id, name="welcome", message_inputs_request=self.inputs())
+        self.assertIs(self.engine.template(self.project_id, self.template["id"]), compiled)
+
+        self.hub.templates[self.template["id"]].update(content="Bye {{user.name}}", updated_at="2100-01-01T00:00:00Z")
+        self.clock.now += 61
+        message = self.engine.materialize(self.project_id, name="welcome", message_inputs_request=self.inputs())
+
+        self.assertEqual(message.materialized, "Bye Bob")
+        self.assertEqual(self.hub.calls["search_templates"], 3)
+
+    def test_cached_templates_stay_in_their_project(self) -> None:
+        other_project = self.hub.add_project("Notes", self.creator["universal_id"])
+
+        self.engine.template(self.project_id, self.template["id"])
+        with self.assertRaises(NotFoundException):
+            self.engine.template(other_project["project_id"], self.template["id"])
+
+        self.assertEqual(self.hub.calls["fetch_template_by_id"], 2)
+
+    def test_selects_the_language_like_the_service(self) -> None:
+        self.hub.add_template(self.project_id, "welcome", "Hallo {{user.name}}", language_tag="de")
+        self.hub.add_template(self.project_id, "welcome", "Hola {{user.name}}", language_tag="es")
+        anonymous = MessageInputsRequest(project_id=self.project_id)
+
+        for inputs in (self.inputs(), anonymous):
+            self.assertEqual(
+                self.engine.materialize(self.project_id, name="welcome", message_inputs_request=inputs),
+                self.messaging_api.materialize(self.project_id, name="welcome", message_inputs_request=inputs),
+            )
+        self.assertEqual(
+            self.engine.materialize(self.project_id, name="welcome", message_inputs_request=self.inputs()).materialized,
+            "Hallo Bob",
+        )
+
+    def test_untagged_templates_match_users_without_a_language(self) -> None:
+        self.hub.add_template(self.project_id, "welcome", "Hey {{user.name}}", language_tag=None)
+        self.hub.add_template(self.project_id, "welcome", "Hola {{user.name}}", language_tag="es")
+        untagged = self.hub.add_user(self.project_id, "cleo", name="Cleo")
+        inputs = self.inputs(user_id=untagged["universal_id"])
+        # the service's responses always carry a language tag, so only unvalidated ones can lack it
+        self.api_client.configuration.trusted_responses = True
+        api_client = ApiClient(self.api_client.configuration)
+        engine = TemplateEngine(api_client, user_resolver=self.resolve, clock=self.clock)
+
+        local = engine.materialize(self.project_id, name="welcome", message_inputs_request=inputs)
+
+        self.assertEqual(local.materialized, "Hey Cleo")
+        self.assertEqual(
+            local,
+            MessagingApi(api_client).materialize(self.project_id, name="welcome", message_inputs_request=inputs),
+        )
+
+    def test_falls_back_to_the_service_without_local_user_values(self) -> None:
+        engine = TemplateEngine(self.api_client, clock=self.clock)
+        static = self.hub.add_template(self.project_id, "static", "Welcome to {{project.name}}")
+
+        message = engine.materialize(self.project_id, name="welcome", message_inputs_request=self.inputs())
+        engine.materialize(self.project_id, id=static["id"], message_inputs_request=self.inputs())
+
+        self.assertEqual(message.materialized[:9], "Hi Bob, w")
+        self.assertEqual((engine.local_renders, engine.remote_renders), (1, 1))
+        with self.assertRaises(NotFoundException):
+            engine.materialize(self.project_id, name="missing", message_inputs_request=self.inputs())
+
+    def test_detects_variables_like_the_service(self) -> None:
+        content = "{{user.signature}} {{user.name}} {{unknown}}"
+
+        request = DetectVariablesRequest(content=content)
+
+        self.assertEqual(detect_variables(content), self.messaging_api.detect_variables(self.project_id, request))
+        self.assertEqual(get_defined_variables(), self.messaging_api.get_defined_variables(self.project_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import unittest
+
+from appifyhub import tracing
+from appifyhub.api.async_projects_api import AsyncProjectsApi
+from appifyhub.api.projects_api import ProjectsApi
+from appifyhub.api_client import ApiClient
+from appifyhub.async_api_client import AsyncApiClient
+from appifyhub.configuration import Configuration
+from appifyhub.exceptions import NotFoundException
+from appifyhub.fake_server import CREATOR_PROJECT_ID, FakeAppifyHub
+from appifyhub.models.project_create_request import ProjectCreateRequest
+from appifyhub.response_cache import ResponseCache
+
+
+class RecordingHook(tracing.TraceHook):
+
+    def __init__(self, name, events) -> None:
+        self.name = name
+        self.events = events
+        self.traces = []
+
+    def before(self, trace):
+        self.events.append((self.name, "before", trace.operation))
+
+    def inject(self, trace, headers):
+        self.events.append((self.name, "inject", trace.operation))
+
+    def after(self, trace):
+        self.events.append((self.name, "after", trace.operation))
+        self.traces.append(trace)
+
+    def error(self, trace, error):
+        self.events.append((self.name, "error", trace.operation))
+        self.traces.append(trace)
+
+
+class TestTracing(unittest.TestCase):
+    """Tracing hooks unit tests"""
+
+    def setUp(self) -> None:
+        self.hub = FakeAppifyHub().start()
+        self.addCleanup(self.hub.stop)
+        self.creator = self.hub.add_user(CREATOR_PROJECT_ID, "ana@example.com", name="Ana")
+        self.project = self.hub.add_project("Calculator", self.creator["universal_id"])
+        self.events = []
+        self.hook = RecordingHook("outer", self.events)
+        self.tracer = tracing.Tracer([self.hook, RecordingHook("inner", self.events)])
+        self.configuration = Configuration(host=self.hub.host)
+        self.configuration.access_token = self.hub.create_token(self.creator["universal_id"])
+        self.configuration.tracer = self.tracer
+        self.projects_api = ProjectsApi(ApiClient(self.configuration))
+        self.traceparents = []
+        handle = self.hub.handle
+
+        def record_traceparent(method, target, headers, body, client):
+            self.traceparents.append(headers.get(tracing.TRACEPARENT_HEADER))
+            return handle(method, target, headers, body, client)
+
+        self.hub.handle = record_traceparent
+
+    def test_hooks_wrap_each_call(self) -> None:
+        self.projects_api.get_project(self.project["project_id"])
+
+        self.assertEqual(self.events, [
+            ("outer", "before", "get_project"),
+            ("inner", "before", "get_project"),
+            ("outer", "inject", "get_project"),
+            ("inner", "inject", "get_project"),
+            ("inner", "after", "get_project"),
+            ("outer", "after", "get_project"),
+        ])
+        trace = self.hook.traces[0]
+        self.assertEqual((trace.method, trace.url_template, trace.status, trace.attempts),
+                         ("GET", "/v1/projects/{projectId}", 200, 1))
+        self.assertGreater(trace.response_bytes, 0)
+        self.assertEqual(sorted(trace.timings), ["call", "deserialize", "read", "serialize"])
+        self.assertIsNone(tracing.current_trace())
+
+    def test_calls_without_preload_content_do_not_stay_current(self) -> None:
+        response = self.projects_api.get_project_without_preload_content(self.project["project_id"])
+        response.read()
+
+        self.assertIsNone(tracing.current_trace())
+        self.assertEqual([event for _, event, _ in self.events], ["before", "before", "inject", "inject"])
+
+    def test_reports_request_sizes(self) -> None:
+        request = ProjectCreateRequest(
+            type="FREE", user_id_type="EMAIL", owner_universal_id=self.creator["universal_id"], name="Tenant",
+        )
+
+        self.projects_api.add_project(request)
+
+        trace = self.hook.traces[0]
+        self.assertEqual((trace.operation, trace.status), ("add_project", 200))
+        self.assertEqual(trace.request_bytes, len(self.configuration.json_codec.encode(request.to_dict())))
+
+    def test_failed_calls_end_with_the_error_hooks(self) -> None:
+        with self.assertRaises(NotFoundException) as raised:
+            self.projects_api.get_project(999)
+
+        trace = self.hook.traces[0]
+        self.assertEqual([event for _, event, _ in self.events[-2:]], ["error", "error"])
+        self.assertEqual((trace.status, trace.error), (404, raised.exception))
+
+        configuration = Configuration(host="http://127.0.0.1:1")
+        configuration.retries = 0
+        configuration.tracer = self.tracer
+        with self.assertRaises(Exception):
+            ProjectsApi(ApiClient(configuration)).get_project(self.project["project_id"])
+        self.assertIsNone(self.hook.traces[1].status)
+        self.assertIsNotNone(self.hook.traces[1].error)
+
+    def test_propagates_the_trace_context(self) -> None:
+        parent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        self.tracer.add_hook(tracing.TraceContextHook(current=lambda: parent))
+
+        self.projects_api.get_project(self.project["project_id"])
+
+        trace = self.hook.traces[0]
+        self.assertEqual(trace.attributes["parent_span_id"], "b7ad6b7169203331")
+        self.assertEqual(self.traceparents, [
+            "00-0af7651916cd43dd8448eb211c80319c-%s-01" % trace.attributes["span_id"],
+        ])
+
+    def test_trace_headers_do_not_split_cached_reads(self) -> None:
+        self.tracer.add_hook(tracing.TraceContextHook())
+        self.configuration.response_cache = ResponseCache()
+        projects_api = ProjectsApi(ApiClient(self.configuration))
+
+        projects_api.get_project(self.project["project_id"])
+        projects_api.get_project(self.project["project_id"])
+
+        self.assertEqual(self.hub.calls["get_project"], 1)
+        self.assertEqual([trace.status for trace in self.hook.traces], [200, 200])
+        self.assertNotEqual(self.hook.traces[0].attributes["trace_id"], self.hook.traces[1].attributes["trace_id"])
+
+    def test_async_client_runs_the_hooks(self) -> None:
+        self.tracer.add_hook(tracing.TraceContextHook())
+
+        async def get_projects():
+            async with AsyncApiClient(self.configuration) as api_client:
+                projects_api = AsyncProjectsApi(api_client)
+                await asyncio.gather(*(projects_api.get_project(self.project["project_id"]) for _ in range(3)))
+
+        asyncio.run(get_projects())
+
+        self.assertEqual([trace.status for trace in self.hook.traces], [200, 200, 200])
+        self.assertEqual(len(set(self.traceparents)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()